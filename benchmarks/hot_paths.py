@@ -0,0 +1,329 @@
+"""Times the engine's hot paths and reports ops/sec and peak memory.
+
+Usage::
+
+    python benchmarks/hot_paths.py [-o RESULTS.json] [--compare OLD.json]
+
+The cases are loading worlds (the Lethbridge world and synthetic worlds
+made by dgsl_engine.world_generator), parsing input, resolving each verb,
+describing a room, the collector traversals, ConditionalEvent, and a
+deeply nested chain of composite events run as a tree and as a program
+(see dgsl_engine.event_vm).
+
+Each case is timed with timeit, with the garbage collector off, and the
+best of several repeats is reported. Peak memory is measured in a
+separate run of the case with tracemalloc so it does not slow the
+timing. Synthetic worlds are always made from the same seed, so results
+from different runs can be compared. Use --compare to check a run
+against saved results. It exits with status 1 if any case got slower by
+more than --tolerance.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import timeit
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# pylint: disable=wrong-import-position
+from dgsl_engine import collectors, conditions, entity_containers
+from dgsl_engine import event_base, event_composites, event_vm
+from dgsl_engine import game_factory, prompts, user_input, world_generator
+from dgsl_engine import world_state
+
+WORLD = os.path.join(ROOT, 'worlds',
+                     'disaster_on_the_good_ship_lethbridge.world')
+SIZES = [1000, 10000, 100000]
+SEED = 0
+EVENT_DEPTH = 30
+
+# Ids in the Lethbridge world
+START = '92b64fee-c7ea-48e1-93f5-3ffd409251e1'
+SPACE_SUIT = '1db01da6-febb-4ff4-add8-160bc60beec8'
+BLAST = '1805c1fb-dcf2-4b0d-a5f2-470cf727a014'
+
+# Input for each verb. get/drop and equip/remove are done in pairs so
+# every op leaves the world as it found it.
+VERBS = {
+    'get+drop': ['get medkit', 'drop medkit'],
+    'look': ['look bed'],
+    'use': ['use terminal'],
+    'talk': ['talk bed'],
+    'go': ['go door'],
+    'inventory': ['inventory'],
+    'equip+remove': ['equip space suit', 'remove space suit'],
+}
+PARSE_INPUT = ['get medkit', 'look', 'use the computer terminal',
+               'go door to the common area', 'quit', 'dance wildly']
+
+
+def cases(sizes, work_dir):
+    """Makes the benchmark cases.
+
+    Args:
+        sizes (list of int): Sizes of synthetic worlds to load.
+        work_dir (str): Directory to write synthetic worlds to.
+
+    Returns:
+        dict: Case names to functions that run one op.
+    """
+    result = {
+        'load/lethbridge': lambda: game_factory.GameFactory().new(WORLD)}
+    for size in sizes:
+        path = os.path.join(work_dir, 'synthetic_{}.world'.format(size))
+        if not os.path.exists(path):
+            _write_synthetic(size, path)
+        result['load/synthetic-{}'.format(size)] = (
+            lambda path=path: game_factory.GameFactory().new(path))
+
+    parser = user_input.Parser()
+    result['parse'] = lambda: [parser.parse(text) for text in PARSE_INPUT]
+
+    game = game_factory.GameFactory().new(WORLD)
+    player = game.world.player
+    with world_state.using(game.state):
+        game.world.entities[START].add(game.world.entities[SPACE_SUIT])
+    for verb, texts in VERBS.items():
+        parsed = [parser.parse(text) for text in texts]
+        result['resolve/' + verb] = _in_state(
+            game.state, _resolve, game.resolver, parsed, player)
+
+    room = game.world.entities[START]
+    rooms = [entity for entity in game.world.entities.values()
+             if isinstance(entity, entity_containers.Room)]
+    result['describe'] = _in_state(game.state, room.describe)
+    result['collect/id'] = _in_state(game.state, _collect_ids, rooms)
+    result['collect/type'] = _in_state(game.state, _collect_types, rooms)
+    result['conditional'] = _in_state(
+        game.state, game.world.events[BLAST].execute, player)
+
+    tree = _event_chain(EVENT_DEPTH, player)
+    compiled = _event_chain(EVENT_DEPTH, player)
+    compiled.program = event_vm.compile_event(compiled)
+    result['events/tree'] = _in_state(game.state, tree.execute, player)
+    result['events/bytecode'] = _in_state(game.state, compiled.execute,
+                                          player)
+    return result
+
+
+def time_case(func, repeat=5):
+    """Times a case.
+
+    Each repeat runs the case enough times to take at least 0.2 seconds.
+
+    Returns:
+        float: The best ops/sec of the repeats.
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return number / best
+
+
+def peak_memory(func):
+    """Returns the peak bytes allocated while running a case once."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak - before
+
+
+def run(sizes, work_dir, only=None, repeat=5):
+    """Runs the benchmarks.
+
+    Args:
+        sizes (list of int): Sizes of synthetic worlds to load.
+        work_dir (str): Directory to write synthetic worlds to.
+        only (str): Only run cases with this in their name.
+        repeat (int): Times to repeat each timing.
+
+    Returns:
+        dict: The results, with details of the machine and commit.
+    """
+    results = {}
+    for name, func in cases(sizes, work_dir).items():
+        if only is not None and only not in name:
+            continue
+        results[name] = {'ops_per_sec': time_case(func, repeat=repeat),
+                         'peak_bytes': peak_memory(func)}
+    return {'python': platform.python_version(),
+            'machine': platform.machine(),
+            'commit': _commit(),
+            'compact': os.environ.get('DGSL_COMPACT', '1') != '0',
+            'results': results}
+
+
+def compare(old, new, tolerance):
+    """Compares two runs.
+
+    Args:
+        old (dict): Results of the earlier run.
+        new (dict): Results of this run.
+        tolerance (float): How much slower a case can get, as a
+            fraction, before it counts as a regression.
+
+    Returns:
+        list of str: Names of the cases that regressed.
+    """
+    regressed = []
+    for name, result in new['results'].items():
+        before = old['results'].get(name)
+        if before is None:
+            continue
+        if result['ops_per_sec'] < before['ops_per_sec'] * (1 - tolerance):
+            regressed.append(name)
+    return regressed
+
+
+# Helpers ##############################################################
+
+def _in_state(state, func, *args):
+    def run_in_state():
+        with world_state.using(state):
+            return func(*args)
+    return run_in_state
+
+
+def _resolve(resolver, parsed, player):
+    for parsed_input in parsed:
+        prompts.run(resolver.resolve_input_steps(parsed_input, player),
+                    _cancel)
+
+
+def _cancel(prompt):
+    """Answers every prompt by cancelling, so no case waits for input."""
+    if prompt.is_menu():
+        return len(prompt.choices)
+    return ''
+
+
+def _collect_ids(rooms):
+    for room in rooms:
+        collectors.EntityIdCollector('not an id', room).collect()
+
+
+def _collect_types(rooms):
+    for room in rooms:
+        collectors.EntityTypeCollector(['entity', 'equipment'],
+                                       room).collect()
+
+
+def _event_chain(depth, player):
+    """Nests groups, ordered groups, and conditional events depth deep.
+    Running it only changes which events are done."""
+    root = _message_event('leaf', 'You did it.')
+    for level in range(depth):
+        if level % 3 == 0:
+            event = event_composites.GroupEvent('group{}'.format(level))
+            event.message = 'Group {}.'.format(level)
+            event.add(root)
+            event.add(_message_event('step{}'.format(level), 'Step.'))
+        elif level % 3 == 1:
+            event = event_composites.OrderedGroup('ordered{}'.format(level))
+            event.add(root)
+        else:
+            event = event_composites.ConditionalEvent(
+                'conditional{}'.format(level))
+            event.condition = conditions.IsActive(player)
+            event.success = root
+            event.failure = _message_event('failure{}'.format(level),
+                                           'Nothing happens.')
+        root = event
+    return root
+
+
+def _message_event(id_, message):
+    event = event_base.Event(id_)
+    event.message = message
+    return event
+
+
+def _write_synthetic(size, path):
+    generator = world_generator.WorldGenerator(seed=SEED)
+    generator.set_size(size)
+    with open(path, 'w') as file:
+        generator.write(file)
+
+
+def _commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                             cwd=ROOT, stdout=subprocess.PIPE,
+                             stderr=subprocess.DEVNULL, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.decode().strip()
+
+
+def _print_table(new, old=None):
+    header = "{:<26}{:>14}{:>12}".format('case', 'ops/sec', 'peak KiB')
+    if old is not None:
+        header += "{:>10}".format('change')
+    print(header)
+    for name, result in new['results'].items():
+        line = "{:<26}{:>14,.1f}{:>12,.1f}".format(
+            name, result['ops_per_sec'], result['peak_bytes'] / 1024)
+        before = old['results'].get(name) if old is not None else None
+        if before is not None:
+            change = result['ops_per_sec'] / before['ops_per_sec'] - 1
+            line += "{:>+9.1f}%".format(100 * change)
+        print(line)
+
+
+def main():
+    """Run the benchmarks and print a table of the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-o', '--output',
+                        help='file to save the results to as json')
+    parser.add_argument('--compare',
+                        help='json results of an earlier run to compare to')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='fraction slower a case can get before it is '
+                             'a regression (default 0.1)')
+    parser.add_argument('--sizes', type=int, nargs='*', default=SIZES,
+                        help='objects in the synthetic worlds to load '
+                             '(default 1000 10000 100000)')
+    parser.add_argument('--only', help='only run cases with this in '
+                                       'their name')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='times to repeat each timing (default 5)')
+    parser.add_argument('--work-dir',
+                        help='directory to keep synthetic worlds in so '
+                             'they are only made once')
+    args = parser.parse_args()
+
+    if args.work_dir is not None:
+        os.makedirs(args.work_dir, exist_ok=True)
+        new = run(args.sizes, args.work_dir, args.only, args.repeat)
+    else:
+        with tempfile.TemporaryDirectory() as work_dir:
+            new = run(args.sizes, work_dir, args.only, args.repeat)
+
+    old = None
+    if args.compare is not None:
+        with open(args.compare) as file:
+            old = json.load(file)
+    _print_table(new, old)
+
+    if args.output is not None:
+        with open(args.output, 'w') as file:
+            json.dump(new, file, indent=2)
+
+    if old is not None:
+        regressed = compare(old, new, args.tolerance)
+        if regressed:
+            print("\nSlower by more than {:.0%}: {}".format(
+                args.tolerance, ', '.join(regressed)))
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
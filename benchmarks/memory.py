@@ -0,0 +1,128 @@
+"""Reports how many bytes game objects use with and without the compact
+layout.
+
+Usage::
+
+    python benchmarks/memory.py [-n COUNT]
+
+Each layout is measured in its own process since the layout is chosen
+when the engine is imported (see dgsl_engine.compact).
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORLD = os.path.join(ROOT, 'worlds',
+                     'disaster_on_the_good_ship_lethbridge.world')
+
+
+def _makers():
+    # Imported here so the layout is picked up from the environment of
+    # the measuring process.
+    # pylint: disable=import-outside-toplevel
+    from dgsl_engine import entity_base, entity_containers, equipment
+    from dgsl_engine import event_base, event_composites, interaction
+    return {
+        'Entity': entity_base.Entity,
+        'Container': entity_containers.Container,
+        'Room': entity_containers.Room,
+        'Npc': entity_containers.Npc,
+        'Equipment': equipment.Equipment,
+        'Event': event_base.Event,
+        'MoveEntity': event_base.MoveEntity,
+        'ToggleActive': event_base.ToggleActive,
+        'GroupEvent': event_composites.GroupEvent,
+        'OrderedGroup': event_composites.OrderedGroup,
+        'ConditionalEvent': event_composites.ConditionalEvent,
+        'Interaction': interaction.Interaction,
+        'Option': lambda id_: interaction.Option(id_, None),
+    }
+
+
+def _bytes_per(make, count):
+    ids = [str(i) for i in range(count)]
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [make(id_) for id_ in ids]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Don't count the list holding the objects
+    return (after - before - sys.getsizeof(objects)) / count
+
+
+def _world_bytes_per(count):
+    # pylint: disable=import-outside-toplevel
+    from dgsl_engine import game_factory
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    worlds = [game_factory.load_world(WORLD) for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    size = sum(len(w.entities) + len(w.events) for w in worlds)
+    return (after - before) / size
+
+
+def measure(count):
+    """Measures the current layout.
+
+    Returns:
+        dict: Bytes per object for each class and for a loaded world.
+    """
+    results = {name: _bytes_per(make, count)
+               for name, make in _makers().items()}
+    results['world object'] = _world_bytes_per(max(1, count // 1000))
+    return results
+
+
+def compare(count):
+    """Measures both layouts in separate processes.
+
+    Returns:
+        dict: Results keyed by 'dict' and 'compact'.
+    """
+    results = {}
+    for layout, flag in [('dict', '0'), ('compact', '1')]:
+        env = dict(os.environ, DGSL_COMPACT=flag)
+        env['PYTHONPATH'] = ROOT + os.pathsep + env.get('PYTHONPATH', '')
+        out = subprocess.run(
+            [sys.executable, __file__, '--measure', '-n', str(count)],
+            env=env, check=True, stdout=subprocess.PIPE)
+        results[layout] = json.loads(out.stdout)
+    return results
+
+
+def main():
+    """Run the benchmark and print a table of the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-n', '--count', type=int, default=10000,
+                        help='objects to create of each class')
+    parser.add_argument('--measure', action='store_true',
+                        help='measure the current layout and print json')
+    parser.add_argument('--json', action='store_true',
+                        help='print the comparison as json')
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.count)))
+        return
+
+    results = compare(args.count)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print("{:<18}{:>10}{:>10}{:>8}".format('bytes per object', 'dict',
+                                          'compact', 'saved'))
+    for name in results['dict']:
+        before = results['dict'][name]
+        after = results['compact'][name]
+        print("{:<18}{:>10.0f}{:>10.0f}{:>7.0f}%".format(
+            name, before, after, 100 * (before - after) / before))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+"""Times how long the engine takes to import, using ``python -X importtime``.
+
+Usage::
+
+    python benchmarks/startup.py [--repeat N] [--budget MS] [-o RESULTS.json]
+
+Each target is imported in a new python process with ``-X importtime``
+so nothing is imported already. The time of a target is the cumulative
+time of its top level imports, which includes the standard library
+modules they load but not the interpreter's own start up. The best of
+the repeats is reported along with how many of the engine's modules
+were loaded and the slowest imports. Engine modules imported with
+``from . import name`` are timed as part of the module importing them.
+Use --budget to exit with status 1 if any target takes longer than that
+many milliseconds.
+
+The benchmark also starts ``dgsl play`` on the test world without the
+cache, stopping before the game reads any input, and exits with status 1
+if any of the OPTIONAL modules were loaded. They are only needed for
+options, other kinds of worlds, or commands a plain game does not use.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What the dgsl script, a program embedding the engine, and a bare
+# import of the package load.
+TARGETS = {
+    'cli': 'import dgsl_engine.__main__',
+    'embedding': 'from dgsl_engine import game_factory',
+    'package': 'import dgsl_engine',
+}
+SLOWEST = 5
+
+OPTIONAL = [
+    'dgsl_engine.compiled_world', 'dgsl_engine.event_vm',
+    'dgsl_engine.journal', 'dgsl_engine.saves', 'dgsl_engine.server',
+    'dgsl_engine.world_cache', 'dgsl_engine.world_generator',
+    'dgsl_engine.world_store',
+]
+PLAY_WORLD = 'worlds/disaster_on_the_good_ship_lethbridge.world'
+
+_PLAY = """
+import dgsl_engine.game
+dgsl_engine.game.Game.run = lambda self: None
+from dgsl_engine.__main__ import main
+main(['play', {!r}, '--no-cache'])
+""".format(PLAY_WORLD)
+
+_LIST_MODULES = """
+import sys
+print(' '.join(sorted(name for name in sys.modules
+                      if name.split('.')[0] == 'dgsl_engine')))
+"""
+
+
+def measure(statement):
+    """Imports in a new process and reads the import times.
+
+    Args:
+        statement (str): The import statement to run.
+
+    Returns:
+        dict: The total microseconds, the engine modules loaded, and
+        the (self microseconds, module) of every import.
+    """
+    # Modules imported with ``from . import name`` are not logged on
+    # their own, so the modules loaded are read from sys.modules.
+    code = statement + _LIST_MODULES
+    out = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        check=True, universal_newlines=True)
+    total = 0
+    imports = []
+    for line in out.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative, name = line[len('import time:'):].split('|')
+        imports.append((int(self_us), name.strip()))
+        # Top level imports are not indented
+        if name.startswith(' dgsl_engine'):
+            total += int(cumulative)
+    return {'total_us': total,
+            'modules': out.stdout.split(),
+            'imports': imports}
+
+
+def optional_loaded():
+    """Starts ``dgsl play`` in a new process and returns the OPTIONAL
+    modules it loaded."""
+    out = subprocess.run(
+        [sys.executable, '-c', _PLAY + _LIST_MODULES], cwd=ROOT,
+        stdout=subprocess.PIPE, check=True, universal_newlines=True)
+    loaded = set(out.stdout.split())
+    return [name for name in OPTIONAL if name in loaded]
+
+
+def run(repeat=5):
+    """Measures every target.
+
+    Args:
+        repeat (int): Times to import each target. The best is kept.
+
+    Returns:
+        dict: Target names to their best measurement.
+    """
+    return {name: min((measure(statement) for _ in range(repeat)),
+                      key=lambda result: result['total_us'])
+            for name, statement in TARGETS.items()}
+
+
+def main():
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='times to import each target (default 5)')
+    parser.add_argument('--budget', type=float,
+                        help='most milliseconds any target can take')
+    parser.add_argument('-o', '--output',
+                        help='file to save the results to as json')
+    args = parser.parse_args()
+
+    results = run(args.repeat)
+    print("{:<12}{:>10}{:>10}  {}".format('target', 'ms', 'modules',
+                                         'slowest imports (self ms)'))
+    for name, result in results.items():
+        slowest = sorted(result['imports'], reverse=True)[:SLOWEST]
+        print("{:<12}{:>10.1f}{:>10}  {}".format(
+            name, result['total_us'] / 1000, len(result['modules']),
+            ', '.join('{} {:.1f}'.format(module, self_us / 1000)
+                      for self_us, module in slowest)))
+
+    if args.output is not None:
+        with open(args.output, 'w') as file:
+            json.dump({name: {'total_us': result['total_us'],
+                              'modules': result['modules']}
+                       for name, result in results.items()}, file, indent=2)
+
+    failed = False
+    loaded = optional_loaded()
+    if loaded:
+        print("\ndgsl play loaded: {}".format(', '.join(loaded)))
+        failed = True
+
+    if args.budget is not None:
+        over = [name for name, result in results.items()
+                if result['total_us'] / 1000 > args.budget]
+        if over:
+            print("\nSlower than {} ms: {}".format(args.budget,
+                                                  ', '.join(over)))
+            failed = True
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,16 +1,30 @@
-"""Imports for the package."""
+"""Imports for the package.
 
-from . import actions
-from . import commands
-from . import entity_base
-from . import entity_containers
-from . import entity_factory
-from . import event_base
-from . import event_factory
-from . import exceptions
-from . import game_factory
-from . import game
-from . import interaction
-from . import user_input
-from . import visitors
-from . import world
+The submodules are imported the first time they are used, like
+``dgsl_engine.world``, so importing the package does not load the whole
+engine. ``from dgsl_engine import world`` works as usual.
+"""
+import importlib
+
+# Every submodule except __main__, which runs the command line. They are
+# listed rather than found on disk so importing the package stays quick.
+_SUBMODULES = (
+    'actions', 'collectors', 'commands', 'compact', 'compiled_world',
+    'conditions', 'entity_base', 'entity_containers', 'entity_factory',
+    'equipment', 'event_base', 'event_composites', 'event_factory',
+    'event_vm', 'exceptions', 'game', 'game_factory', 'interaction',
+    'journal', 'linker', 'name_index', 'prompts', 'registry', 'saves',
+    'server', 'type_index', 'user_input', 'world', 'world_cache',
+    'world_generator', 'world_loader', 'world_state', 'world_store',
+)
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module('.' + name, __name__)
+    raise AttributeError(
+        "module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()).union(_SUBMODULES))
@@ -1,13 +1,66 @@
-"""Script to run the DGSL Application."""
+"""Script to run the DGSL Application.
+
+Modules only some commands or options need, like the server and its
+asyncio, the journal, and the cache, are imported by the commands that
+use them so the others start quickly.
+"""
+# pylint: disable=import-outside-toplevel
+import argparse
 import os
 import site
-from dgsl_engine.game_factory import GameFactory, name_to_path
+from dgsl_engine.game_factory import GameFactory, load_world, name_to_path
 from dgsl_engine.user_input import Menu
+from dgsl_engine.world import LazyWorld
 
 VERSION = '0.2.0'
 
+# When the journal is synced to disk, the same as journal.FSYNC_ALWAYS,
+# FSYNC_BATCH and FSYNC_NEVER.
+_FSYNC_CHOICES = ['always', 'batch', 'never']
+
+
+def main(argv=None):
+    """Runs the dgsl command.
+
+    With no arguments the interactive menu is shown. The other commands
+    are:
+
+    * ``dgsl play PATH [--journal FILE]`` to play the world at PATH,
+      optionally journaling the game so it can be recovered after a crash.
+    * ``dgsl compile PATH [-o OUT]`` to compile a world for fast loading.
+    * ``dgsl serve PATH`` to host games of the world at PATH for many
+      players over TCP.
+    * ``dgsl generate PATH`` to write a synthetic world of any size for
+      scale testing.
+    * ``dgsl store PATH`` to import a world into a world store, so it
+      can be played without keeping it in memory.
+
+    Args:
+        argv (list of str): The command line arguments. Defaults to
+            sys.argv.
+    """
+    parser = _make_arg_parser()
+    args = parser.parse_args(argv)
+
+    if args.command == 'compile':
+        compile_world(args.world, args.output)
+    elif args.command == 'play':
+        play_world(args.world, args.journal, args.checkpoint_every,
+                   args.fsync, _cache(args), args.lazy, args.evict_after,
+                   args.max_rooms, args.bytecode)
+    elif args.command == 'serve':
+        import dgsl_engine.server as server
+        server.serve(args.world, args.host, args.port, args.max_sessions,
+                     args.idle_timeout, args.drain_timeout, _cache(args))
+    elif args.command == 'generate':
+        generate_world(args)
+    elif args.command == 'store':
+        store_world(args.world, args.output)
+    else:
+        menu_main()
+
 
-def main():
+def menu_main():
     """Create and run a new game.
 
     Asks for a world name and uses game factory to build it.
@@ -33,7 +86,8 @@ def main():
             site.USER_BASE, 'dgsl/worlds', name_to_path(world_name))
 
         if os.path.exists(world_path):
-            game = GameFactory().new(world_path)
+            import dgsl_engine.world_cache as world_cache
+            game = GameFactory(world_cache.WorldCache()).new(world_path)
             game.run()
         else:
             print("That world does not exist!")
@@ -43,5 +97,196 @@ def main():
         print('Bye!')
 
 
+def play_world(world_path, journal_path=None, checkpoint_every=50,
+               fsync='batch', cache=None, lazy=False,
+               idle_moves=None, max_regions=None, bytecode=False):
+    """Plays a world in the console.
+
+    Args:
+        world_path (str): The path of the world to play.
+        journal_path (str): The path of a journal to keep of the game. If
+            it already exists the game is recovered from it. It is removed
+            when the game ends. None to not journal the game.
+        checkpoint_every (int): Turns between journal checkpoints.
+        fsync (str): When to sync the journal to disk (see journal).
+        cache (WorldCache): The cache to load the world from. None to not
+            use a cache.
+        lazy (bool): True to only build rooms as they are needed.
+        idle_moves (int): Moves before rooms the player has left are
+            removed from a lazy world. None to keep them.
+        max_regions (int): The most rooms to keep built in a lazy world.
+            None for no limit.
+        bytecode (bool): True to run composite events as compiled
+            programs (see event_vm).
+    """
+    game = GameFactory(cache, lazy).new(world_path)
+    if isinstance(game.world, LazyWorld):
+        game.world.idle_moves = idle_moves
+        game.world.max_regions = max_regions
+    if bytecode:
+        import dgsl_engine.event_vm as event_vm
+        event_vm.compile_world(game.world)
+    if journal_path is None:
+        game.run()
+        return
+
+    import dgsl_engine.journal as journal
+    game_journal = journal.Journal(journal_path, checkpoint_every,
+                                   fsync=fsync)
+    replayed = game_journal.attach(game)
+    if replayed:
+        print("Recovered game from {} ({} commands replayed)".format(
+            journal_path, replayed))
+    try:
+        game.run()
+    finally:
+        game_journal.close()
+    # Only a game that did not end needs recovering
+    os.remove(journal_path)
+
+
+def compile_world(world_path, output=None):
+    """Compiles a world file so it can be loaded quickly.
+
+    Args:
+        world_path (str): The path of the world to compile.
+        output (str): The path to write the compiled world to. Defaults
+            to the world path with a .cworld extension.
+    """
+    import dgsl_engine.compiled_world as compiled_world
+    import dgsl_engine.world_store as world_store
+    if world_store.is_store(world_path):
+        print("World stores can not be compiled. Compile the .world file "
+              "they were imported from instead.")
+        return
+    if output is None:
+        output = os.path.splitext(world_path)[0] + '.cworld'
+    compiled_world.write(load_world(world_path), output)
+    print("Compiled {} to {}".format(world_path, output))
+
+
+def store_world(world_path, output=None):
+    """Imports a world file into a world store.
+
+    Args:
+        world_path (str): The path of the .world file to import.
+        output (str): The path to write the store to. Defaults to the
+            world path with a .dgsldb extension.
+    """
+    if output is None:
+        output = os.path.splitext(world_path)[0] + '.dgsldb'
+    import dgsl_engine.world_store as world_store
+    count = world_store.import_world(world_path, output)
+    print("Stored {} objects from {} in {}".format(count, world_path, output))
+
+
+def generate_world(args):
+    """Writes a synthetic world.
+
+    Args:
+        args (Namespace): The parsed arguments of the generate command.
+    """
+    import dgsl_engine.world_generator as world_generator
+    generator = world_generator.WorldGenerator(
+        args.rooms, args.depth, args.fan_out, args.npcs, args.equipment,
+        args.items, args.doors, args.event_depth, args.event_fan_out,
+        args.seed)
+    if args.objects is not None:
+        generator.set_size(args.objects)
+    with open(args.output, 'w') as file:
+        count = generator.write(file)
+    print("Wrote {} objects in {} rooms to {}".format(
+        count, generator.rooms, args.output))
+
+
+def _make_arg_parser():
+    parser = argparse.ArgumentParser(
+        prog='dgsl', description='DGSL Text Adventure Engine ' + VERSION)
+    subparsers = parser.add_subparsers(dest='command')
+
+    play = subparsers.add_parser('play', help='play a world file')
+    play.add_argument('world', help='path to a .world, compiled world, or '
+                                    'world store')
+    play.add_argument('--journal',
+                      help='file to journal the game to for crash recovery. '
+                           'An existing journal is recovered')
+    play.add_argument('--checkpoint-every', type=int, default=50,
+                      help='turns between journal checkpoints (default 50)')
+    play.add_argument('--fsync', default='batch', choices=_FSYNC_CHOICES,
+                      help='when to sync the journal to disk (default batch)')
+    play.add_argument('--lazy', action='store_true',
+                      help='only build rooms when they are needed, for very '
+                           'large worlds')
+    play.add_argument('--evict-after', type=int, metavar='MOVES',
+                      help='for lazy worlds, remove unchanged rooms the '
+                           'player left this many moves ago')
+    play.add_argument('--max-rooms', type=int, metavar='ROOMS',
+                      help='for lazy worlds, the most rooms to keep built')
+    play.add_argument('--bytecode', action='store_true',
+                      help='run composite events as compiled programs, '
+                           'for worlds with deeply nested events')
+
+    comp = subparsers.add_parser(
+        'compile', help='compile a world for fast loading')
+    comp.add_argument('world', help='path to the .world file')
+    comp.add_argument('-o', '--output', help='path of the compiled world')
+
+    store = subparsers.add_parser(
+        'store', help='import a world into a store that is read from disk '
+                      'as it is played')
+    store.add_argument('world', help='path to the .world file')
+    store.add_argument('-o', '--output', help='path of the world store')
+
+    serve = subparsers.add_parser(
+        'serve', help='host games of a world for many players over TCP')
+    serve.add_argument('world', help='path to a .world or compiled world')
+    serve.add_argument('--host', default='127.0.0.1',
+                       help='address to listen on (default 127.0.0.1)')
+    serve.add_argument('--port', type=int, default=4000,
+                       help='port to listen on (default 4000)')
+    serve.add_argument('--max-sessions', type=int, default=100,
+                       help='most players at once (default 100)')
+    serve.add_argument('--idle-timeout', type=float, default=600,
+                       help='seconds before idle players are disconnected '
+                            '(default 600)')
+    serve.add_argument('--drain-timeout', type=float, default=30,
+                       help='seconds players get to finish when the server '
+                            'shuts down (default 30)')
+    for command in (play, serve):
+        command.add_argument('--no-cache', action='store_true',
+                             help='do not use the cache of loaded worlds')
+
+    gen = subparsers.add_parser(
+        'generate', help='write a synthetic world for scale testing')
+    gen.add_argument('output', help='path of the .world file to write')
+    size = gen.add_mutually_exclusive_group()
+    size.add_argument('--rooms', type=int, default=100,
+                      help='number of rooms (default 100)')
+    size.add_argument('--objects', type=int,
+                      help='about how many objects the world should have')
+    gen.add_argument('--seed', type=int, default=0,
+                     help='seed for the random choices (default 0)')
+    for name, default, text in [
+            ('depth', 2, 'levels of nested containers in each room'),
+            ('fan-out', 3, 'items in each container'),
+            ('npcs', 1, 'npcs in each room'),
+            ('equipment', 1, 'equipment in each room'),
+            ('items', 2, 'loose items in each room'),
+            ('doors', 1, 'extra doors to random rooms in each room'),
+            ('event-depth', 2, 'levels of composite events in event trees'),
+            ('event-fan-out', 2, 'events in each composite event')]:
+        gen.add_argument('--' + name, type=int, default=default,
+                         help='{} (default {})'.format(text, default))
+
+    return parser
+
+
+def _cache(args):
+    if args.no_cache:
+        return None
+    import dgsl_engine.world_cache as world_cache
+    return world_cache.WorldCache()
+
+
 if __name__ == '__main__':
     main()
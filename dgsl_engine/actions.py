@@ -1,6 +1,8 @@
 """Classes and supporting functions for resolving and executing
 actions."""
+import functools
 from abc import ABC, abstractmethod
+from . import prompts
 
 # pylint: disable=too-few-public-methods
 # They must be objects for polymorphism and only need one method
@@ -38,6 +40,13 @@ class ActionResolver:
         Returns:
             str: The result of the actions resolution.
         """
+        return prompts.run(
+            self.resolve_input_steps(parsed_input, player),
+            prompts.ConsoleAsker(menu_factory=self.menu_factory))
+
+    def resolve_input_steps(self, parsed_input, player):
+        """Steps that resolve a parsed input. See resolve_input and the
+        prompts module."""
         message = None
 
         action = self.action_factory.new(parsed_input['verb'], player)
@@ -46,19 +55,22 @@ class ActionResolver:
             entity = None
             other = None
         else:
-            entity, other, message = self._get_entities(
+            entity, other, message = yield from self._get_entities_steps(
                 parsed_input, player, action)
             if message != '\n' and message is not None:
                 return message
 
-        result = action.take_action(entity, other)
+        result = yield from prompts.call(action, 'take_action', entity,
+                                         other)
         if result != '' and message == '\n':
             result = message + result
         return result
 
-    def _get_entities(self, parsed_input, player, action):
+    def _get_entities_steps(self, parsed_input, player, action):
         """Collects all the entities that might be refered to by the input.
 
+        If more than one entity matches the player is asked to choose.
+
         Args:
             parsed_input (dict): The parsed player input.
             player (Player): The player object.
@@ -82,8 +94,7 @@ class ActionResolver:
         size = len(entities)
         if size > 1:
             choices = [entity.spec.name for entity in entities]
-            menu = self.menu_factory.make(choices)
-            idx = menu.ask()
+            idx = yield prompts.Prompt(choices=choices)
 
             message = '\n'
             if idx == -1:
@@ -102,45 +113,36 @@ class ActionResolver:
 
 
 class ActionFactory:
-    """Factory to return action objects."""
+    """Factory to return action objects.
+
+    Attributes:
+        actions (dict): Makes the action for each verb. Called with the
+            player.
+    """
+
+    def __init__(self, custom_verbs=()):
+        """
+        Args:
+            custom_verbs: Verbs a world adds, which run the events the
+                entities have for them (see Custom).
+        """
+        self.actions = dict(_ACTIONS)
+        for verb in custom_verbs:
+            if verb not in self.actions:
+                self.actions[verb] = functools.partial(Custom, verb=verb)
 
-    def new(self, verb, player):  # pylint: disable=no-self-use
+    def new(self, verb, player):
         """Creates a new action object based on the given verb.
 
         Args:
             verb (str): The verb of the action.
             player (Player): The player character taking the action.
-            entity (Entity): The entity that was the direct object of
-                the verb.
-            other (Entity): The entity that was the indirect object of
-                the verb.
 
         Returns:
             Action: The new action. If the verb does not exist returns
                 a null action.
         """
-        action = NullAction(player)
-        if verb in ['get', 'take']:
-            action = Get(player)
-        elif verb in ['use']:
-            action = Use(player)
-        elif verb in ['drop']:
-            action = Drop(player)
-        elif verb in ['look']:
-            action = Look(player)
-        elif verb in ['inventory']:
-            action = CheckInventory(player)
-        elif verb in ['talk']:
-            action = Talk(player)
-        elif verb in ['equip']:
-            action = Equip(player)
-        elif verb in ['remove']:
-            action = Remove(player)
-        elif verb in ['go']:
-            action = Go(player)
-        elif verb in ['give', 'put']:
-            action = Place(player)
-        return action
+        return self.actions.get(verb, NullAction)(player)
 
 
 class Action(ABC):
@@ -169,8 +171,12 @@ class Action(ABC):
         """
 
     def _execute_event(self, verb, entity):
+        return prompts.run(self._execute_event_steps(verb, entity))
+
+    def _execute_event_steps(self, verb, entity):
         if entity.events.has_event(verb):
-            return entity.events.execute(verb, self.player)
+            return (yield from prompts.call(entity.events, 'execute', verb,
+                                            self.player))
         return None
 
     def filter_entities(self, entities):  # pylint: disable=no-self-use
@@ -189,6 +195,22 @@ class Action(ABC):
         return entities
 
 
+class EventAction(Action):
+    """An action that can execute the events of the entities it acts on.
+
+    Events can prompt the player, so these actions are written as steps
+    (see the prompts module) and take_action runs the steps.
+    """
+
+    def take_action(self, entity, other):
+        """See Action."""
+        return prompts.run(self.take_action_steps(entity, other))
+
+    @abstractmethod
+    def take_action_steps(self, entity, other):  # pragma: no cover
+        """Steps that execute the action. See Action.take_action."""
+
+
 class NullAction(Action):
     """Null action that says nothing happend."""
 
@@ -197,10 +219,10 @@ class NullAction(Action):
         return "Nothing happens"
 
 
-class Get(Action):
+class Get(EventAction):
     """Action to get an object from the players room."""
 
-    def take_action(self, entity, other):
+    def take_action_steps(self, entity, other):
         """See Action."""
         if entity is None:
             return "Get What?"
@@ -209,7 +231,7 @@ class Get(Action):
         if entity.states.obtainable:
             move(entity, self.player)
             moved = "You take " + entity.spec.name
-            result = self._execute_event('get', entity)
+            result = yield from self._execute_event_steps('get', entity)
             if result is not None:
                 return "{}\n{}".format(moved, result)
             return moved
@@ -227,27 +249,33 @@ class Get(Action):
         return result
 
 
-class Drop(Action):
+class Drop(EventAction):
     """Action to drop an object the player is carrying."""
 
-    def take_action(self, entity, other):
+    def take_action_steps(self, entity, other):
         """See Action."""
         if entity is None:
             return "Drop What?"
         if self.player.inventory.has_item(entity.spec.id):
             move(entity, self.player.owner)
             dropped = "You drop " + entity.spec.name
-            result = self._execute_event('drop', entity)
+            result = yield from self._execute_event_steps('drop', entity)
             if result is not None:
                 return "{}\n{}".format(dropped, result)
             return dropped
         return "You don't have that"
 
 
-class Use(Action):
-    """An action to use an object."""
+class Use(EventAction):
+    """An action to use an object.
 
-    def take_action(self, entity, other):
+    If the use event has no results the player is told they used the
+    object. On the console an interaction prints its text itself, so
+    this is added after it. Otherwise the interaction's closing text is
+    its result (see the prompts module).
+    """
+
+    def take_action_steps(self, entity, other):
         """See Action."""
         if entity is None:
             return "Use What?"
@@ -255,21 +283,22 @@ class Use(Action):
             # replace with an inactive message eventually
             return "For some reason you can't"
         if entity.events.has_event('use'):
-            result = entity.events.execute('use', self.player)
+            result = yield from prompts.call(
+                entity.events, 'execute', 'use', self.player)
             if result.strip() == '':
                 return "You use " + entity.spec.name
             return result
         return "You can't use that"
 
 
-class Look(Action):
+class Look(EventAction):
     """An action to look at an object."""
 
-    def take_action(self, entity, other):
+    def take_action_steps(self, entity, other):
         """See Action."""
         if entity is not None:
             description = "You see " + entity.describe()
-            result = self._execute_event('look', entity)
+            result = yield from self._execute_event_steps('look', entity)
             if result is not None:
                 return "{}\n{}".format(description, result)
             return description
@@ -306,26 +335,26 @@ class CheckInventory(Action):
         return "You don't have that"
 
 
-class Talk(Action):
+class Talk(EventAction):
     """Action for talking with NPCs."""
 
-    def take_action(self, entity, other):
+    def take_action_steps(self, entity, other):
         """See Action"""
         if entity is not None:
             if not entity.states.active:
                 # perhaps replace with an inactive message
                 return "They don't have anything to say right now"
-            result = self._execute_event('talk', entity)
+            result = yield from self._execute_event_steps('talk', entity)
             if result is not None:
                 return result
             return "That doesn't talk"
         return "To Whom?"
 
 
-class Equip(Action):
+class Equip(EventAction):
     """Action to equip equipment."""
 
-    def take_action(self, entity, other):
+    def take_action_steps(self, entity, other):
         """See Action."""
         if entity is None:
             return "Equip What?"
@@ -339,7 +368,8 @@ class Equip(Action):
             old_owner.inventory.remove(entity.spec.id)
             message = 'You equip it'
             if entity.events.has_event('equip'):
-                result = entity.events.execute('equip', self.player)
+                result = yield from prompts.call(
+                    entity.events, 'execute', 'equip', self.player)
                 if result != '':
                     return message + '\n' + result
             return message
@@ -347,10 +377,10 @@ class Equip(Action):
             return "You can't equip that!"
 
 
-class Remove(Action):
+class Remove(EventAction):
     """Action for removing worn equipment."""
 
-    def take_action(self, entity, other):
+    def take_action_steps(self, entity, other):
         """See Action."""
         if entity is None:
             return "Remove What?"
@@ -360,7 +390,8 @@ class Remove(Action):
             self.player.add(equipment)
             message = "You remove it"
             if entity.events.has_event('remove'):
-                result = entity.events.execute('remove', self.player)
+                result = yield from prompts.call(
+                    entity.events, 'execute', 'remove', self.player)
                 if result != '':
                     return message + '\n' + result
             return message
@@ -368,17 +399,18 @@ class Remove(Action):
 
 
 # Will most likely need multi verb events for this to work with use
-class Go(Action):
+class Go(EventAction):
     """Action to move the player in a given direction."""
 
-    def take_action(self, entity, other):
+    def take_action_steps(self, entity, other):
         """empty"""
         if entity is None:
             return "Go Where?"
         if not entity.states.active:
             return "For some reason you can't"
         if entity.events.has_event('go'):
-            return entity.events.execute('go', self.player)
+            return (yield from prompts.call(
+                entity.events, 'execute', 'go', self.player))
         return "Impossible!"
 
 
@@ -390,6 +422,51 @@ class Place(Action):
         return "Sorry, that action is not available yet."
 
 
+class Custom(EventAction):
+    """Action for a verb a world adds. Runs the entity's event for the
+    verb. Like Use, the player is told what they did only if the event
+    has no results.
+
+    Attributes:
+        verb (str): The verb.
+    """
+
+    def __init__(self, player, verb):
+        super(Custom, self).__init__(player)
+        self.verb = verb
+
+    def take_action_steps(self, entity, other):
+        """See Action."""
+        if entity is None:
+            return self.verb.capitalize() + " What?"
+        if not entity.states.active:
+            return "For some reason you can't"
+        if entity.events.has_event(self.verb):
+            result = yield from prompts.call(
+                entity.events, 'execute', self.verb, self.player)
+            if result.strip() == '':
+                return "You {} {}".format(self.verb, entity.spec.name)
+            return result
+        return "You can't {} that".format(self.verb)
+
+
+# The actions for the verbs every world has.
+_ACTIONS = {
+    'get': Get,
+    'take': Get,
+    'use': Use,
+    'drop': Drop,
+    'look': Look,
+    'inventory': CheckInventory,
+    'talk': Talk,
+    'equip': Equip,
+    'remove': Remove,
+    'go': Go,
+    'give': Place,
+    'put': Place,
+}
+
+
 def move(entity, destination):
     """Moves an entity to a new container.
 
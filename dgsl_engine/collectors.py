@@ -70,10 +70,53 @@ class EntityCollector:
         self.visit_entity(npc)
 
 
+class IndexedEntityCollector:  # pylint: disable=too-few-public-methods
+    """Collects the items that match player input using a NameIndex.
+
+    Finds the same entities as EntityCollector, in the same order, when
+    match is 'substring'. Can also match whole words or find the best
+    matches (see NameIndex).
+
+    Attributes:
+        obj (str): The direct object to collect.
+        other (str): The indirect object to collect.
+        room (Room): The room to collect the items from.
+        name_index (NameIndex): The index to search.
+        match (str): The kind of match to make.
+    """
+
+    def __init__(self, obj, other, room, name_index, match='substring'):
+        self.obj = obj
+        self.other = other
+        self.room = room
+        self.name_index = name_index
+        self.match = match
+
+    def collect(self):
+        """Collect all objects that match the obj text.
+
+        Returns:
+            list of Entities: A list with all the entities that could
+                be a match for the obj.
+        """
+        return self.name_index.find(self.obj, self.room, self.match)
+
+
 class EntityCollectorFactory:  # pylint: disable=too-few-public-methods
-    """Factory to make an entity collector."""
+    """Factory to make an entity collector.
+
+    Attributes:
+        name_index (NameIndex): An index to collect entities with. If
+            None, or the index does not cover the place being searched,
+            an EntityCollector is used.
+        match (str): The kind of match indexed collectors should make.
+    """
+
+    def __init__(self, name_index=None, match='substring'):
+        self.name_index = name_index
+        self.match = match
 
-    def make(self, obj, other, entity):  # pylint: disable=no-self-use
+    def make(self, obj, other, entity):
         """Makes an entity collector.
 
         Args:
@@ -82,12 +125,19 @@ class EntityCollectorFactory:  # pylint: disable=too-few-public-methods
         Returns:
             EntityCollector: The new entity collector.
         """
+        if self.name_index is not None and self.name_index.covers(entity):
+            return IndexedEntityCollector(obj, other, entity,
+                                          self.name_index, self.match)
         return EntityCollector(obj, other, entity)
 
 
 class EntityTypeCollector:
     """A Collector that will collect all entities in from a list of types.
 
+    If the entity is in a world with a TypeIndex the entities are found
+    with the index, in the same order, instead of visiting everything in
+    the entity.
+
     Attributes:
         types (list): List of type names (str) to collect.
         entity (Entity): An entity to collect or start collection with.
@@ -104,7 +154,11 @@ class EntityTypeCollector:
 
     def collect(self):
         """Collect all entities of the given types from a given entity."""
-        self.entity.accept(self)
+        index = getattr(self.entity, 'index', None)
+        if index is not None and index.type_index is not None:
+            self.results = index.type_index.find(self.types, self.entity)
+        else:
+            self.entity.accept(self)
         return self.results
 
     def visit_entity(self, entity):
@@ -1,5 +1,12 @@
 """Game commands like quit and save."""
-from . import user_input
+import os
+import site
+from . import exceptions
+from . import prompts
+from . import world_state
+
+SAVE_DIR = os.path.join(site.USER_BASE, 'dgsl', 'saves')
+DEFAULT_SAVE = 'quicksave'
 
 
 def execute_command(verb, arg, game):
@@ -16,8 +23,18 @@ def execute_command(verb, arg, game):
             if the command does not exist (for now).
 
     """
+    return prompts.run(execute_command_steps(verb, arg, game))
+
+
+def execute_command_steps(verb, arg, game):
+    """Steps that execute a given command. See execute_command and the
+    prompts module."""
     if verb in ['quit', 'exit']:
-        return quit_game(game)
+        return (yield from quit_game_steps(game))
+    if verb == 'save':
+        return save_game(game, arg)
+    if verb == 'load':
+        return load_game(game, arg)
     return "Command " + str(arg)
 
 
@@ -31,8 +48,13 @@ def quit_game(game):
     Returns:
         str: A message about the result of the command.
     """
-    menu = user_input.Menu(['Quit'])
-    answer = menu.ask()
+    return prompts.run(quit_game_steps(game))
+
+
+def quit_game_steps(game):
+    """Steps that confirm the player wishes to quit the game. See
+    quit_game."""
+    answer = yield prompts.Prompt(choices=['Quit'])
 
     result = "\nQuitting ..."
 
@@ -45,3 +67,79 @@ def quit_game(game):
         result = "\nCancelled"
 
     return result
+
+
+def save_game(game, name):
+    """Saves the game's progress.
+
+    Only the changes made since the world was loaded are saved (see the
+    saves module).
+
+    Args:
+      game (Game): The game being played.
+      name (str): The name to save the game as. If empty the game is
+        saved as the default save.
+
+    Returns:
+        str: A message about the result of the command.
+    """
+    if game.state is None:
+        return "This game can't be saved"
+
+    from . import saves  # pylint: disable=import-outside-toplevel
+    name = save_name(name)
+    os.makedirs(game.save_dir, exist_ok=True)
+    saves.write(game.world, game.state, save_path(game, name))
+    return "Game saved as " + name
+
+
+def load_game(game, name):
+    """Replaces the game's progress with a saved game.
+
+    Args:
+      game (Game): The game being played.
+      name (str): The name of the save to load. If empty the default
+        save is loaded.
+
+    Returns:
+        str: A message about the result of the command and the room the
+            player is in after loading.
+    """
+    if game.state is None:
+        return "This game can't be loaded"
+
+    name = save_name(name)
+    path = save_path(game, name)
+    if not os.path.exists(path):
+        return "There is no saved game called " + name
+
+    from . import saves  # pylint: disable=import-outside-toplevel
+    try:
+        state = saves.read(game.world, path)
+    except exceptions.InvalidParameterError as err:
+        return str(err)
+
+    game.restore(state)
+    with world_state.using(state):
+        room = game.world.player.owner.describe()
+    return "Loaded " + name + "\n\n" + room
+
+
+def save_name(name):
+    """Turns the name a player gives a save into a safe file name.
+
+    Args:
+      name (str): The name given by the player.
+
+    Returns:
+        str: The name with only letters, numbers, '-' and '_'. The
+            default save name if nothing is left.
+    """
+    name = '_'.join((name or '').split())
+    name = ''.join(char for char in name if char.isalnum() or char in '-_')
+    return name or DEFAULT_SAVE
+
+
+def save_path(game, name):
+    """Returns the path of the save file with the given name."""
+    return os.path.join(game.save_dir, name + '.save')
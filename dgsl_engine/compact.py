@@ -0,0 +1,33 @@
+"""Selects the memory layout used for entities and events.
+
+By default the game object classes use ``__slots__`` so that each
+object stores its attributes in a fixed table instead of its own dict.
+For large worlds this saves a few hundred bytes per object.
+
+Setting the environment variable ``DGSL_COMPACT=0`` before the engine is
+imported builds the classes without slots. The objects then have a
+``__dict__`` like regular Python objects, which can make debugging and
+monkey patching easier. The attribute API is the same either way.
+"""
+import os
+
+COMPACT = os.environ.get('DGSL_COMPACT', '1') != '0'
+
+
+def slots(*names, base=False):
+    """Returns the ``__slots__`` for a game object class.
+
+    Args:
+        names (str): The attributes the class adds.
+        base (bool): True for classes that do not inherit from another
+            game object class. When compact layout is off these are the
+            classes that give the objects their ``__dict__``.
+
+    Returns:
+        tuple of str: The slot names.
+    """
+    if COMPACT:
+        return names
+    if base:
+        return ('__dict__', '__weakref__')
+    return ()
@@ -0,0 +1,379 @@
+"""Compiled world files and the functions to write and read them.
+
+A compiled world is a fully linked World flattened into a table of
+object records. Every Entity, Event, condition, option, and helper
+object gets one record holding its class and its attributes. References
+between objects are stored as indexes into the table, so loading a
+compiled world only has to create the objects and fill in their
+attributes. No json is parsed and none of the connectors are run.
+
+The file layout is::
+
+    MAGIC | version (1 byte) | marshal payload
+
+The payload is a dict::
+
+    {
+        'classes': [str, ...],          # class tags used by the records
+        'records': [(int, dict, dict), ...],
+                                        # (class index, values, references)
+        'entities': {str: int, ...},    # entity id -> record index
+        'events': {str: int, ...},      # event id -> record index
+        'player': int,                  # record index of the player
+        'details': int,                 # record index of the details
+    }
+
+Each record splits the attributes of its object in two. Attributes that
+hold only plain values (strings, numbers, lists, etc.) are stored as
+they are. Attributes that hold references to other objects are stored
+separately with each reference replaced by a one item tuple holding the
+record index. A small set of builtin functions (like the
+input function used by questions) are stored as a one item tuple
+holding their name. The game objects never hold tuples of their own so
+these can not be confused with real values.
+"""
+import gc
+import marshal
+from . import conditions
+from . import entity_base
+from . import entity_containers
+from . import equipment
+from . import event_base
+from . import event_composites
+from . import exceptions
+from . import interaction
+from . import registry
+from . import world
+
+MAGIC = b'DGSLWC'
+FORMAT_VERSION = 6
+
+# Only these classes can be created when reading a compiled world.
+_CLASSES = [
+    entity_base.Entity, entity_base.EntitySpec, entity_base.EntityStates,
+    entity_base.EntityEvents, entity_base.Inventory, entity_base.Equipped,
+    entity_containers.Container, entity_containers.Room,
+    entity_containers.Player, entity_containers.Npc,
+    equipment.Equipment,
+    event_base.Event, event_base.MoveEntity, event_base.Give,
+    event_base.Take, event_base.ToggleActive, event_base.ToggleObtainable,
+    event_base.ToggleHidden, event_base.EndGame,
+    event_composites.GroupEvent, event_composites.OrderedGroup,
+    event_composites.ConditionalEvent,
+    interaction.Interaction, interaction.Option,
+    interaction.ConditionalOption,
+    conditions.Question, conditions.HasItem, conditions.Protected,
+    conditions.IsActive,
+    world.WorldDetails,
+]
+
+_BUILTINS = {'input': input, 'print': print}
+
+# Attributes that are rebuilt when the world is loaded instead of stored.
+_TRANSIENT = {'index'}
+
+# Attributes that are stored as None, like the programs of composite
+# events, which are compiled again for the loaded world (see event_vm).
+_CLEARED = {'program'}
+
+
+def class_tag(cls):
+    """Returns the tag a class is stored under in a compiled world."""
+    return cls.__module__ + '.' + cls.__qualname__
+
+
+_TAGS = {class_tag(cls): cls for cls in _CLASSES}
+
+
+def _class(tag):
+    """Returns the class stored under a tag, including the classes of
+    plugins (see registry), or None if it can not be compiled."""
+    cls = _TAGS.get(tag)
+    if cls is None:
+        for registered in registry.classes():
+            if class_tag(registered) == tag:
+                return registered
+    return cls
+
+
+def is_compiled(path):
+    """Checks if the file at the given path is a compiled world.
+
+    Args:
+        path (str): The path to the file.
+
+    Returns:
+        bool: True if the file starts with the compiled world header.
+    """
+    with open(path, 'rb') as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+
+def compile_world(game_world):
+    """Flattens a fully built World into compiled world bytes.
+
+    Args:
+        game_world (World): The world to compile.
+
+    Returns:
+        bytes: The compiled world.
+    """
+    table = _RecordTable()
+    payload = {
+        'entities': {id_: table.ref(entity)
+                     for id_, entity in game_world.entities.items()},
+        'events': {id_: table.ref(event)
+                   for id_, event in game_world.events.items()},
+        'player': table.ref(game_world.player),
+        'details': table.ref(game_world.details),
+    }
+    table.fill()
+    payload['classes'] = table.tags
+    payload['records'] = table.records
+    return MAGIC + bytes([FORMAT_VERSION]) + marshal.dumps(payload)
+
+
+def decompile_world(data):
+    """Creates a World from compiled world bytes.
+
+    Args:
+        data (bytes): A compiled world.
+
+    Returns:
+        World: The new world.
+
+    Raises:
+        InvalidParameterError: If the data is not a compiled world, was
+            compiled with a different format version, or uses classes
+            that the engine does not know about.
+    """
+    header = len(MAGIC) + 1
+    if data[:len(MAGIC)] != MAGIC:
+        raise exceptions.InvalidParameterError(
+            "Error: not a compiled world")
+    if data[len(MAGIC)] != FORMAT_VERSION:
+        raise exceptions.InvalidParameterError(
+            "Error: compiled world format version {} is not supported".format(
+                data[len(MAGIC)]))
+
+    # Nothing is garbage while the objects are created, so the cyclic
+    # collector only slows it down. For large worlds it can take over
+    # half the time.
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _decompile(data[header:])
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _decompile(payload_data):
+    try:
+        payload = marshal.loads(payload_data)
+        classes = [_class(tag) for tag in payload['classes']]
+    except (EOFError, ValueError, TypeError, KeyError) as err:
+        raise exceptions.InvalidParameterError(
+            "Error: compiled world is corrupt: " + str(err))
+    if None in classes:
+        raise exceptions.InvalidParameterError(
+            "Error: compiled world uses an unknown class: "
+            + payload['classes'][classes.index(None)])
+
+    records = payload['records']
+    objects = [classes[cls_idx].__new__(classes[cls_idx])
+               for cls_idx, _, _ in records]
+    for obj, (_, values, refs) in zip(objects, records):
+        restore_state(obj, values)
+        if refs:
+            restore_state(obj, {name: _decode(value, objects)
+                                for name, value in refs.items()})
+
+    new_world = world.World()
+    for idx in payload['entities'].values():
+        new_world.add_entity(objects[idx])
+    for idx in payload['events'].values():
+        new_world.add_event(objects[idx])
+    new_world.player = objects[payload['player']]
+    new_world.details = objects[payload['details']]
+    return new_world
+
+
+def write(game_world, path):
+    """Compiles a world and writes it to a file.
+
+    Args:
+        game_world (World): The world to compile.
+        path (str): The path of the file to write.
+    """
+    with open(path, 'wb') as file:
+        file.write(compile_world(game_world))
+
+
+def read(path):
+    """Reads a compiled world file and returns the World.
+
+    Args:
+        path (str): The path of the compiled world.
+
+    Returns:
+        World: The new world.
+    """
+    with open(path, 'rb') as file:
+        return decompile_world(file.read())
+
+
+def object_state(obj):
+    """Returns the attributes of a game object that need to be stored.
+
+    Works for objects with slots (see compact) and objects with a dict.
+
+    Args:
+        obj: A game object.
+
+    Returns:
+        dict: The attribute names and values.
+    """
+    state = {}
+    for name in _slot_names(type(obj)):
+        if name not in _TRANSIENT and hasattr(obj, name):
+            state[name] = getattr(obj, name)
+    if hasattr(obj, '__dict__'):
+        state.update((name, value) for name, value in vars(obj).items()
+                     if name not in _TRANSIENT)
+    for name in _CLEARED.intersection(state):
+        state[name] = None
+    return state
+
+
+def restore_state(obj, state):
+    """Sets the attributes of a game object from a dict of values.
+
+    Args:
+        obj: A game object.
+        state (dict): The attribute names and values.
+    """
+    if not hasattr(obj, '__dict__'):
+        for name, value in state.items():
+            setattr(obj, name, value)
+        return
+    slots = _slot_names(type(obj))
+    if not slots:
+        obj.__dict__.update(state)
+        return
+    # A class without slots of its own, like a plugin's subclass of a
+    # game object, has both.
+    for name, value in state.items():
+        if name in slots:
+            setattr(obj, name, value)
+        else:
+            obj.__dict__[name] = value
+
+
+# Helpers ##############################################################
+
+_SLOT_NAMES = {}
+
+
+def _slot_names(cls):
+    """The names of all the slots of a class and its bases."""
+    names = _SLOT_NAMES.get(cls)
+    if names is None:
+        names = []
+        for klass in reversed(cls.__mro__):
+            slots = klass.__dict__.get('__slots__', ())
+            if isinstance(slots, str):
+                slots = (slots,)
+            names.extend(name for name in slots
+                         if name not in ('__dict__', '__weakref__'))
+        _SLOT_NAMES[cls] = names
+    return names
+
+
+class _RecordTable:
+    """The table of object records for a world being compiled.
+
+    Objects are given an index the first time they are referenced and
+    their records are filled in afterwards. Filling in a record can
+    reference new objects, so fill keeps going until every referenced
+    object has a record. This keeps compilation from recursing through
+    the object graph.
+
+    Attributes:
+        tags (list of str): The class tags used by the records.
+        records (list): The (class index, values, references) records.
+    """
+
+    def __init__(self):
+        self.tags = []
+        self.records = []
+        self._indexes = {}
+        self._class_indexes = {}
+        self._objects = []
+
+    def ref(self, obj):
+        """Returns the record index of an object, adding it if needed."""
+        idx = self._indexes.get(id(obj))
+        if idx is None:
+            tag = class_tag(type(obj))
+            if _class(tag) is None:
+                raise exceptions.InvalidParameterError(
+                    "Error: can't compile objects of type " + tag)
+            if tag not in self._class_indexes:
+                self._class_indexes[tag] = len(self.tags)
+                self.tags.append(tag)
+            idx = len(self._objects)
+            self._indexes[id(obj)] = idx
+            self._objects.append(obj)
+            self.records.append((self._class_indexes[tag], None, None))
+        return idx
+
+    def fill(self):
+        """Fills in the records for every referenced object."""
+        idx = 0
+        while idx < len(self._objects):
+            values = {}
+            refs = {}
+            for name, value in object_state(self._objects[idx]).items():
+                encoded = self._encode(value)
+                if _is_plain(value):
+                    values[name] = encoded
+                else:
+                    refs[name] = encoded
+            self.records[idx] = (self.records[idx][0], values, refs)
+            idx += 1
+
+    def _encode(self, value):
+        if _is_plain(value):
+            return value
+        if isinstance(value, list):
+            return [self._encode(item) for item in value]
+        if isinstance(value, dict):
+            return {key: self._encode(item) for key, item in value.items()}
+        name = getattr(value, '__name__', None)
+        if name in _BUILTINS and _BUILTINS[name] is value:
+            return (name,)
+        return (self.ref(value),)
+
+
+def _is_plain(value):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return True
+    if isinstance(value, list):
+        return all(_is_plain(item) for item in value)
+    if isinstance(value, dict):
+        return all(_is_plain(item) for item in value.values())
+    return False
+
+
+def _decode(value, objects):
+    type_ = type(value)
+    if type_ is tuple:
+        if type(value[0]) is int:  # pylint: disable=unidiomatic-typecheck
+            return objects[value[0]]
+        return _BUILTINS[value[0]]
+    if type_ is list:
+        return [_decode(item, objects) for item in value]
+    if type_ is dict:
+        return {key: _decode(item, objects) for key, item in value.items()}
+    return value
@@ -1,5 +1,13 @@
-"""Conditions to test the player or other entities with."""
+"""Conditions to test the player or other entities with.
+
+HasItem remembers its results for each container it tests (see
+world_state.remember). Testing it again only works the result out again
+if something it looked at has changed since, like the inventory of a
+container.
+"""
 from . import collectors
+from . import prompts
+from . import world_state
 
 
 class Question:  # pylint: disable=too-few-public-methods
@@ -27,9 +35,15 @@ class Question:  # pylint: disable=too-few-public-methods
             bool: True if the player gives the correct answer, otherwise
                 False.
         """
-        print(self.question)
-        ans = self._in("Answer: ")
-        print()
+        return prompts.run(self.test_steps(),
+                           prompts.ConsoleAsker(in_=self._in))
+
+    def test_steps(self, _=None):
+        """Steps that ask the question and evaluate the answer.
+
+        See test and the prompts module.
+        """
+        ans = yield prompts.Prompt(self.question)
         if ans.strip().lower() == self.answer.lower():
             return True
         return False
@@ -72,14 +86,13 @@ class HasItem:  # pylint: disable=too-few-public-methods
         Returns:
             bool: True if the object is found, otherwise false.
         """
-        if self.other is None:
-            item = container.get(self.item_id)
-        else:
-            item = self.other.get(self.item_id)
+        if self.other is not None:
+            container = self.other
+        return world_state.remember((self, container), self._test,
+                                    container)
 
-        if item is not None:
-            return True
-        return False
+    def _test(self, container):
+        return container.get(self.item_id) is not None
 
 
 class Protected:  # pylint: disable=too-few-public-methods
@@ -97,6 +110,11 @@ class Protected:  # pylint: disable=too-few-public-methods
         """Tests the character to make sure they are protected from all
         the effects.
 
+        A character is protected by the equipment they wear, and by the
+        equipment they carry that does not need to be worn. Both are
+        counted as equipment moves (see Inventory.protection and
+        Equipped.protection), so this only looks the effects up.
+
         Args:
           character (Character): The character to check is protected.
 
@@ -104,55 +122,20 @@ class Protected:  # pylint: disable=too-few-public-methods
             bool: True if the character is protected from ALL the effects,
                 otherwise False.
         """
-        not_equipped = _get_valid_carried(character)
-        protected = set()
+        worn = character.equipped.protection
+        carried = character.inventory.protection
         for effect in self.effects:
-            protected = False
-
-            for equipment in character.equipped:
-                if effect in equipment.protects:
-                    protected = True
-                    break
-
-            if not protected:
-                for equipment in not_equipped:
-                    if effect in equipment.protects:
-                        protected = True
-                        break
-
-            if not protected:
+            if effect not in worn and effect not in carried:
                 return False
         return True
 
 
-def _get_valid_carried(character):
-    """Get all equipment that may offer protection from a player's
-    inventory or that they have equipped.
-
-    This is necessary because some equipment must be equipped in order
-    to offer protection and some equipment can offer protection as long
-    as it is being carried by the player.
-
-    Args:
-        character (Character): The character to get equipment from.
-
-    Returns:
-        A list of Equipment that may offer protection.
-    """
-    collector = collectors.EntityTypeCollector(['equipment'], character)
-    equipment = collector.collect()
-    results = []
-    for equip in equipment:
-        if not equip.must_equip and not equip.equipped:
-            results.append(equip)
-    return results
-
-
 class IsActive:  # pylint: disable=too-few-public-methods
     """Checks to see if an entity is active.
 
     Though it is almost trivial, using an object for this allows it to
-    be attached to Events and Interaction Options easily.
+    be attached to Events and Interaction Options easily. It only reads
+    one state, so unlike HasItem its result is not remembered.
 
     Attributes:
         entity (Entity): The entity to check is active."""
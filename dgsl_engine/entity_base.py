@@ -1,6 +1,9 @@
 """
 Base Event as well as supporting classes and functions.
 """
+from . import compact
+from . import prompts
+from . import world_state
 
 
 class Entity:
@@ -12,13 +15,46 @@ class Entity:
         events (EntityEvents): Events attached to the entity that can be
             triggered by player interactions.
         owner (Container): The container that the entity is in.
+        index (EntityIndex): The index of the world the entity is in.
+            None if the entity is not part of a world.
     """
 
+    __slots__ = compact.slots('spec', 'states', 'events', '_owner', 'index',
+                              base=True)
+
+    owner = world_state.Field()
+
     def __init__(self, obj_id):
         self.spec = EntitySpec(obj_id)
         self.states = EntityStates()
         self.events = EntityEvents()
         self.owner = None
+        self.index = None
+
+    def set_owner(self, owner):
+        """Sets the owner of the entity and records the move in its index.
+
+        All changes to where an entity is should go through this so that
+        the world index stays up to date.
+
+        Args:
+            owner (Container): The new owner. None if the entity is not
+                in anything.
+        """
+        old = self.owner
+        carry(self, old, -1)
+        self.owner = owner
+        carry(self, owner, 1)
+        if self.index is not None:
+            self.index.moved(self, old, owner)
+
+    def carried_protection(self):
+        """Gives the effects the entity protects whoever carries it from.
+
+        Returns:
+            dict: Counts of the effects, or None if there are none.
+        """
+        return None
 
     def describe(self):
         """Gives a description of the entity.
@@ -48,6 +84,8 @@ class EntitySpec:  # pylint: disable=too-few-public-methods
         description (str): A more detailed description.
     """
 
+    __slots__ = compact.slots('id', 'name', 'description', base=True)
+
     def __init__(self, obj_id):
         self.id = obj_id  # pylint: disable=invalid-name
         self.name = "Null"
@@ -63,6 +101,13 @@ class EntityStates:
         hidden (bool): If an entity can be seen and interacted with.
     """
 
+    __slots__ = compact.slots('_active', '_obtainable', '_hidden',
+                              base=True)
+
+    active = world_state.Field()
+    obtainable = world_state.Field()
+    hidden = world_state.Field()
+
     def __init__(self):
         self.active = True
         self.obtainable = True
@@ -104,6 +149,8 @@ class EntityEvents:
             Events attached to an entity.
     """
 
+    __slots__ = compact.slots('events', base=True)
+
     def __init__(self):
         self.events = {}
 
@@ -137,6 +184,12 @@ class EntityEvents:
         """
         return self.events[verb].execute(entity)
 
+    def execute_steps(self, verb, entity):
+        """Steps that execute the event on the given entity. See execute
+        and the prompts module."""
+        return (yield from prompts.call(self.events[verb], 'execute',
+                                        entity))
+
     def has_event(self, verb):
         """Checks to see if the given verb has an associated event.
 
@@ -163,10 +216,20 @@ class Inventory:
     Attributes:
         items (dict <str, :class:`Entity <dgsl_engine.entity_base.Entity>`>):
             Entities in the inventory.
+        protection (dict): Counts of the effects that the entities in the
+            inventory, and in the containers in it, protect whoever
+            carries them from (see Entity.carried_protection). Kept up to
+            date as entities move.
     """
 
+    __slots__ = compact.slots('_items', '_protection', base=True)
+
+    items = world_state.Field(copy=dict)
+    protection = world_state.Field(copy=dict)
+
     def __init__(self):
         self.items = {}
+        self.protection = {}
 
     def __iter__(self):
         for k in self.items:
@@ -187,7 +250,7 @@ class Inventory:
             already there.
         """
         if item.spec.id not in self.items:
-            self.items[item.spec.id] = item
+            Inventory.items.for_write(self)[item.spec.id] = item
             return True
         return False
 
@@ -201,7 +264,9 @@ class Inventory:
             Entity: The Entity with the given id. None if the Entity is
             not in the inventory.
         """
-        return self.items.pop(item_id, None)
+        if item_id not in self.items:
+            return None
+        return Inventory.items.for_write(self).pop(item_id)
 
     def has_item(self, item_id):
         """Checks to see if an Entity with the given id is in the inventory.
@@ -223,11 +288,20 @@ class Equipped:
         equipment (dict): The worn equipment. The keys are the name of
             the slot the equipment is being worn in and the values are
             the equipment.
+        protection (dict): Counts of the effects the worn equipment
+            protects from.
     """
 
+    __slots__ = compact.slots('owner', '_equipment', '_protection',
+                              base=True)
+
+    equipment = world_state.Field(copy=dict)
+    protection = world_state.Field(copy=dict)
+
     def __init__(self, owner):
         self.owner = owner
         self.equipment = {}
+        self.protection = {}
 
     def __iter__(self):
         for k in self.equipment:
@@ -251,9 +325,10 @@ class Equipped:
         old = None
         if slot in self.equipment:
             old = self.remove(slot)
-        self.equipment[slot] = equipment
-        equipment.owner = self.owner
-        equipment.equipped = True
+        Equipped.equipment.for_write(self)[slot] = equipment
+        equipment.set_equipped(True)
+        equipment.set_owner(self.owner)
+        add_counts(Equipped.protection.for_write(self), equipment.protects, 1)
         return old
 
     def remove(self, slot):
@@ -268,9 +343,10 @@ class Equipped:
         old = None
         if slot in self.equipment:
             old = self.equipment[slot]
-            old.owner = None
-            old.equipped = False
-            del self.equipment[slot]
+            del Equipped.equipment.for_write(self)[slot]
+            add_counts(Equipped.protection.for_write(self), old.protects, -1)
+            old.set_owner(None)
+            old.set_equipped(False)
         return old
 
     def wearing(self, equip):
@@ -293,3 +369,44 @@ class Equipped:
         if slot in self.equipment:
             return self.equipment[slot]
         return None
+
+
+def add_counts(counts, effects, sign):
+    """Adds effects to a dict of counts, or takes them away.
+
+    Effects whose count reaches 0 are removed, so an effect is in the
+    counts only while something offers it.
+
+    Args:
+        counts (dict): The counts to change.
+        effects: The effects, as a list or a dict of counts.
+        sign (int): 1 to add the effects, -1 to take them away.
+    """
+    if isinstance(effects, dict):
+        effects = effects.items()
+    else:
+        effects = ((effect, 1) for effect in effects)
+    for effect, count in effects:
+        total = counts.get(effect, 0) + sign * count
+        if total:
+            counts[effect] = total
+        else:
+            del counts[effect]
+
+
+def carry(entity, owner, sign):
+    """Adds the protection an entity offers to the inventories of a
+    container and the containers it is in, or takes it away.
+
+    Args:
+        entity (Entity): The entity being carried.
+        owner (Container): The container carrying it, or None.
+        sign (int): 1 to add the protection, -1 to take it away.
+    """
+    effects = entity.carried_protection()
+    if not effects:
+        return
+    while owner is not None:
+        add_counts(Inventory.protection.for_write(owner.inventory), effects,
+                   sign)
+        owner = owner.owner
@@ -1,11 +1,17 @@
 """
 Classes of Entities that can contain other entities and related
 functions and exceptions.
+
+Descriptions of containers and rooms are remembered (see
+world_state.remember) until their inventory or states change, so looking
+at a room that has not changed does not build its description again.
 """
-from functools import singledispatch
 from abc import ABC
 from . import entity_base
 from . import collectors
+from . import compact
+from . import prompts
+from . import world_state
 
 
 class Container(entity_base.Entity):
@@ -17,6 +23,8 @@ class Container(entity_base.Entity):
         inventory (Inventory): The inventory that holds the entities.
     """
 
+    __slots__ = compact.slots('inventory')
+
     def __init__(self, obj_id):
         entity_base.Entity.__init__(self, obj_id)
         self.inventory = entity_base.Inventory()
@@ -34,17 +42,34 @@ class Container(entity_base.Entity):
             ContainerError: If the item is a Player or a Room.
         """
         if _add_to_container(item, self):
-            item.owner = self
+            item.set_owner(self)
             return True
         return False
 
     def get(self, item_id):
-        """Get an item from the Container by ID."""
+        """Get an item from the Container by ID.
+
+        Uses the world index if the container is part of a world,
+        otherwise searches the container and its sub containers.
+
+        Returns:
+            Entity: The item if it is in the container, otherwise None.
+        """
+        if self.index is not None:
+            return self.index.find(item_id, self)
         collector = collectors.EntityIdCollector(item_id, self)
         return collector.collect()
 
+    def carried_protection(self):
+        """See Entity.carried_protection. A container protects whoever
+        carries it from what the things in it protect from."""
+        return self.inventory.protection
+
     def describe(self):
         """Returns the description of the container."""
+        return world_state.remember((self, 'describe'), self._describe)
+
+    def _describe(self):
         desc = [self.spec.description]
         if self.states.active:
             desc.extend(
@@ -69,6 +94,8 @@ class Container(entity_base.Entity):
 class Room(Container):
     """A location in a World that can hold any entity except other rooms."""
 
+    __slots__ = compact.slots()
+
     def __init__(self, obj_id):
         Container.__init__(self, obj_id)
         self.states.active = True
@@ -82,12 +109,15 @@ class Room(Container):
             ContainerError: If  the entity is a Room.
         """
         if _add_to_room(item, self):
-            item.owner = self
+            item.set_owner(self)
             return True
         return False
 
     def describe(self):
         """Returns a description of the room."""
+        return world_state.remember((self, 'describe'), self._describe)
+
+    def _describe(self):
         desc = [self.spec.description]
         if not self.inventory.empty():
             desc.append("")
@@ -106,10 +136,16 @@ class Room(Container):
         Returns:
             str: A description of the results.
         """
+        return prompts.run(self.enter_steps(affected))
+
+    def enter_steps(self, affected):
+        """Steps that run the events that trigger when the player enters
+        the room. See enter."""
         result = []
         result.append(self.describe())
         if self.events.has_event('enter'):
-            enter = self.events.execute('enter', affected)
+            enter = yield from prompts.call(self.events, 'execute', 'enter',
+                                            affected)
             if enter != '':
                 result.append('')
                 result.append(enter)
@@ -130,6 +166,8 @@ class Character(Container, ABC):
     Attributes:
         equipped (Equipped): The equipment the character is wearing."""
 
+    __slots__ = compact.slots('equipped')
+
     def __init__(self, obj_id):
         super(Character, self).__init__(obj_id)
         self.equipped = entity_base.Equipped(self)
@@ -145,6 +183,8 @@ class Player(Character):
     Cannot contain Rooms.
     """
 
+    __slots__ = compact.slots()
+
     def __init__(self, obj_id):
         super(Player, self).__init__(obj_id)
         self.states.active = True
@@ -166,6 +206,8 @@ class Npc(Character):
     Items it holds cannot be found when looking for items.
     """
 
+    __slots__ = compact.slots()
+
     def __repr__(self):
         return "<Npc '{}', Name: '{}', Contents: {}>".format(
             self.spec.id, self.spec.name, self._repr_contents())
@@ -183,27 +225,18 @@ class ContainerError(Exception):
 
 # Helpers ##############################################################
 
-# These functions overload the add functions for different container
+# These functions check what can be added to the different container
 # types. This mostly keeps containers, rooms, and characters from
 # containing rooms.
 
-@singledispatch
 def _add_to_container(item, container):
+    if isinstance(item, (Room, Player)):
+        raise ContainerError("Error: Can't add " + str(type(item)) + " to a "
+                             + str(type(container)))
     return container.inventory.add(item)
 
 
-@_add_to_container.register(Room)
-@_add_to_container.register(Player)
-def _(item, container):
-    raise ContainerError("Error: Can't add " + str(type(item)) + " to a " +
-                         str(type(container)))
-
-
-@singledispatch
 def _add_to_room(item, room):
+    if isinstance(item, Room):
+        raise ContainerError("Error: Can't add a Room to a Room")
     return room.inventory.add(item)
-
-
-@_add_to_room.register(Room)
-def _(item, room):
-    raise ContainerError("Error: Can't add a Room to a Room")
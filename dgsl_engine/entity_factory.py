@@ -3,6 +3,7 @@ from . import entity_base
 from . import entity_containers
 from . import exceptions
 from . import equipment
+from . import registry
 
 
 class EntityFactory:  # pylint: disable=too-few-public-methods
@@ -19,24 +20,13 @@ class EntityFactory:  # pylint: disable=too-few-public-methods
             Entity: The new entity.
         """
         try:
-            type_ = obj['type']
-            id_ = obj['id']
-            if type_ == 'entity':
-                entity = entity_base.Entity(id_)
-            elif type_ == 'container':
-                entity = entity_containers.Container(id_)
-            elif type_ == 'room':
-                entity = entity_containers.Room(id_)
-            elif type_ == 'player':
-                entity = entity_containers.Player(id_)
-            elif type_ == 'npc':
-                entity = entity_containers.Npc(id_)
-            elif type_ == 'equipment':
-                entity = equipment.Equipment(id_)
-                _setup_equipment(entity, obj)
-            else:
+            object_type = registry.get(obj['type'])
+            if object_type is None or object_type.kind != registry.ENTITY:
                 raise exceptions.InvalidParameterError(
-                    "Error: invalid obj of type " + type_)
+                    "Error: invalid obj of type " + obj['type'])
+            entity = object_type.make(obj['id'])
+            if object_type.setup is not None:
+                object_type.setup(entity, obj)
 
             _setup_entity(entity, obj)
 
@@ -53,14 +43,17 @@ def _setup_entity(entity, obj):
     entity.spec.name = obj['name']
     entity.spec.description = obj['description']
 
-    if obj['type'] not in ['room', 'player']:
-        entity.states.active = num_to_bool(obj['active'])
-        entity.states.obtainable = num_to_bool(obj['obtainable'])
-        entity.states.hidden = num_to_bool(obj['hidden'])
+
+def _setup_states(entity, obj):
+    """Sets the states of entities that are not rooms or players."""
+    entity.states.active = num_to_bool(obj['active'])
+    entity.states.obtainable = num_to_bool(obj['obtainable'])
+    entity.states.hidden = num_to_bool(obj['hidden'])
 
 
 def _setup_equipment(entity, obj):
     """Setups the extra attributes for equipment."""
+    _setup_states(entity, obj)
     entity.protects = obj['protects']
     entity.slot = obj['slot']
     entity.must_equip = num_to_bool(obj['must_equip'])
@@ -69,3 +62,13 @@ def _setup_equipment(entity, obj):
 def num_to_bool(num):
     """Turns a number into a bool."""
     return num != 0
+
+
+registry.register_entity('entity', entity_base.Entity, _setup_states)
+registry.register_entity('container', entity_containers.Container,
+                         _setup_states)
+registry.register_entity('room', entity_containers.Room)
+registry.register_entity('player', entity_containers.Player,
+                         references=('events', 'items', 'start'))
+registry.register_entity('npc', entity_containers.Npc, _setup_states)
+registry.register_entity('equipment', equipment.Equipment, _setup_equipment)
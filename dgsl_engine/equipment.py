@@ -1,5 +1,7 @@
 """Equipment"""
-from .entity_base import Entity
+from .entity_base import Entity, add_counts, carry
+from . import compact
+from . import world_state
 
 
 class Equipment(Entity):
@@ -16,6 +18,11 @@ class Equipment(Entity):
         equipped (bool): Wether or not the equipment is being worn.
     """
 
+    __slots__ = compact.slots('protects', 'slot', 'must_equip',
+                              '_equipped')
+
+    equipped = world_state.Field()
+
     def __init__(self, obj_id):
         super(Equipment, self).__init__(obj_id)
         self.protects = []
@@ -24,6 +31,28 @@ class Equipment(Entity):
         self.owner = None
         self.equipped = False
 
+    def carried_protection(self):
+        """See Entity.carried_protection. Equipment that is worn, or that
+        must be worn to protect, does not protect whoever carries it."""
+        if self.equipped or self.must_equip or not self.protects:
+            return None
+        counts = {}
+        add_counts(counts, self.protects, 1)
+        return counts
+
+    def set_equipped(self, equipped):
+        """Sets wether the equipment is being worn.
+
+        Worn equipment stops protecting whoever carries it, so the
+        protection counts of the containers it is in are updated.
+
+        Args:
+            equipped (bool): True if the equipment is being worn.
+        """
+        carry(self, self.owner, -1)
+        self.equipped = equipped
+        carry(self, self.owner, 1)
+
     def accept(self, visitor):
         """Accepts a visitor"""
         visitor.visit_equipment(self)
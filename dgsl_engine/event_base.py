@@ -1,5 +1,8 @@
 """Base Event as well as supporting classes and functions."""
 from . import actions
+from . import compact
+from . import prompts
+from . import world_state
 
 
 class Event:
@@ -11,15 +14,29 @@ class Event:
         is_done (bool): If the event is finished and will not happen again.
         message (str): The message to return when the event executes.
         subjects (Event): Events to be notified when the event is executed.
-            (Not implemented properly yet).
+            (Not implemented properly yet). The list is only created once
+            an event is registered, since most events have no subjects.
     """
 
+    __slots__ = compact.slots('id', 'only_once', '_is_done', 'message',
+                              '_subjects', base=True)
+
+    is_done = world_state.Field()
+
     def __init__(self, obj_id):
         self.id = obj_id  # pylint: disable=invalid-name
         self.only_once = False
         self.is_done = False
         self.message = None
-        self.subjects = []
+        self._subjects = None
+
+    @property
+    def subjects(self):
+        """list of Event: Events to be notified when the event is
+        executed."""
+        if self._subjects is None:
+            self._subjects = []
+        return self._subjects
 
     # Affected should just be the player
     def execute(self, affected):  # pylint: disable=unused-argument
@@ -64,15 +81,32 @@ class MoveEntity(Event):
 
     Attributes:
         destination (Container): The Container to move the entity to.
+            None in lazy worlds (see LazyWorld), where the destination is
+            found by its id when the move happens so that rooms are only
+            built when they are entered.
+        destination_id (str): The id of the destination.
     """
 
+    __slots__ = compact.slots('destination', 'destination_id')
+
     def __init__(self, obj_id):
         super(MoveEntity, self).__init__(obj_id)
         self.destination = None
+        self.destination_id = None
 
     def execute(self, affected):
         """Moves the Player(affected) to the destination."""
-        actions.move(affected, self.destination)
+        return prompts.run(self.execute_steps(affected))
+
+    def execute_steps(self, affected):
+        """Steps that move the Player(affected) to the destination.
+
+        Entering the destination can run events that prompt the player.
+        """
+        destination = self.destination
+        if destination is None:
+            destination = affected.index.entities[self.destination_id]
+        actions.move(affected, destination)
 
         result = []
 
@@ -81,7 +115,8 @@ class MoveEntity(Event):
             result.append(super_result + '\n')
 
         # This definitely requires that this action is only for the player
-        result.append(self.destination.enter(affected))
+        enter = yield from prompts.call(destination, 'enter', affected)
+        result.append(enter)
 
         return '\n'.join(result)
 
@@ -101,6 +136,8 @@ class Give(Event):
         item_owner (str): The container to transfer the item from.
     """
 
+    __slots__ = compact.slots('item_id', 'item_owner')
+
     def __init__(self, obj_id):
         super(Give, self).__init__(obj_id)
         self.item_id = None
@@ -130,6 +167,8 @@ class Take(Event):
         new_owner (Container): The container to transfer the item to.
     """
 
+    __slots__ = compact.slots('item_id', 'new_owner')
+
     def __init__(self, obj_id):
         super(Take, self).__init__(obj_id)
         self.item_id = None
@@ -158,6 +197,8 @@ class Toggle(Event):
         target (Entity): The entity to toggle.
     """
 
+    __slots__ = compact.slots('target')
+
     def __init__(self, obj_id):
         super(Toggle, self).__init__(obj_id)
         self.target = None
@@ -170,6 +211,8 @@ class Toggle(Event):
 class ToggleActive(Toggle):
     """Toggle the active state of an entity."""
 
+    __slots__ = compact.slots()
+
     def execute(self, affected):
         """Toggles the state of the target."""
         if self.is_done:
@@ -184,6 +227,8 @@ class ToggleActive(Toggle):
 class ToggleObtainable(Toggle):
     """Toggles weather an Entity is obtainable or not."""
 
+    __slots__ = compact.slots()
+
     def execute(self, affected):
         """Toggles the obtainable state of the target."""
         if self.is_done:
@@ -198,6 +243,8 @@ class ToggleObtainable(Toggle):
 class ToggleHidden(Toggle):
     """Toggles the hidden state of an Entity."""
 
+    __slots__ = compact.slots()
+
     def execute(self, affected):
         """Toggles the hidden state of the target."""
         if self.is_done:
@@ -215,6 +262,8 @@ class ToggleHidden(Toggle):
 class EndGame(Event):
     """Event to end the game."""
 
+    __slots__ = compact.slots()
+
     def execute(self, affected):
         """Ends the game."""
         affected.states.hidden = True  # really only ever meant for the player
@@ -1,6 +1,43 @@
-"""Events that are composed of other events."""
+"""Events that are composed of other events.
+
+Composite events are executed by run_steps without recursing through
+Python frames. The steps of each composite event are a frame that yields
+Execute(event) when it needs the result of another event. run_steps
+keeps the frames of the composite events it is running on a stack of
+its own and sends each frame the result of the event it asked for, so
+events can be nested as deeply as the Limits allow without reaching
+Python's recursion limit.
+
+Everything run_steps runs in one turn counts towards the same Limits,
+including composite events run from inside the events it runs (like the
+enter events of a room a MoveEntity moves into). A turn starts when the
+first composite event runs and ends when it is done. An event that runs
+itself, events nested more than Limits.max_depth deep, or more than
+Limits.max_steps events in one turn stop the turn with an
+EventLimitError naming the events, instead of recursing until the stack
+runs out or running forever. Games set their limits with ``limited``
+(see Game.limits).
+
+A frame that has results waiting to be returned passes them with the
+events it executes. If one of those events prompts the player, the
+waiting results are shown before the prompt, so the player sees the
+results of events in the order they ran. On the console the results are
+returned when the event is done instead, like they always have been
+(see the prompts module).
+"""
+import contextlib
+import contextvars
+from . import compact
 from . import event_base
 from . import exceptions
+from . import prompts
+from . import world_state
+
+MAX_DEPTH = 100
+MAX_STEPS = 10000
+
+# Events shown at each end of a chain of events in error messages.
+_SHOWN = 5
 
 
 class GroupEvent(event_base.Event):
@@ -10,14 +47,27 @@ class GroupEvent(event_base.Event):
 
     Attributes:
         events (Event): The events to execute.
+        program: The Program the group runs instead of executing its
+            events one by one, or None (see event_vm).
     """
 
+    __slots__ = compact.slots('events', 'program')
+
     def __init__(self, obj_id):
         super(GroupEvent, self).__init__(obj_id)
         self.events = []
+        self.program = None
 
     def execute(self, affected):
         """Executes all the events it contains and returns the results."""
+        return prompts.run(self.execute_steps(affected))
+
+    def execute_steps(self, affected):
+        """Steps that execute the group. See execute."""
+        return (yield from run_steps(self, affected))
+
+    def frame_steps(self, affected):
+        """The frame run_steps runs to execute the group."""
         results = []
 
         result = super(GroupEvent, self).execute(affected)
@@ -25,7 +75,7 @@ class GroupEvent(event_base.Event):
             results.append(result)
 
         for event in self.events:
-            result = event.execute(affected)
+            result = yield Execute(event, results)
             if result != '':
                 results.append(result)
 
@@ -60,6 +110,10 @@ class OrderedGroup(GroupEvent):
             events have been executed or to do nothing.
     """
 
+    __slots__ = compact.slots('_idx', 'last')
+
+    idx = world_state.Field()
+
     def __init__(self, obj_id):
         super(OrderedGroup, self).__init__(obj_id)
         self.idx = 0
@@ -67,10 +121,14 @@ class OrderedGroup(GroupEvent):
 
     def execute(self, affected):
         """Executes the current event and returns the result."""
+        return prompts.run(self.execute_steps(affected))
+
+    def frame_steps(self, affected):
+        """The frame run_steps runs to execute the current event."""
         if self.is_done:
             return ''
 
-        res = self.events[self.idx].execute(affected)
+        res = yield Execute(self.events[self.idx])
         res_super = event_base.Event.execute(self, affected)  # not ok?
 
         if self.idx < len(self.events) - 1:
@@ -108,25 +166,44 @@ class ConditionalEvent(event_base.Event):
         success (Event): The event to execute if the condition succeeds.
         failure (Event): The event to execute if the condition fails.
         passed (bool): Weather the condition has been satisfied or not.
+        program: The Program the event runs instead of executing the
+            success or failure event itself, or None (see event_vm).
     """
 
+    __slots__ = compact.slots('condition', 'success', 'failure',
+                              '_passed', 'program')
+
+    passed = world_state.Field()
+
     def __init__(self, obj_id):
         super(ConditionalEvent, self).__init__(obj_id)
         self.condition = None
         self.success = None
         self.failure = None
         self.passed = False
+        self.program = None
 
     def execute(self, affected):
         """Tests the condition and execute the appropriate event."""
+        return prompts.run(self.execute_steps(affected))
+
+    def execute_steps(self, affected):
+        """Steps that test the condition and execute the appropriate
+        event. See execute."""
+        return (yield from run_steps(self, affected))
+
+    def frame_steps(self, affected):
+        """The frame run_steps runs to test the condition and execute the
+        appropriate event."""
         self.passed = False
-        succeeded = self.condition.test(affected)
+        succeeded = yield from prompts.call(self.condition, 'test',
+                                            affected)
 
         if succeeded:
-            res = self.success.execute(affected)
+            res = yield Execute(self.success)
             self.passed = True
         elif self.failure is not None:
-            res = self.failure.execute(affected)
+            res = yield Execute(self.failure)
         else:
             res = ''
 
@@ -145,3 +222,272 @@ class ConditionalEvent(event_base.Event):
     def _check_if_done(self):
         if self.passed and self.only_once:
             self.is_done = True
+
+
+class Execute:  # pylint: disable=too-few-public-methods
+    """Yielded by the frame of a composite event to execute another event.
+    The frame is sent the result.
+
+    Attributes:
+        event (Event): The event to execute.
+        lines (list of str): Results of the frame waiting to be returned.
+            They are shown before the first prompt the event asks, and
+            removed from the list. None if there are none.
+    """
+
+    __slots__ = ('event', 'lines')
+
+    def __init__(self, event, lines=None):
+        self.event = event
+        self.lines = lines
+
+
+class Limits:  # pylint: disable=too-few-public-methods
+    """How much composite events can do in one turn.
+
+    Attributes:
+        max_depth (int): The most composite events that can be running
+            inside each other.
+        max_steps (int): The most events that can be executed in a turn.
+            Programs (see event_vm) count each instruction they run.
+    """
+
+    def __init__(self, max_depth=MAX_DEPTH, max_steps=MAX_STEPS):
+        self.max_depth = max_depth
+        self.max_steps = max_steps
+
+    def __repr__(self):
+        return "<Limits - Depth: {}, Steps: {}>".format(
+            self.max_depth, self.max_steps)
+
+
+_LIMITS = contextvars.ContextVar('dgsl_event_limits', default=Limits())
+_TURN = contextvars.ContextVar('dgsl_event_turn', default=None)
+
+
+@contextlib.contextmanager
+def limited(limits):
+    """Context manager to use some Limits for the turns started in it.
+
+    Args:
+        limits (Limits): The limits to use.
+    """
+    token = _LIMITS.set(limits)
+    try:
+        yield limits
+    finally:
+        _LIMITS.reset(token)
+
+
+def run_steps(event, affected):
+    """Steps that execute a composite event and the events it runs.
+
+    Composite events of the built in classes are run from their
+    frame_steps on a stack (see the module docs). Other events, and
+    composite events that have a program (see event_vm), are run with
+    prompts.call. Subclasses of the composite events that change how
+    they execute can call this with themselves to run their own
+    frame_steps.
+
+    Args:
+        event (Event): The composite event to execute.
+        affected (Entity): The entity affected by the events.
+
+    Returns:
+        str: A description of the results.
+
+    Raises:
+        EventLimitError: If an event runs itself or the turn goes past
+            its Limits.
+    """
+    turn = _TURN.get()
+    if turn is not None:
+        turn.enter(event)
+        try:
+            return (yield from _event_steps(event, affected, turn))
+        finally:
+            turn.leave()
+
+    # The turn is only current while its steps run, so it is not left
+    # current while a prompt waits to be answered.
+    turn = _Turn(_LIMITS.get())
+    turn.enter(event)
+    steps = _event_steps(event, affected, turn)
+    answer = None
+    while True:
+        token = _TURN.set(turn)
+        try:
+            prompt = steps.send(answer)
+        except StopIteration as stop:
+            return stop.value
+        finally:
+            _TURN.reset(token)
+        answer = yield prompt
+
+
+def current_turn():
+    """Returns the turn that is running, or None if there is none.
+
+    Programs (see event_vm) count their instructions on the turn.
+    """
+    return _TURN.get()
+
+
+def charge(steps):
+    """Counts steps towards the limits of the current turn, if there is
+    one.
+
+    Raises:
+        EventLimitError: If the turn goes past its step limit.
+    """
+    turn = _TURN.get()
+    if turn is not None:
+        turn.charge(steps)
+
+
+# Helpers ##############################################################
+
+_FRAMED = (GroupEvent, OrderedGroup, ConditionalEvent)
+
+
+def _event_steps(event, affected, turn):
+    if event.program is not None:
+        return event.program.steps(event, affected)
+    return _frame_steps(event, affected, turn)
+
+
+def _frame_steps(root, affected, turn):
+    # The turn's bookkeeping is done inline because it runs for every
+    # event (see _Turn). The caller enters and leaves the root.
+    events = turn.events
+    running = turn.running
+    max_depth = turn.limits.max_depth
+    frames = [root.frame_steps(affected)]
+    waiting = [None]  # the lines each frame has waiting
+    result = None
+    try:
+        while True:
+            try:
+                request = frames[-1].send(result)
+            except StopIteration as stop:
+                frames.pop()
+                waiting.pop()
+                if not frames:
+                    return stop.value
+                running.discard(events.pop())
+                result = stop.value
+                continue
+
+            if request.__class__ is not Execute:
+                _show_waiting(request, waiting)
+                result = yield request  # a prompt
+                continue
+            waiting[-1] = request.lines
+            event = request.event
+            turn.steps += 1
+            if turn.steps > turn.limits.max_steps:
+                turn.charge(0)
+            # Subclasses may execute differently so they run their own steps
+            if event.__class__ in _FRAMED and event.program is None:
+                if event in running or len(events) >= max_depth:
+                    turn.enter(event)
+                events.append(event)
+                running.add(event)
+                frames.append(event.frame_steps(affected))
+                waiting.append(None)
+                result = None
+            else:
+                result = yield from _waiting_steps(
+                    prompts.call(event, 'execute', affected), waiting)
+    finally:
+        for _ in frames[1:]:
+            turn.leave()
+
+
+def _waiting_steps(steps, waiting):
+    """Runs steps showing the lines the frames have waiting before each
+    prompt, like prompts.flushing."""
+    try:
+        prompt = next(steps)
+        while True:
+            _show_waiting(prompt, waiting)
+            prompt = steps.send((yield prompt))
+    except StopIteration as stop:
+        return stop.value
+
+
+def _show_waiting(prompt, waiting):
+    """Shows the lines the frames have waiting, outermost first, before a
+    prompt, unless the steps are run on the console."""
+    if prompts.printer() is not None:
+        return
+    lines = []
+    for frame_lines in waiting:
+        if frame_lines:
+            lines.extend(frame_lines)
+            del frame_lines[:]
+    prompts.show_first(prompt, lines)
+
+
+class _Turn:
+    """The composite events running in a turn, and how many events the
+    turn has run.
+
+    Attributes:
+        limits (Limits): The limits of the turn.
+        events (list of Event): The composite events running, outermost
+            first.
+        running (set of Event): The same events, to find cycles quickly.
+        steps (int): How many events the turn has run.
+    """
+
+    def __init__(self, limits):
+        self.limits = limits
+        self.events = []
+        self.running = set()
+        self.steps = 0
+
+    def enter(self, event):
+        """Records that a composite event has started.
+
+        Raises:
+            EventLimitError: If the event is already running, or is
+                nested too deeply, or the turn runs too many events.
+        """
+        if event in self.running:
+            start = self.events.index(event)
+            raise exceptions.EventLimitError(
+                "Error: event '{}' runs itself: {}".format(
+                    event.id, _chain(self.events[start:] + [event])))
+        if len(self.events) >= self.limits.max_depth:
+            raise exceptions.EventLimitError(
+                "Error: events nested more than {} deep: {}".format(
+                    self.limits.max_depth, _chain(self.events + [event])))
+        self.charge(1)
+        self.events.append(event)
+        self.running.add(event)
+
+    def leave(self):
+        """Records that the composite event that started last is done."""
+        self.running.discard(self.events.pop())
+
+    def charge(self, steps):
+        """Counts steps towards the step limit.
+
+        Raises:
+            EventLimitError: If the turn runs too many events.
+        """
+        self.steps += steps
+        if self.steps > self.limits.max_steps:
+            where = ("event '{}'".format(self.events[-1].id) if self.events
+                     else 'a program')
+            raise exceptions.EventLimitError(
+                "Error: more than {} events run in one turn, stopped in "
+                "{}".format(self.limits.max_steps, where))
+
+
+def _chain(events):
+    ids = [event.id for event in events]
+    if len(ids) > 2 * _SHOWN:
+        ids = ids[:_SHOWN] + ['...'] + ids[-_SHOWN:]
+    return ' -> '.join(ids)
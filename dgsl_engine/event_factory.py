@@ -4,14 +4,13 @@ from . import exceptions
 from . import event_composites
 from . import interaction
 from . import conditions
+from . import registry
 
 
 class EventFactory:  # pylint: disable=too-few-public-methods
     """Event factory to create new events from json event objects."""
 
-    # Turn this into 2 functions to try create single and group
-    # events for the factory to return.
-    def new(self, obj):  # pylint: disable=no-self-use,too-many-branches
+    def new(self, obj):  # pylint: disable=no-self-use
         """Create and return a new event from an event json.
 
         Args:
@@ -21,38 +20,13 @@ class EventFactory:  # pylint: disable=too-few-public-methods
             Event: The newly constructed event.
         """
         try:
-            type_ = obj['type']
-            id_ = obj['id']
-            if type_ in ['event']:
-                event = event_base.Event(id_)
-            elif type_ == 'move':
-                event = event_base.MoveEntity(id_)
-            elif type_ == 'give':
-                event = event_base.Give(id_)
-                _setup_transfer(event, obj)
-            elif type_ == 'take':
-                event = event_base.Take(id_)
-                _setup_transfer(event, obj)
-            elif type_ == 'end_game':
-                event = event_base.EndGame(id_)
-            elif type_ == 'toggle_active':
-                event = event_base.ToggleActive(id_)
-            elif type_ == 'toggle_obtainable':
-                event = event_base.ToggleObtainable(id_)
-            elif type_ == 'toggle_hidden':
-                event = event_base.ToggleHidden(id_)
-            elif type_ == 'group':
-                event = event_composites.GroupEvent(id_)
-            elif type_ == 'ordered':
-                event = event_composites.OrderedGroup(id_)
-            elif type_ == 'conditional':
-                event = event_composites.ConditionalEvent(id_)
-            elif type_ == 'interaction':
-                event = interaction.Interaction(id_)
-                _setup_interaction(event, obj)
-            else:
+            object_type = registry.get(obj['type'])
+            if object_type is None or object_type.kind != registry.EVENT:
                 raise exceptions.InvalidParameterError(
-                    "Error: invalid obj of type " + str(type_))
+                    "Error: invalid obj of type " + str(obj['type']))
+            event = object_type.make(obj['id'])
+            if object_type.setup is not None:
+                object_type.setup(event, obj)
 
             _setup_event(event, obj)
             return event
@@ -89,28 +63,71 @@ def make_condition(cond_json, world=None):
         Condition: The newly created condition.
     """
     try:
-        type_ = cond_json['type']
-        if type_ == 'hasItem':
-            return conditions.HasItem(cond_json['item']['id'],
-                                      other_json=cond_json['other'], world=world)
-        if type_ == 'question':
-            return conditions.Question(
-                cond_json['question'], cond_json['answer'])
-        if type_ == 'protected':
-            return conditions.Protected(cond_json['effects'])
-        if type_ == 'is_active':
-            id_ = cond_json['item']['id']
-            entity = world.entities[id_]
-            return conditions.IsActive(entity)
-
-        raise exceptions.InvalidParameterError(
-            "Condition Factory Error: Invalid object of type " + str(type_))
+        object_type = registry.get(cond_json['type'])
+        if object_type is None or object_type.kind != registry.CONDITION:
+            raise exceptions.InvalidParameterError(
+                "Condition Factory Error: Invalid object of type "
+                + str(cond_json['type']))
+        return object_type.make(cond_json, world)
 
     except KeyError as err:
         raise exceptions.InvalidParameterError(
             "Error: JSON is not complete: " + str(err))
 
 
+def _make_has_item(cond_json, world):
+    return conditions.HasItem(cond_json['item']['id'],
+                              other_json=cond_json['other'], world=world)
+
+
+def _make_question(cond_json, _):
+    return conditions.Question(cond_json['question'], cond_json['answer'])
+
+
+def _make_protected(cond_json, _):
+    return conditions.Protected(cond_json['effects'])
+
+
+def _make_is_active(cond_json, world):
+    return conditions.IsActive(world.entities[cond_json['item']['id']])
+
+
 def num_to_bool(num):
     """Turn a number into a bool."""
     return num != 0
+
+
+
+registry.register_event('event', event_base.Event)
+registry.register_event('move', event_base.MoveEntity,
+                        references=('subjects', 'destination'))
+registry.register_event('give', event_base.Give, _setup_transfer,
+                        references=('subjects', 'item_owner'))
+registry.register_event('take', event_base.Take, _setup_transfer,
+                        references=('subjects', 'new_owner'))
+registry.register_event('end_game', event_base.EndGame)
+registry.register_event('toggle_active', event_base.ToggleActive,
+                        references=('subjects', 'target'))
+registry.register_event('toggle_obtainable', event_base.ToggleObtainable,
+                        references=('subjects', 'target'))
+registry.register_event('toggle_hidden', event_base.ToggleHidden,
+                        references=('subjects', 'target'))
+registry.register_event('group', event_composites.GroupEvent,
+                        references=('subjects', 'events'))
+registry.register_event('ordered', event_composites.OrderedGroup,
+                        references=('subjects', 'events'))
+registry.register_event('conditional', event_composites.ConditionalEvent,
+                        references=('subjects', 'success', 'failure',
+                                    'condition'))
+registry.register_event('interaction', interaction.Interaction,
+                        _setup_interaction, references=('subjects', 'options'))
+
+registry.register_condition('hasItem', _make_has_item, ('other',))
+registry.register_condition('question', _make_question)
+registry.register_condition('protected', _make_protected)
+registry.register_condition('is_active', _make_is_active, ('item',))
+registry.register(registry.ObjectType(
+    'option', registry.OPTION, references=('event', 'condition')))
+registry.register(registry.ObjectType(
+    'conditional_option', registry.OPTION,
+    references=('event', 'condition')))
@@ -0,0 +1,418 @@
+"""Compiles composite events into flat programs and runs them.
+
+A composite event (GroupEvent, OrderedGroup, or ConditionalEvent)
+normally executes as a tree. Each level runs its children through
+prompts.call in a generator of its own, and builds a list of their
+results to join with newlines. For long chains of nested events most of
+the time goes to this and not to the events themselves.
+
+compile_event lowers a composite event and the events it runs into one
+flat list of instructions, which run_steps runs in a single loop. Only
+the results of the leaf events are kept, in one list that is joined once
+at the end. An event's own message comes before the results of its
+children but is only known after they run, so the place for it is
+marked before they run. If an event prompts the player, the results so
+far are shown before the prompt instead (see prompts.flushing), the same
+as when the tree runs. On the console they are all returned at the end.
+
+Programs have no state of their own. The state of the events (is_done,
+idx, passed) is read and written on the events as usual, so a program
+gives the same results as the tree, works with WorldStates, and can be
+shared by the games that share a world. Some events are executed as
+usual from within a program instead of being lowered: events of other
+classes (including subclasses of the built in events, which may execute
+differently), events that are already being lowered because the events
+refer to each other in a cycle, and events past MAX_INSTRUCTIONS.
+
+Programs are optional. compile_world marks the composite events of a
+world so each is compiled the first time it is executed::
+
+    event_vm.compile_world(new_world)
+
+A program is not updated when events are added to a composite event
+after it is compiled, so worlds should be compiled once they are
+linked.
+"""
+from . import actions
+from . import event_base
+from . import event_composites
+from . import exceptions
+from . import prompts
+
+# The most instructions a program has before the events left are run from
+# their own programs, so events shared by many composite events can't
+# make programs grow without bound.
+MAX_INSTRUCTIONS = 4096
+
+# Instructions are (opcode, event, argument) tuples.
+MESSAGE = 0  # the event's message, and done if only once
+RUN = 1  # executes the event as usual
+MARK = 2  # marks where the results are up to in mark <argument>
+INSERT_MESSAGE = 3  # the event's message at mark <argument>
+JUMP = 4  # to <argument>
+JUMP_IF_DONE = 5  # to <argument> if the event is done
+BRANCH = 6  # to <argument>[idx] of the OrderedGroup
+ADVANCE = 7  # the OrderedGroup to its next event
+TEST = 8  # the condition, jumping to <argument> if it fails
+PASS = 9  # the condition of the ConditionalEvent passed
+DONE_IF_PASSED = 10  # the ConditionalEvent is done if passed and only once
+MOVE = 11
+GIVE = 12
+TAKE = 13
+TOGGLE_ACTIVE = 14
+TOGGLE_OBTAINABLE = 15
+TOGGLE_HIDDEN = 16
+END_GAME = 17
+
+OPCODE_NAMES = [
+    'MESSAGE', 'RUN', 'MARK', 'INSERT_MESSAGE', 'JUMP', 'JUMP_IF_DONE',
+    'BRANCH', 'ADVANCE', 'TEST', 'PASS', 'DONE_IF_PASSED', 'MOVE', 'GIVE',
+    'TAKE', 'TOGGLE_ACTIVE', 'TOGGLE_OBTAINABLE', 'TOGGLE_HIDDEN',
+    'END_GAME',
+]
+
+
+class Program:
+    """A composite event lowered into a flat list of instructions.
+
+    Attributes:
+        event (Event): The event the program runs.
+        code (list of tuple): The (opcode, event, argument) instructions.
+        marks (int): How many places in the results the program marks.
+    """
+
+    def __init__(self, event, code, marks):
+        self.event = event
+        self.code = code
+        self.marks = marks
+
+    def steps(self, event, affected):  # pylint: disable=unused-argument
+        """Steps that run the program. See run_steps."""
+        return run_steps(self, affected)
+
+    def listing(self):
+        """Returns the instructions as text, one per line."""
+        lines = []
+        for idx, (opcode, event, arg) in enumerate(self.code):
+            parts = [str(idx), OPCODE_NAMES[opcode]]
+            if event is not None:
+                parts.append(getattr(event, 'id', repr(event)))
+            if arg is not None:
+                parts.append(str(arg))
+            lines.append(' '.join(parts))
+        return '\n'.join(lines)
+
+    def __repr__(self):
+        return "<Program '{}', {} instructions>".format(
+            self.event.id, len(self.code))
+
+
+class _Pending:
+    """Stands in for the program of an event until it is first executed."""
+
+    def steps(self, event, affected):  # pylint: disable=no-self-use
+        """Compiles the event and runs its program."""
+        event.program = compile_event(event)
+        return (yield from event.program.steps(event, affected))
+
+    def __repr__(self):
+        return '<Pending Program>'
+
+
+PENDING = _Pending()
+
+
+def compile_world(game_world):
+    """Marks every composite event a world has built so it is compiled
+    the first time it is executed.
+
+    LazyWorlds also mark the events they build afterwards.
+
+    Args:
+        game_world (World): The world to compile.
+    """
+    for event in game_world.events.values():
+        prepare(event)
+    if hasattr(game_world, 'compile_events'):
+        game_world.compile_events = True
+
+
+def prepare(event):
+    """Marks an event to be compiled the first time it is executed, if it
+    is a composite event that can be compiled."""
+    if type(event) in _COMPOSITES:
+        event.program = PENDING
+
+
+def compile_event(event):
+    """Lowers a composite event and the events it runs into a Program.
+
+    Args:
+        event (Event): A GroupEvent, OrderedGroup, or ConditionalEvent.
+
+    Returns:
+        Program: The new program.
+
+    Raises:
+        InvalidParameterError: If the event is not one of those classes.
+    """
+    if type(event) not in _COMPOSITES:
+        raise exceptions.InvalidParameterError(
+            "Error: can't compile events of type " + type(event).__name__)
+    compiler = _Compiler()
+    compiler.event(event)
+    return Program(event, compiler.code, compiler.marks)
+
+
+def run_steps(program, affected):
+    """Steps that run a program on the affected entity.
+
+    Args:
+        program (Program): The program to run.
+        affected (Entity): The entity affected by the events.
+
+    Returns:
+        str: A description of the results, the same as executing the
+        program's event.
+
+    Raises:
+        EventLimitError: If the program runs more instructions than the
+            steps left in the turn (see event_composites.Limits).
+    """
+    # pylint: disable=too-many-branches,too-many-statements
+    code = program.code
+    # Each instruction run counts as a step, the way the events do when
+    # they are executed one by one
+    turn = event_composites.current_turn()
+    out = []
+    marks = [0] * program.marks
+    end = len(code)
+    pc = 0
+    while pc < end:
+        opcode, event, arg = code[pc]
+        pc += 1
+        if turn is not None:
+            turn.steps += 1
+            if turn.steps > turn.limits.max_steps:
+                turn.charge(0)
+        if opcode == MESSAGE:
+            if not event.is_done:
+                if event.message:
+                    out.append(event.message)
+                if event.only_once:
+                    event.is_done = True
+        elif opcode == RUN:
+            result = yield from _flushing(
+                prompts.call(event, 'execute', affected), out, marks)
+            if result != '':
+                out.append(result)
+        elif opcode == MARK:
+            marks[arg] = len(out)
+        elif opcode == INSERT_MESSAGE:
+            if not event.is_done and event.message:
+                out.insert(marks[arg], event.message)
+        elif opcode == JUMP:
+            pc = arg
+        elif opcode == JUMP_IF_DONE:
+            if event.is_done:
+                pc = arg
+        elif opcode == BRANCH:
+            pc = arg[event.idx]
+        elif opcode == ADVANCE:
+            if event.idx < len(event.events) - 1:
+                event.idx += 1
+            elif event.only_once or event.events[event.idx].is_done:
+                event.is_done = True
+        elif opcode == TEST:
+            event.passed = False
+            succeeded = yield from _flushing(
+                prompts.call(event.condition, 'test', affected), out, marks)
+            if not succeeded:
+                pc = arg
+        elif opcode == PASS:
+            event.passed = True
+        elif opcode == DONE_IF_PASSED:
+            if event.passed and event.only_once:
+                event.is_done = True
+        elif opcode == GIVE:
+            item = event.item_owner.get(event.item_id)
+            if item is not None:
+                actions.move(item, affected)
+        elif opcode == TAKE:
+            item = affected.get(event.item_id)
+            if item is not None:
+                actions.move(item, event.new_owner)
+        elif opcode == TOGGLE_ACTIVE:
+            if not event.is_done:
+                event.target.states.toggle_active()
+        elif opcode == TOGGLE_OBTAINABLE:
+            if not event.is_done:
+                event.target.states.toggle_obtainable()
+        elif opcode == TOGGLE_HIDDEN:
+            if not event.is_done:
+                target = affected if event.target is None else event.target
+                target.states.toggle_hidden()
+        elif opcode == END_GAME:
+            affected.states.hidden = True
+        elif opcode == MOVE:
+            yield from _move_steps(event, affected, out, marks)
+    return '\n'.join(out)
+
+
+# Helpers ##############################################################
+
+def _flushing(steps, out, marks):
+    """Runs steps showing the results in out before their first prompt.
+
+    The marks are moved back to the start of out if the results they
+    marked have been shown. On the console the results are kept.
+    """
+    if prompts.printer() is not None:
+        return (yield from steps)
+    result = yield from prompts.flushing(steps, out)
+    for idx, mark in enumerate(marks):
+        if mark > len(out):
+            marks[idx] = len(out)
+    return result
+
+
+def _move_steps(move, affected, out, marks):
+    """Runs a MoveEntity like MoveEntity.execute_steps, adding its results
+    to out."""
+    destination = move.destination
+    if destination is None:
+        destination = affected.index.entities[move.destination_id]
+    actions.move(affected, destination)
+
+    message = ''
+    if not move.is_done:
+        if move.message is not None:
+            message = move.message
+        if move.only_once:
+            move.is_done = True
+
+    enter = yield from _flushing(
+        prompts.call(destination, 'enter', affected), out, marks)
+    if message.strip() != '':
+        out.append(message)
+        out.append('\n' + enter)
+    elif enter != '':
+        out.append(enter)
+
+
+class _Compiler:
+    """Lowers events into the instructions of one program.
+
+    Attributes:
+        code (list of tuple): The instructions so far.
+        marks (int): The number of marks used so far.
+    """
+
+    def __init__(self):
+        self.code = []
+        self.marks = 0
+        self._lowering = set()
+
+    def event(self, event):
+        """Adds the instructions that execute an event."""
+        lower = _LOWER.get(type(event))
+        if (lower is None or id(event) in self._lowering
+                or len(self.code) >= MAX_INSTRUCTIONS):
+            self.emit(RUN, event)
+            return
+        self._lowering.add(id(event))
+        lower(self, event)
+        self._lowering.discard(id(event))
+
+    def emit(self, opcode, event=None, arg=None):
+        """Adds an instruction and returns its index."""
+        self.code.append((opcode, event, arg))
+        return len(self.code) - 1
+
+    def patch(self, idx, arg):
+        """Sets the argument of an instruction, like where a jump goes."""
+        opcode, event, _ = self.code[idx]
+        self.code[idx] = (opcode, event, arg)
+
+    def mark(self):
+        """Adds an instruction that marks where the results are up to and
+        returns the mark."""
+        mark = self.marks
+        self.marks += 1
+        self.emit(MARK, None, mark)
+        return mark
+
+
+def _lower_leaf(opcode):
+    def lower(compiler, event):
+        compiler.emit(opcode, event)
+        compiler.emit(MESSAGE, event)
+    return lower
+
+
+def _lower_event(compiler, event):
+    compiler.emit(MESSAGE, event)
+
+
+def _lower_move(compiler, move):
+    compiler.emit(MOVE, move)
+
+
+def _lower_group(compiler, group):
+    compiler.emit(MESSAGE, group)
+    for event in group.events:
+        compiler.event(event)
+
+
+def _lower_ordered(compiler, group):
+    skip = compiler.emit(JUMP_IF_DONE, group)
+    mark = compiler.mark()
+    branch = compiler.emit(BRANCH, group)
+    targets = []
+    jumps = []
+    for idx, event in enumerate(group.events):
+        targets.append(len(compiler.code))
+        compiler.event(event)
+        if idx < len(group.events) - 1:
+            jumps.append(compiler.emit(JUMP))
+    for jump in jumps:
+        compiler.patch(jump, len(compiler.code))
+    compiler.patch(branch, targets)
+    compiler.emit(INSERT_MESSAGE, group, mark)
+    compiler.emit(ADVANCE, group)
+    compiler.patch(skip, len(compiler.code))
+
+
+def _lower_conditional(compiler, event):
+    mark = compiler.mark()
+    test = compiler.emit(TEST, event)
+    compiler.event(event.success)
+    compiler.emit(PASS, event)
+    if event.failure is not None:
+        jump = compiler.emit(JUMP)
+        compiler.patch(test, len(compiler.code))
+        compiler.event(event.failure)
+        compiler.patch(jump, len(compiler.code))
+    else:
+        compiler.patch(test, len(compiler.code))
+    compiler.emit(INSERT_MESSAGE, event, mark)
+    compiler.emit(DONE_IF_PASSED, event)
+
+
+# Only these exact classes are lowered. Subclasses may execute differently.
+_LOWER = {
+    event_base.Event: _lower_event,
+    event_base.MoveEntity: _lower_move,
+    event_base.Give: _lower_leaf(GIVE),
+    event_base.Take: _lower_leaf(TAKE),
+    event_base.ToggleActive: _lower_leaf(TOGGLE_ACTIVE),
+    event_base.ToggleObtainable: _lower_leaf(TOGGLE_OBTAINABLE),
+    event_base.ToggleHidden: _lower_leaf(TOGGLE_HIDDEN),
+    event_base.EndGame: _lower_leaf(END_GAME),
+    event_composites.GroupEvent: _lower_group,
+    event_composites.OrderedGroup: _lower_ordered,
+    event_composites.ConditionalEvent: _lower_conditional,
+}
+
+_COMPOSITES = (event_composites.GroupEvent, event_composites.OrderedGroup,
+               event_composites.ConditionalEvent)
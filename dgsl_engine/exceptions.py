@@ -3,3 +3,8 @@
 
 class InvalidParameterError(Exception):  # pragma: no cover
     """When a parameter given is not valid."""
+
+
+class EventLimitError(Exception):
+    """When events run themselves, are nested too deeply, or run too many
+    times in one turn (see event_composites.Limits)."""
@@ -1,29 +1,72 @@
 """Module for Game and supporting functions."""
 from . import user_input
 from . import commands
+from . import event_composites
+from . import exceptions
+from . import prompts
+from . import world_state
 
 
-class Game:  # pylint: disable=too-few-public-methods
+class Turn:  # pylint: disable=too-few-public-methods
+    """The result of one call to Game.step.
+
+    Attributes:
+        output (str): The text to show the player.
+        prompt (Prompt): A menu or question the next call to step will
+            answer. None if the game is waiting for a command.
+        over (bool): True if the game has ended.
+    """
+
+    def __init__(self, output, prompt=None, over=False):
+        self.output = output
+        self.prompt = prompt
+        self.over = over
+
+    def __repr__(self):
+        return "<Turn - Output: '{}', Prompt: {}, Over: {}>".format(
+            self.output, self.prompt, self.over)
+
+
+class Game:
     """The Game object.
 
+    A game can be played on the console with run, or driven one command
+    at a time with start and step. The second way never reads input or
+    prints output itself, so the game can be embedded in other programs.
+
     Attributes:
         world (World): The game world.
         parser (Parser): Get the users actions from input text.
         resolver (Resolver): Resolves the desired player action and
             returns a string of the result.
         end (bool): True if the gme is over.
+        state (WorldState): The changes this game has made to the world.
+            None if the game changes the world itself, in which case it
+            can't be saved.
+        save_dir (str): The directory games are saved in.
+        journal (Journal): Records the player's commands and answers so
+            the game can be recovered after a crash. None if the game is
+            not journaled (see the journal module).
+        limits (Limits): How much the events of one command can do. A
+            command whose events go past them stops and shows what went
+            wrong (see the event_composites module).
         _out: A function that displays output. (default print)
         _in_: A function that collects user input. (default input)
     """
 
-    def __init__(self, world, parser, resolver):
+    def __init__(self, world, parser, resolver, state=None):
         self._in = input
         self._out = print
         self.parser = parser
         self.world = world
         self.resolver = resolver
+        self.state = state
+        self.save_dir = commands.SAVE_DIR
+        self.journal = None
+        self.limits = event_composites.Limits()
         self._setup()
         self.end = False
+        self._pending = None
 
     def run(self):
         """Main game loop.
@@ -32,37 +75,145 @@ class Game:  # pylint: disable=too-few-public-methods
         those actions is passed to out.
         """
         self._out("\n----------------------------------------------------")
-        self._out(self.world.player.owner.describe())
+        self._out(self.start())
 
+        ask = self._recorded(prompts.ConsoleAsker(self._out, self._in))
         while True:
             raw_input = self._in("\n> ").lower()
             self._out("\n----------------------------------------------------")
-            parsed_input = self.parser.parse(raw_input)
-
-            if parsed_input['code'] == user_input.ParseCodes.COMMAND:
-                result = commands.execute_command(
-                    parsed_input['verb'], parsed_input['object'], self)
-            elif parsed_input['code'] == user_input.ParseCodes.ERROR:
-                result = parsed_input['message']
-            else:
-                result = self.resolver.resolve_input(parsed_input,
-                                                     self.world.player)
+            if self.journal is not None:
+                self.journal.record(raw_input)
+            # The state is looked up every turn because loading a game
+            # replaces it
+            with world_state.using(self.state), \
+                    event_composites.limited(self.limits), \
+                    prompts.printing(self._out):
+                result = prompts.run(self._turn_steps(raw_input), ask)
+            if self.journal is not None:
+                self.journal.turn_done()
 
             if result != '':
                 self._out(result)
-            if self._game_over():
-                break
+            with world_state.using(self.state):
+                if self._game_over():
+                    break
 
+        if self.journal is not None:
+            self.journal.flush()
         self._cleanup()
 
+    def start(self):
+        """Starts a game that is driven with step.
+
+        Returns:
+            str: The description of the room the player starts in.
+        """
+        self._pending = None
+        with world_state.using(self.state):
+            return self.world.player.owner.describe()
+
+    def step(self, text):
+        """Takes one command from the player, or answers a prompt.
+
+        If the previous step ended with a prompt the text is the answer
+        to it, otherwise it is a new command. Nothing is read from input
+        or written to output.
+
+        Args:
+            text (str): The player's command or answer.
+
+        Returns:
+            Turn: The output of the step and the prompt waiting for an
+                answer if there is one.
+        """
+        with world_state.using(self.state), \
+                event_composites.limited(self.limits):
+            return self._step(text)
+
+    def _step(self, text):
+        if self.journal is not None:
+            self.journal.record(text)
+
+        if self._pending is None:
+            steps = self._turn_steps(text.lower())
+            answer = None
+        else:
+            steps, prompt = self._pending
+            answer = prompt.read(text)
+
+        try:
+            prompt = steps.send(answer)
+        except StopIteration as stop:
+            self._pending = None
+            # Loading a game during the step replaces the state
+            with world_state.using(self.state):
+                turn = Turn(stop.value, None, self._game_over())
+            if self.journal is not None:
+                self.journal.turn_done()
+                if turn.over:
+                    self.journal.flush()
+            return turn
+
+        self._pending = (steps, prompt)
+        output = prompt.text if prompt.text is not None else ''
+        return Turn(output, prompt, False)
+
+    def restore(self, state):
+        """Replaces the game's progress with a saved state.
+
+        Args:
+            state (WorldState): The state to play with from now on.
+        """
+        self.state = state
+        self.end = False
+        self._pending = None
+
+    def _recorded(self, ask):
+        """Wraps a function that answers prompts so that the answers are
+        journaled the same way step would record them."""
+        def ask_and_record(prompt):
+            answer = ask(prompt)
+            if self.journal is not None:
+                if prompt.is_menu():
+                    self.journal.record(str(answer + 1))
+                else:
+                    self.journal.record(answer)
+            return answer
+        return ask_and_record
+
+    def _turn_steps(self, raw_input):
+        """Steps that carry out one command from the player."""
+        parsed_input = self.parser.parse(raw_input)
+
+        if parsed_input['code'] == user_input.ParseCodes.COMMAND:
+            result = yield from commands.execute_command_steps(
+                parsed_input['verb'], parsed_input['object'], self)
+        elif parsed_input['code'] == user_input.ParseCodes.ERROR:
+            result = parsed_input['message']
+        else:
+            try:
+                result = yield from prompts.call(
+                    self.resolver, 'resolve_input', parsed_input,
+                    self.world.player)
+            except exceptions.EventLimitError as err:
+                result = str(err)
+        return result
+
     def _setup(self):
         pass
 
+    def farewell(self):
+        """Returns the message shown when the game is over."""
+        lines = []
+        with world_state.using(self.state):
+            if self.world.player.states.hidden:
+                lines.append("*** Game Over ***\n")
+        lines.append("Thanks for playing")
+        return '\n'.join(lines)
+
     def _cleanup(self):
         self._out()
-        if self.world.player.states.hidden:
-            self._out("*** Game Over ***\n")
-        self._out("Thanks for playing")
+        self._out(self.farewell())
 
     def _game_over(self):
         if self.end or self.world.player.states.hidden:
@@ -2,37 +2,122 @@
 import json
 import dgsl_engine.game as game
 import dgsl_engine.user_input as user_input
-import dgsl_engine.world as world
 import dgsl_engine.actions as actions
 import dgsl_engine.collectors as collectors
+import dgsl_engine.world as world
+import dgsl_engine.world_state as world_state
+
+# The headers of world stores and compiled worlds (compiled_world.MAGIC).
+# The files are told apart here so the modules that read them are only
+# imported for the worlds that need them.
+_SQLITE_HEADER = b'SQLite format 3\0'
+_COMPILED_HEADER = b'DGSLWC'
 
 
 class GameFactory:  # pylint: disable=too-few-public-methods
-    """Creates a new game with some default components."""
+    """Creates a new game with some default components.
+
+    Attributes:
+        cache (WorldCache): The cache to check for .world files before
+            loading them. None to always load them.
+        lazy (bool): True to load .world files as LazyWorlds, which only
+            build rooms as they are needed. The cache is not used for
+            lazy worlds.
+    """
+
+    def __init__(self, cache=None, lazy=False):
+        self.cache = cache
+        self.lazy = lazy
 
-    def new(self, world_path):  # pylint: disable=no-self-use
+    def new(self, world_path):
         """Creates a new game with default components.
 
+        The world can be a .world json file, a compiled world made with
+        ``dgsl compile``, or a world store made with ``dgsl store``. The
+        game keeps its progress in a new WorldState so it can be saved.
+
         Args:
           world_path (str): The path to the world for the game.
 
         Returns:
             Game: The newly created game.
         """
-        parser = user_input.Parser()
+        return self.new_from_world(
+            load_world(world_path, self.cache, self.lazy),
+            world_state.WorldState())
+
+    def new_from_world(self, game_world, state=None):
+        # pylint: disable=no-self-use
+        """Creates a new game with default components for a loaded world.
+
+        Args:
+          game_world (World): The world for the game.
+          state (WorldState): The state for the game's changes if the
+            world is shared with other games. If None the game changes
+            the world itself, so it should not be shared.
 
-        collector_factory = collectors.EntityCollectorFactory()
+        Returns:
+            Game: The newly created game.
+        """
+        # pylint: disable=import-outside-toplevel
+        import dgsl_engine.name_index as name_index
+        import dgsl_engine.type_index as type_index
+        verbs = game_world.details.verbs
+        parser = user_input.Parser(verbs)
+
+        with world_state.using(state):
+            collector_factory = collectors.EntityCollectorFactory(
+                name_index.NameIndex(game_world))
+            type_index.TypeIndex(game_world)
         menu_factory = user_input.MenuFactory()
-        action_factory = actions.ActionFactory()
+        action_factory = actions.ActionFactory(verbs)
         resolver = actions.ActionResolver(collector_factory, menu_factory,
                                           action_factory)
 
+        return game.Game(game_world, parser, resolver, state)
+
+
+def load_world(world_path, cache=None, lazy=False):
+    """Loads a world from a .world json file, a compiled world file, or
+    a world store.
+
+    World stores are always opened as LazyWorlds. Json worlds are taken
+    from the cache if it has them, and otherwise read with the streaming
+    loader (see world_loader).
+
+    Args:
+        world_path (str): The path to the world.
+        cache (WorldCache): The cache of loaded worlds. None to not use
+            a cache.
+        lazy (bool): True to load a .world file as a LazyWorld. Compiled
+            worlds are always loaded whole.
+
+    Returns:
+        World: The new world.
+    """
+    # pylint: disable=import-outside-toplevel
+    header = _read_header(world_path)
+    if header.startswith(_SQLITE_HEADER):
+        import dgsl_engine.world_store as world_store
+        return world_store.open_world(world_path)
+    if header.startswith(_COMPILED_HEADER):
+        import dgsl_engine.compiled_world as compiled_world
+        return compiled_world.read(world_path)
+    if lazy:
         with open(world_path) as file:
-            world_json = json.load(file)
+            return world.WorldFactory(lazy=True).new(json.load(file))
+    if cache is not None:
+        return cache.load(world_path)
+
+    import dgsl_engine.world_loader as world_loader
+    return world_loader.load_path(world_path)
 
-        game_world = world.WorldFactory().new(world_json)
 
-        return game.Game(game_world, parser, resolver)
+def _read_header(path):
+    # Long enough for the same checks as world_store.is_store and
+    # compiled_world.is_compiled
+    with open(path, 'rb') as file:
+        return file.read(max(len(_SQLITE_HEADER), len(_COMPILED_HEADER)))
 
 
 def name_to_path(name):
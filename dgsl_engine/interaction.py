@@ -1,6 +1,7 @@
 """Interaction event"""
+from . import compact
 from . import event_base
-from . import user_input
+from . import prompts
 
 
 class Interaction(event_base.Event):
@@ -21,6 +22,8 @@ class Interaction(event_base.Event):
             finished.
     """
 
+    __slots__ = compact.slots('options', 'break_out', 'end_message')
+
     def __init__(self, obj_id):
         super(Interaction, self).__init__(obj_id)
         self.options = []
@@ -31,50 +34,72 @@ class Interaction(event_base.Event):
         """Run the interaction displaying the menu and results of the
         chosen events.
         """
-        # This may not be ideal
+        result = prompts.run(self.execute_steps(affected))
+        if result != '':
+            print(result)
+        return ''
+
+    def execute_steps(self, affected):
+        """Steps that run the interaction.
+
+        On the console the text is printed as it comes, like execute.
+        Otherwise the text before each menu is shown with it and the
+        text that follows the last menu is returned. See the prompts
+        module.
+        """
+        lines = []
+        out = prompts.printer()
+        show = lines.append if out is None else out
         if self.message is not None and self.message != '':
-            print(self.message)
+            show(self.message)
 
         while True:
-            options, choices = self._make_choices(affected)
-            menu = user_input.Menu(choices)
+            options, choices = yield from self._make_choices_steps(
+                affected, lines)
 
-            print()
-            idx = menu.ask()
-            print(
-                '\n--------------------------------------------------')
+            show('')
+            text = '\n'.join(lines) if lines else None
+            del lines[:]
+            idx = yield prompts.Prompt(text, choices)
+            show('\n--------------------------------------------------')
 
             if idx >= len(choices):
                 if self.end_message is None:
-                    print('Cancelled')
+                    show('Cancelled')
                 break
             elif idx < 0:
-                print('Not a valid choice!')
+                show('Not a valid choice!')
                 continue
             else:
-                result, end = options[idx].choose(affected)
-                print(result)
+                result, end = yield from prompts.flushing(
+                    prompts.call(options[idx], 'choose', affected), lines)
+                show(result)
 
             if self.break_out or end:
                 break
 
         if self.end_message is not None and self.end_message.strip() != '':
-            print()
-            print(self.end_message)
-        return ''
+            show('')
+            show(self.end_message)
+        return '\n'.join(lines)
 
     def add(self, option):
         """Add an option to the interaction."""
         self.options.append(option)
 
-    def _make_choices(self, affected):
+    def _make_choices_steps(self, affected, lines):
         """Create the list of choices for the menu filtering out those
         options that should not be visible.
+
+        Any lines waiting to be shown are shown before a visibility check
+        prompts the player.
         """
         options = []
         choices = []
         for opt in self.options:
-            if opt.is_visible(affected):
+            visible = yield from prompts.flushing(
+                prompts.call(opt, 'is_visible', affected), lines)
+            if visible:
                 options.append(opt)
                 choices.append(opt.text)
         return options, choices
@@ -93,6 +118,8 @@ class Option:
         breakout (bool): Weather the option should force the
             interaction to breakout."""
 
+    __slots__ = compact.slots('text', 'event', 'breakout', base=True)
+
     def __init__(self, text, event, breakout=False):
         self.text = text
         self.event = event
@@ -106,7 +133,12 @@ class Option:
 
     def choose(self, affected):
         """Execute the options event."""
-        return self.event.execute(affected), self.breakout
+        return prompts.run(self.choose_steps(affected))
+
+    def choose_steps(self, affected):
+        """Steps that execute the options event. See choose."""
+        result = yield from prompts.call(self.event, 'execute', affected)
+        return result, self.breakout
 
     def __repr__(self):
         return "<Option - Text: '{}'>".format(self.text)
@@ -119,15 +151,25 @@ class ConditionalOption(Option):
         condition (Condition): The condition to check.
     """
 
+    __slots__ = compact.slots('condition')
+
     def __init__(self, text, event, condition, breakout=False):
         super(ConditionalOption, self).__init__(text, event, breakout)
         self.condition = condition
 
     def is_visible(self, affected):
         """Check to see if the option should be shown."""
+        return prompts.run(self.is_visible_steps(affected))
+
+    def is_visible_steps(self, affected):
+        """Steps that check if the option should be shown.
+
+        The condition may ask the player a question.
+        """
         super_success = super(ConditionalOption, self).is_visible(affected)
         if super_success:
-            return self.condition.test(affected)
+            return (yield from prompts.call(self.condition, 'test',
+                                            affected))
         return False
 
     def __repr__(self):
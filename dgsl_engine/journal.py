@@ -0,0 +1,260 @@
+"""A journal of everything a player types, for recovering games after a
+crash.
+
+The journal is a file that starts with a checkpoint of the game's state
+(see the saves module) and then has a record for every command and
+every answer to a menu or question the game handles, in order. Replaying
+the records on top of the checkpoint gets the game back to where it was.
+
+Every few turns a new checkpoint is written to a new file that replaces
+the journal, so the journal never gets much longer than the records
+since the last checkpoint.
+
+Records are collected in memory and written in batches. How often the
+journal is synced to disk can be chosen.
+
+* FSYNC_ALWAYS: every record is written and synced right away.
+* FSYNC_BATCH: each batch is synced when it is written. (default)
+* FSYNC_NEVER: the operating system decides when to write to disk.
+
+Only the records in a batch that has not been written yet can be lost
+in a crash. Checkpoints are always synced unless FSYNC_NEVER is used.
+
+The file layout is::
+
+    MAGIC | version (1 byte) | record | record | ...
+
+Each record is::
+
+    kind (1 byte) | length (4 bytes) | data | crc32 of data (4 bytes)
+
+The first record is a checkpoint (kind 'C') holding a save, the rest are
+the text the player entered (kind 'T').
+"""
+import os
+import struct
+import time
+import zlib
+from . import exceptions
+from . import saves
+
+MAGIC = b'DGSLJN'
+FORMAT_VERSION = 1
+
+FSYNC_ALWAYS = 'always'
+FSYNC_BATCH = 'batch'
+FSYNC_NEVER = 'never'
+
+_CHECKPOINT = b'C'
+_TEXT = b'T'
+_HEADER = struct.Struct('>cI')
+_CRC = struct.Struct('>I')
+
+
+class Journal:
+    """Journals the commands and answers of one game.
+
+    Attributes:
+        path (str): The path of the journal file.
+        checkpoint_every (int): Turns between checkpoints.
+        batch_size (int): Records to collect before writing them.
+        flush_interval (float): Seconds after which collected records are
+            written even if the batch is not full.
+        fsync (str): When to sync the journal to disk. One of
+            FSYNC_ALWAYS, FSYNC_BATCH, or FSYNC_NEVER.
+    """
+
+    def __init__(self, path, checkpoint_every=50, batch_size=16,
+                 flush_interval=1.0, fsync=FSYNC_BATCH):
+        if fsync not in (FSYNC_ALWAYS, FSYNC_BATCH, FSYNC_NEVER):
+            raise exceptions.InvalidParameterError(
+                "Error: unknown fsync mode: " + str(fsync))
+        self.path = path
+        self.checkpoint_every = checkpoint_every
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self._game = None
+        self._file = None
+        self._buffer = []
+        self._last_flush = time.monotonic()
+        self._turns = 0
+
+    def attach(self, game):
+        """Starts journaling a game.
+
+        If the journal file already exists the game is recovered from
+        it first, otherwise a new journal is started with a checkpoint of
+        the game.
+
+        Args:
+            game (Game): The game to journal. It must have a WorldState.
+
+        Returns:
+            int: The number of records replayed to recover the game.
+
+        Raises:
+            InvalidParameterError: If the game has no WorldState or the
+                journal is for a different world.
+        """
+        if game.state is None:
+            raise exceptions.InvalidParameterError(
+                "Error: only games with a WorldState can be journaled")
+
+        replayed = 0
+        if os.path.exists(self.path):
+            replayed = self._recover(game)
+            self._file = open(self.path, 'ab')
+        else:
+            self._write_checkpoint(game)
+        self._game = game
+        game.journal = self
+        return replayed
+
+    def record(self, text):
+        """Records a command or answer the game is about to handle.
+
+        Args:
+            text (str): The text the player entered.
+        """
+        self._buffer.append(_record(_TEXT, text.encode('utf-8')))
+        if (self.fsync == FSYNC_ALWAYS
+                or len(self._buffer) >= self.batch_size
+                or time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+
+    def turn_done(self):
+        """Tells the journal a turn is complete.
+
+        A checkpoint is written once enough turns have been completed.
+        """
+        self._turns += 1
+        if self._turns >= self.checkpoint_every:
+            self.checkpoint()
+
+    def checkpoint(self):
+        """Writes a checkpoint of the game, replacing the journal.
+
+        Should only be done between turns.
+        """
+        self._buffer = []
+        self._file.close()
+        self._write_checkpoint(self._game)
+
+    def flush(self):
+        """Writes the collected records to the journal."""
+        if self._buffer:
+            self._file.write(b''.join(self._buffer))
+            self._buffer = []
+            self._file.flush()
+            if self.fsync != FSYNC_NEVER:
+                os.fsync(self._file.fileno())
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        """Writes any collected records and closes the journal."""
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+        if self._game is not None:
+            self._game.journal = None
+            self._game = None
+
+    def _write_checkpoint(self, game):
+        """Writes a new journal holding only a checkpoint and switches to
+        appending to it."""
+        data = saves.dumps(game.world, game.state)
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'wb') as file:
+            file.write(MAGIC + bytes([FORMAT_VERSION]))
+            file.write(_record(_CHECKPOINT, data))
+            file.flush()
+            if self.fsync != FSYNC_NEVER:
+                os.fsync(file.fileno())
+        os.replace(temp_path, self.path)
+        self._file = open(self.path, 'ab')
+        self._turns = 0
+        self._last_flush = time.monotonic()
+
+    def _recover(self, game):
+        """Restores a game from the journal file.
+
+        The checkpoint is loaded and the records are replayed up to the
+        end of the last complete turn. Anything after that, like a
+        record that was only partly written, is cut off the file.
+        """
+        with open(self.path, 'rb') as file:
+            data = file.read()
+        records = read_records(data)
+        if not records or records[0][0] != _CHECKPOINT:
+            raise exceptions.InvalidParameterError(
+                "Error: journal has no checkpoint: " + self.path)
+
+        game.restore(saves.loads(game.world, records[0][1]))
+        end = records[0][2]
+        replayed = 0
+        turns = 0
+        for idx, (kind, text, record_end) in enumerate(records[1:], 1):
+            if kind != _TEXT:
+                break
+            turn = game.step(text.decode('utf-8'))
+            if turn.prompt is None:
+                end = record_end
+                replayed = idx
+                turns += 1
+
+        # Anything after the last complete turn is undone and cut off
+        if replayed < len(records) - 1:
+            game.restore(saves.loads(game.world, records[0][1]))
+            for _, text, _ in records[1:replayed + 1]:
+                game.step(text.decode('utf-8'))
+            with open(self.path, 'r+b') as file:
+                file.truncate(end)
+        self._turns = turns
+        return replayed
+
+
+def read_records(data):
+    """Reads the records of a journal.
+
+    Reading stops at the first record that is incomplete or fails its
+    checksum, since that is where a crash interrupted writing.
+
+    Args:
+        data (bytes): The contents of a journal file.
+
+    Returns:
+        list: (kind, data, end offset) for each good record.
+
+    Raises:
+        InvalidParameterError: If the data is not a journal or has a
+            different format version.
+    """
+    if data[:len(MAGIC)] != MAGIC:
+        raise exceptions.InvalidParameterError("Error: not a journal")
+    if len(data) <= len(MAGIC) or data[len(MAGIC)] != FORMAT_VERSION:
+        raise exceptions.InvalidParameterError(
+            "Error: journal format version is not supported")
+
+    records = []
+    pos = len(MAGIC) + 1
+    while pos + _HEADER.size <= len(data):
+        kind, length = _HEADER.unpack_from(data, pos)
+        start = pos + _HEADER.size
+        end = start + length + _CRC.size
+        if end > len(data):
+            break
+        body = data[start:start + length]
+        if _CRC.unpack_from(data, start + length)[0] != zlib.crc32(body):
+            break
+        records.append((kind, body, end))
+        pos = end
+    return records
+
+
+# Helpers ##############################################################
+
+def _record(kind, data):
+    return (_HEADER.pack(kind, len(data)) + data
+            + _CRC.pack(zlib.crc32(data)))
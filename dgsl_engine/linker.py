@@ -0,0 +1,242 @@
+"""Links the objects of a world to the objects they refer to.
+
+World blueprints refer to other objects with ``{'id': ...}`` references.
+Once the entities and events of a world have been created the world's
+entities and events dicts are a symbol table of everything a reference
+can point to, along with the blueprints of the conditions and options.
+The Linker resolves the references of each object with dict lookups in
+that table, so linking takes time proportional to the number of
+references.
+
+Conditions are created the first time they are referred to and shared
+by every object that refers to them. They only hold settings, not
+state, so sharing them is safe.
+
+Events of types added by plugins (see registry) are linked by their
+type's link function, which can use the Linker's entity, event, and
+condition lookups.
+
+References that can not be resolved do not stop linking. They are
+collected and reported together by check once every object is linked.
+"""
+from . import conditions
+from . import entity_containers
+from . import event_factory
+from . import exceptions
+from . import interaction
+from . import registry
+
+# How the references of each type of event are linked, beyond the
+# subjects all events have. See Linker.link.
+_EVENT_LINKS = {
+    'move': '_link_move',
+    'give': '_link_give',
+    'take': '_link_take',
+    'toggle_active': '_link_toggle',
+    'toggle_obtainable': '_link_toggle',
+    'toggle_hidden': '_link_toggle',
+    'group': '_link_group',
+    'ordered': '_link_group',
+    'conditional': '_link_conditional',
+    'interaction': '_link_interaction',
+}
+
+
+def references(blueprint):
+    """Yields the ids of the objects a blueprint refers to.
+
+    Args:
+        blueprint (dict): The json blueprint of any world object.
+    """
+    object_type = registry.get(blueprint['type'])
+    fields = ('subjects',) if object_type is None else object_type.references
+    for field in fields:
+        value = blueprint.get(field)
+        if isinstance(value, dict):
+            yield value['id']
+        elif isinstance(value, list):
+            for ref in value:
+                yield ref['id']
+
+
+class Linker:
+    """Links objects using the world as a symbol table.
+
+    Attributes:
+        world (World): The world being linked. All of its entities and
+            events must exist before the objects that refer to them are
+            linked.
+        blueprints (dict): The json blueprints of the world's conditions
+            and options, keyed by id.
+        missing (dict): Ids that could not be resolved, each with a list
+            of the ids of the objects that referred to them.
+    """
+
+    def __init__(self, world, blueprints=None):
+        self.world = world
+        self.blueprints = blueprints if blueprints is not None else {}
+        self.missing = {}
+        self._conditions = {}
+
+    def link(self, obj, blueprint):
+        """Links an entity or event to the objects its blueprint refers
+        to.
+
+        Args:
+            obj (Entity or Event): The object to link.
+            blueprint (dict): The object's json blueprint. Only its type,
+                id, and reference fields are used.
+        """
+        if registry.kind(blueprint['type']) == registry.ENTITY:
+            self._link_entity(obj, blueprint)
+        else:
+            self._link_event(obj, blueprint)
+
+    def check(self):
+        """Checks that every reference was resolved.
+
+        Raises:
+            InvalidParameterError: Listing every missing id and the
+                objects that referred to it.
+        """
+        if self.missing:
+            raise exceptions.InvalidParameterError(
+                "Error: world refers to objects it does not have: "
+                + ', '.join('{} (from {})'.format(id_, ', '.join(sources))
+                            for id_, sources in sorted(self.missing.items())))
+
+    # Entities #########################################################
+
+    def _link_entity(self, entity, blueprint):
+        source = blueprint['id']
+        for ref in blueprint['events']:
+            event = self.event(ref, source)
+            if event is not None:
+                entity.events.add(ref['verb'], event)
+
+        if isinstance(entity, entity_containers.Container):
+            for ref in blueprint['items']:
+                item = self.entity(ref, source)
+                if item is not None:
+                    entity.add(item)
+
+        # The player is put in the room it starts in
+        if blueprint.get('start') is not None:
+            start = self.entity(blueprint['start'], source)
+            if start is not None:
+                start.add(entity)
+
+    # Events ###########################################################
+
+    def _link_event(self, event, blueprint):
+        source = blueprint['id']
+        for ref in blueprint['subjects']:
+            subject = self.event(ref, source)
+            if subject is not None:
+                event.register(subject)
+        method = _EVENT_LINKS.get(blueprint['type'])
+        if method is not None:
+            getattr(self, method)(event, blueprint, source)
+            return
+        object_type = registry.get(blueprint['type'])
+        if object_type is not None and object_type.link is not None:
+            object_type.link(self, event, blueprint)
+
+    def _link_move(self, move, blueprint, source):
+        move.destination = self.entity(blueprint['destination'], source)
+        move.destination_id = blueprint['destination']['id']
+
+    def _link_give(self, give, blueprint, source):
+        give.item_owner = self.entity(blueprint['item_owner'], source)
+
+    def _link_take(self, take, blueprint, source):
+        take.new_owner = self.entity(blueprint['new_owner'], source)
+
+    def _link_toggle(self, toggle, blueprint, source):
+        toggle.target = self.entity(blueprint['target'], source)
+
+    def _link_group(self, group, blueprint, source):
+        for ref in blueprint['events']:
+            event = self.event(ref, source)
+            if event is not None:
+                group.add(event)
+
+    def _link_conditional(self, conditional, blueprint, source):
+        conditional.success = self.event(blueprint['success'], source)
+        conditional.failure = self.event(blueprint['failure'], source)
+        conditional.condition = self.condition(blueprint['condition'],
+                                               source)
+
+    def _link_interaction(self, event, blueprint, source):
+        for ref in blueprint['options']:
+            option = self._blueprint(ref, source)
+            if option is None:
+                continue
+            target = self.event(option['event'], option['id'])
+            if option['type'] == 'conditional_option':
+                condition = self.condition(option['condition'],
+                                           option['id'])
+                event.add(interaction.ConditionalOption(
+                    option['text'], target, condition))
+            else:
+                event.add(interaction.Option(option['text'], target))
+
+    # Lookups ##########################################################
+
+    def condition(self, ref, source):
+        """Returns the condition a reference is to, making it the first
+        time it is referred to.
+
+        Args:
+            ref (dict): The reference, like ``{'id': ...}``.
+            source (str): The id of the object with the reference, for
+                reporting it if it is missing.
+
+        Returns:
+            The condition, or None if it is missing.
+        """
+        condition = self._conditions.get(ref['id'])
+        if condition is not None:
+            return condition
+        blueprint = self._blueprint(ref, source)
+        if blueprint is None:
+            return None
+
+        type_ = blueprint['type']
+        if type_ == 'hasItem':
+            condition = conditions.HasItem(blueprint['item']['id'])
+            if blueprint['other'] is not None:
+                condition.other = self.entity(blueprint['other'],
+                                              blueprint['id'])
+        elif type_ == 'is_active':
+            condition = conditions.IsActive(
+                self.entity(blueprint['item'], blueprint['id']))
+        else:
+            condition = event_factory.make_condition(blueprint, self.world)
+        self._conditions[ref['id']] = condition
+        return condition
+
+    def entity(self, ref, source):
+        """Returns the entity a reference is to, or None if it is missing.
+        See condition."""
+        return self._lookup(self.world.entities, ref, source)
+
+    def event(self, ref, source):
+        """Returns the event a reference is to, or None if it is missing.
+        See condition."""
+        return self._lookup(self.world.events, ref, source)
+
+    # Helpers ##########################################################
+
+    def _blueprint(self, ref, source):
+        return self._lookup(self.blueprints, ref, source)
+
+    def _lookup(self, table, ref, source):
+        try:
+            return table[ref['id']]
+        except KeyError:
+            self.missing.setdefault(ref['id'], []).append(source)
+            return None
+        except TypeError:
+            raise exceptions.InvalidParameterError(
+                "Error: {} has a bad reference: {}".format(source, ref))
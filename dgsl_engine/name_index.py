@@ -0,0 +1,298 @@
+"""An index of entity names for finding the entities the player means.
+
+The index is kept per room. Each room's entry holds every entity that an
+EntityCollector would visit starting from that room: the items in the
+room, the contents of containers and the player, and the equipment the
+player is wearing. Items held by NPCs are not included.
+
+Rooms are only indexed the first time they are searched. After that the
+index listens to the world's EntityIndex and moves entities between
+rooms as they move, so a search never has to walk the room.
+
+The index is for the WorldState that is in use when it is searched (see
+world_state). If a different state is in use, like after a game is
+loaded, the index starts over for that state.
+"""
+from . import entity_containers
+from . import world_state
+
+MATCH_SUBSTRING = 'substring'
+MATCH_WORDS = 'words'
+MATCH_BEST = 'best'
+
+# Length of the n-grams used to narrow substring matches.
+GRAM_SIZE = 3
+
+
+class NameIndex:
+    """Per room index of entity names.
+
+    Supports three kinds of matches between the player's text and entity
+    names.
+
+    * substring: The text appears anywhere in the lower case name. This
+      is the same as EntityCollector.
+    * words: Every word of the text is a whole word in the name.
+    * best: The entities whose names have the most of the words in the
+      text as whole words.
+
+    Results are always given in the same order an EntityCollector would
+    find them.
+
+    Attributes:
+        world (World): The world being indexed.
+    """
+
+    def __init__(self, world):
+        self.world = world
+        self._rooms = {}
+        self._seq = {}
+        self._next_seq = 0
+        self._state = world_state.current()
+        world.index.register(self)
+
+    def covers(self, container):
+        """Checks if a container can be searched with the index."""
+        return isinstance(container, entity_containers.Room)
+
+    def find(self, text, room, match=MATCH_SUBSTRING, include_hidden=True):
+        """Finds the entities in a room whose names match some text.
+
+        Args:
+            text (str): The text to match. Should already be lower case.
+            room (Room): The room to search.
+            match (str): The kind of match. One of MATCH_SUBSTRING,
+                MATCH_WORDS, or MATCH_BEST.
+            include_hidden (bool): Wether to include hidden entities.
+
+        Returns:
+            list of Entity: The matching entities.
+        """
+        state = world_state.current()
+        if state is not self._state:
+            self._reset(state)
+
+        names = self._room_names(room)
+        if match == MATCH_SUBSTRING:
+            ids = names.substring(text)
+        elif match == MATCH_WORDS:
+            ids = names.words(text)
+        elif match == MATCH_BEST:
+            ids = names.best(text)
+        else:
+            raise ValueError("Unknown match type: " + str(match))
+
+        entities = [names.members[id_] for id_ in ids]
+        if not include_hidden:
+            entities = [entity for entity in entities
+                        if not entity.states.hidden]
+        if len(entities) > 1:
+            entities.sort(key=self._visit_order)
+        return entities
+
+    def entity_moved(self, entity, old_owner, new_owner):
+        """Moves an entity and what it holds between room entries.
+
+        Called by the world's EntityIndex.
+        """
+        old_room = _scope(old_owner)
+        new_room = _scope(new_owner)
+        moved = _visible_from(entity)
+
+        if old_room is not None and old_room.spec.id in self._rooms:
+            names = self._rooms[old_room.spec.id]
+            for item in moved:
+                names.remove(item)
+
+        for item in moved:
+            self._number(item)
+
+        if new_room is not None and new_room.spec.id in self._rooms:
+            names = self._rooms[new_room.spec.id]
+            for item in moved:
+                names.add(item)
+
+    def forget_entities(self, entities):
+        """Drops entities that have been removed from the world, like the
+        rooms a LazyWorld removes. Called by the world's EntityIndex."""
+        for entity in entities:
+            self._rooms.pop(entity.spec.id, None)
+            self._seq.pop(entity.spec.id, None)
+
+    def _reset(self, state):
+        """Starts the index over for a different WorldState."""
+        self._rooms = {}
+        self._seq = {}
+        self._state = state
+        self.world.index.register(self)
+
+    def _room_names(self, room):
+        """Returns a room's entry, building it if needed."""
+        names = self._rooms.get(room.spec.id)
+        if names is None:
+            names = _RoomNames()
+            for item in room:
+                for entity in _visible_from(item):
+                    self._number(entity)
+                    names.add(entity)
+            self._rooms[room.spec.id] = names
+        return names
+
+    def _number(self, entity):
+        """Gives an entity the next place in the visiting order.
+
+        Items are added to the end of an inventory, so numbering them in
+        the order they arrive keeps the numbers of items in the same
+        container in inventory order.
+        """
+        self._seq[entity.spec.id] = self._next_seq
+        self._next_seq += 1
+
+    def _visit_order(self, entity):
+        """Key that sorts entities in the order a collector visits them."""
+        key = []
+        node = entity
+        while node is not None and not isinstance(
+                node, entity_containers.Room):
+            # Characters have an equipped attribute too, but only worn
+            # equipment has it set to True.
+            worn = 1 if getattr(node, 'equipped', False) is True else 0
+            key.append((worn, self._seq.get(node.spec.id, -1)))
+            node = node.owner
+        key.reverse()
+        return key
+
+
+class _RoomNames:
+    """The names of the entities that can be found in one room.
+
+    Attributes:
+        members (dict): The entities in the entry. Keys are entity IDs.
+        names (dict): The lower case names. Keys are entity IDs.
+        grams (dict): Sets of entity IDs for each n-gram in the names.
+        tokens (dict): Sets of entity IDs for each word in the names.
+    """
+
+    def __init__(self):
+        self.members = {}
+        self.names = {}
+        self.grams = {}
+        self.tokens = {}
+
+    def add(self, entity):
+        """Adds an entity."""
+        id_ = entity.spec.id
+        name = entity.spec.name.lower()
+        self.members[id_] = entity
+        self.names[id_] = name
+        for gram in _grams(name):
+            self.grams.setdefault(gram, set()).add(id_)
+        for word in set(name.split()):
+            self.tokens.setdefault(word, set()).add(id_)
+
+    def remove(self, entity):
+        """Removes an entity if it is in the entry."""
+        id_ = entity.spec.id
+        name = self.names.pop(id_, None)
+        if name is None:
+            return
+        del self.members[id_]
+        for gram in _grams(name):
+            _discard(self.grams, gram, id_)
+        for word in set(name.split()):
+            _discard(self.tokens, word, id_)
+
+    def substring(self, text):
+        """IDs of entities with names containing the text."""
+        if len(text) < GRAM_SIZE:
+            candidates = self.names
+        else:
+            candidates = None
+            for gram in _grams(text):
+                ids = self.grams.get(gram)
+                if ids is None:
+                    return []
+                if candidates is None or len(ids) < len(candidates):
+                    candidates = ids
+        return [id_ for id_ in candidates if text in self.names[id_]]
+
+    def words(self, text):
+        """IDs of entities with every word of the text in their names."""
+        result = None
+        for word in set(text.split()):
+            ids = self.tokens.get(word)
+            if ids is None:
+                return []
+            result = set(ids) if result is None else result & ids
+        return list(result) if result is not None else []
+
+    def best(self, text):
+        """IDs of entities with the most words of the text in their
+        names."""
+        counts = {}
+        for word in set(text.split()):
+            for id_ in self.tokens.get(word, ()):
+                counts[id_] = counts.get(id_, 0) + 1
+        if not counts:
+            return []
+        most = max(counts.values())
+        return [id_ for id_, count in counts.items() if count == most]
+
+
+# Helpers ##############################################################
+
+def _grams(text):
+    return {text[i:i + GRAM_SIZE] for i in range(len(text) - GRAM_SIZE + 1)}
+
+
+def _discard(table, key, id_):
+    ids = table.get(key)
+    if ids is not None:
+        ids.discard(id_)
+        if not ids:
+            del table[key]
+
+
+def _opens(entity):
+    """Checks if a collector looks inside an entity.
+
+    Collectors look inside rooms, containers, and the player, but not
+    inside NPCs.
+    """
+    return (isinstance(entity, entity_containers.Container)
+            and not isinstance(entity, entity_containers.Npc))
+
+
+def _children(entity):
+    """The entities a collector visits inside an entity, in order."""
+    if not _opens(entity):
+        return []
+    items = list(entity.inventory)
+    if isinstance(entity, entity_containers.Player):
+        items.extend(entity.equipped)
+    return items
+
+
+def _visible_from(entity):
+    """An entity and everything a collector would find inside it, in the
+    order a collector visits them."""
+    result = []
+    stack = [entity]
+    while stack:
+        item = stack.pop()
+        result.append(item)
+        stack.extend(reversed(_children(item)))
+    return result
+
+
+def _scope(owner):
+    """The room whose entry holds the items of the given owner, or None
+    if the items can't be found from any room."""
+    node = owner
+    while node is not None:
+        if isinstance(node, entity_containers.Room):
+            return node
+        if not _opens(node):
+            return None
+        node = node.owner
+    return None
@@ -0,0 +1,204 @@
+"""Prompts and the resumable steps that ask them.
+
+Some parts of the game need an answer from the player before they can
+finish, like interaction menus, questions, or choosing between entities
+with similar names. These parts are written as generators called steps.
+A steps generator yields a Prompt whenever it needs an answer, is sent
+the answer, and returns its result when it is done.
+
+By convention the steps version of a method is named after the method
+with ``_steps`` added, e.g. ``execute_steps`` for ``execute``. The plain
+method runs its steps and answers the prompts from the console, so
+existing callers work the same as before.
+
+Because steps never block waiting for input, a game can be driven one
+command or answer at a time (see Game.step).
+
+Steps run on the console (by run with the default asker, or by Game.run)
+show their output the way the plain methods always have: interactions
+print their text as they go and composite events return their results
+when they are done. Otherwise the text is returned, and results that
+are waiting are shown before the next prompt so they stay in order.
+"""
+import contextlib
+import contextvars
+from . import user_input
+
+_PRINTER = contextvars.ContextVar('dgsl_printer', default=None)
+
+
+class Prompt:  # pylint: disable=too-few-public-methods
+    """Something the player has to answer before the game can go on.
+
+    Attributes:
+        text (str): Text to show the player before asking. None if there
+            is nothing to show.
+        choices (list of str): The choices for a menu. None if the player
+            can answer with any text.
+        label (str): The label shown when asking for a text answer.
+    """
+
+    def __init__(self, text=None, choices=None, label='Answer: '):
+        self.text = text
+        self.choices = choices
+        self.label = label
+
+    def is_menu(self):
+        """Returns True if the prompt is a menu."""
+        return self.choices is not None
+
+    def read(self, text):
+        """Turns text typed by the player into an answer for the prompt.
+
+        Args:
+            text (str): The player's answer.
+
+        Returns:
+            int or str: The chosen menu index for menus (see
+                user_input.menu_choice), otherwise the text.
+        """
+        if self.is_menu():
+            return user_input.menu_choice(text, len(self.choices))
+        return text
+
+    def __repr__(self):
+        return "<Prompt - Text: '{}', Choices: {}>".format(
+            self.text, self.choices)
+
+
+class ConsoleAsker:  # pylint: disable=too-few-public-methods
+    """Answers prompts by asking the player on the console.
+
+    Attributes:
+        out: A function that displays output. (default print)
+        in_: A function that collects user input. (default input)
+        menu_factory (MenuFactory): Makes menus for prompts with
+            choices. If None a user_input.Menu using out and in_ is made.
+    """
+
+    def __init__(self, out=print, in_=input, menu_factory=None):
+        self.out = out
+        self.in_ = in_
+        self.menu_factory = menu_factory
+
+    def __call__(self, prompt):
+        """Shows the prompt and returns the player's answer."""
+        if prompt.text is not None:
+            self.out(prompt.text)
+
+        if prompt.is_menu():
+            if self.menu_factory is not None:
+                menu = self.menu_factory.make(prompt.choices)
+            else:
+                menu = user_input.Menu(prompt.choices, self.out, self.in_)
+            return menu.ask()
+
+        answer = self.in_(prompt.label)
+        self.out()
+        return answer
+
+
+def run(steps, ask=None):
+    """Runs steps to the end answering prompts as they come.
+
+    Args:
+        steps (generator): The steps to run.
+        ask: A function that takes a Prompt and returns the answer.
+            Defaults to a ConsoleAsker, in which case the steps are run
+            on the console (see printing).
+
+    Returns:
+        The result of the steps.
+    """
+    if ask is None:
+        ask = ConsoleAsker()
+        with printing(ask.out):
+            return _run(steps, ask)
+    return _run(steps, ask)
+
+
+@contextlib.contextmanager
+def printing(out):
+    """Context manager to run steps on the console.
+
+    Args:
+        out: A function that displays output, like print.
+    """
+    token = _PRINTER.set(out)
+    try:
+        yield out
+    finally:
+        _PRINTER.reset(token)
+
+
+def printer():
+    """Returns the function that displays output if steps are being run
+    on the console (see printing), otherwise None."""
+    return _PRINTER.get()
+
+
+def call(obj, method, *args):
+    """Steps that call a method, using its steps version if it has one.
+
+    Objects that don't have a steps version of the method (like simple
+    events or conditions) are called directly, so they never prompt.
+
+    Args:
+        obj: The object to call the method on.
+        method (str): The name of the plain method.
+        args: The arguments for the method.
+
+    Returns:
+        The result of the method.
+    """
+    steps = getattr(type(obj), method + '_steps', None)
+    if steps is None:
+        return getattr(obj, method)(*args)
+    return (yield from steps(obj, *args))
+
+
+def flushing(steps, lines):
+    """Runs steps showing some lines of text before their first prompt.
+
+    Used when steps have output waiting that must be shown before any
+    prompt that comes up. The lines shown are removed from the list.
+
+    Args:
+        steps (generator): The steps to run.
+        lines (list of str): Lines waiting to be shown.
+
+    Returns:
+        The result of the steps.
+    """
+    try:
+        prompt = next(steps)
+        while True:
+            show_first(prompt, lines)
+            prompt = steps.send((yield prompt))
+    except StopIteration as stop:
+        return stop.value
+
+
+def show_first(prompt, lines):
+    """Adds lines of text to the start of a prompt's text so they are
+    shown before it. The lines are removed from the list.
+
+    Args:
+        prompt (Prompt): The prompt.
+        lines (list of str): Lines waiting to be shown.
+    """
+    if lines:
+        waiting = lines + ([prompt.text] if prompt.text else [])
+        prompt.text = '\n'.join(waiting)
+        del lines[:]
+
+
+# Helpers ##############################################################
+
+def _run(steps, ask):
+    try:
+        prompt = next(steps)
+        while True:
+            prompt = steps.send(ask(prompt))
+    except StopIteration as stop:
+        return stop.value
@@ -0,0 +1,165 @@
+"""The registry of the types of objects worlds can have.
+
+Every ``type`` used in world json is registered here with its kind and
+how objects of the type are made. The factories, the loaders, and the
+linker find a type with one dict lookup instead of checking each type
+in turn. The built in types are registered by entity_factory and
+event_factory.
+
+Other packages can add types without changing the engine by naming a
+function in the ``dgsl_engine.types`` entry point group. The function
+is called with this module so it can register its types::
+
+    # setup.py of the package
+    entry_points={'dgsl_engine.types': ['lasers = my_package:register']}
+
+    # my_package.py
+    def register(registry):
+        registry.register_event('laser', Laser, link=link_laser)
+
+Plugins are loaded the first time a type is looked up that is not
+registered, so worlds that only use the built in types never load them.
+"""
+import sys
+from . import exceptions
+
+ENTITY = 'entity'
+EVENT = 'event'
+CONDITION = 'condition'
+OPTION = 'option'
+
+ENTRY_POINT_GROUP = 'dgsl_engine.types'
+
+_TYPES = {}
+_CLASSES = []
+_PLUGINS = {'loaded': False}
+
+
+class ObjectType:  # pylint: disable=too-few-public-methods
+    """A type of object worlds can have.
+
+    Attributes:
+        name (str): The type as it is written in world json.
+        kind (str): ENTITY, EVENT, CONDITION, or OPTION.
+        make (callable): Makes a new object of the type. Entities and
+            events are made by calling it with their id. Conditions are
+            made by calling it with their blueprint and the world being
+            made, which may be None. None for options, which are made by
+            the events that use them.
+        setup (callable): Called with a new entity or event and its
+            blueprint to set the attributes of the type. None if there
+            are none.
+        link (callable): Called with the Linker, a new event, and its
+            blueprint to link the event to the objects it refers to
+            other than its subjects. None if there are none. The built in
+            events are linked by the Linker itself.
+        references (tuple of str): The fields of the type's blueprints
+            that refer to other objects.
+    """
+
+    def __init__(self, name, kind, make=None, setup=None, link=None,
+                 references=()):
+        # pylint: disable=too-many-arguments
+        self.name = name
+        self.kind = kind
+        self.make = make
+        self.setup = setup
+        self.link = link
+        self.references = tuple(references)
+
+
+def register(object_type, replace=False):
+    """Adds a type to the registry.
+
+    Args:
+        object_type (ObjectType): The type to add.
+        replace (bool): True to replace a type with the same name.
+
+    Raises:
+        InvalidParameterError: If the name is taken and replace is False.
+    """
+    if object_type.name in _TYPES and not replace:
+        raise exceptions.InvalidParameterError(
+            "Error: object type already registered: " + object_type.name)
+    _TYPES[object_type.name] = object_type
+
+
+def register_entity(name, cls, setup=None, references=('events', 'items'),
+                    replace=False):
+    """Registers a type of entity. The class can be compiled into
+    compiled worlds. See ObjectType for the arguments."""
+    # pylint: disable=too-many-arguments
+    register(ObjectType(name, ENTITY, cls, setup, None, references), replace)
+    register_class(cls)
+
+
+def register_event(name, cls, setup=None, link=None,
+                   references=('subjects',), replace=False):
+    """Registers a type of event. The class can be compiled into compiled
+    worlds. See ObjectType for the arguments."""
+    # pylint: disable=too-many-arguments
+    register(ObjectType(name, EVENT, cls, setup, link, references), replace)
+    register_class(cls)
+
+
+def register_condition(name, make, references=(), replace=False):
+    """Registers a type of condition. See ObjectType for the arguments.
+    Use register_class for the classes it makes to compile them."""
+    register(ObjectType(name, CONDITION, make, references=references),
+             replace)
+
+
+def register_class(cls):
+    """Allows objects of a class to be compiled into compiled worlds."""
+    if cls not in _CLASSES:
+        _CLASSES.append(cls)
+
+
+def get(name):
+    """Returns the type with a name, or None if there is no such type.
+
+    Plugins are loaded the first time a name is not found.
+    """
+    object_type = _TYPES.get(name)
+    if object_type is None and not _PLUGINS['loaded']:
+        load_plugins()
+        object_type = _TYPES.get(name)
+    return object_type
+
+
+def kind(name):
+    """Returns the kind of the type with a name, or None if there is no
+    such type."""
+    object_type = get(name)
+    return object_type.kind if object_type is not None else None
+
+
+def classes():
+    """Returns the registered classes, with those of every plugin."""
+    load_plugins()
+    return list(_CLASSES)
+
+
+def load_plugins():
+    """Registers the types of every package in the dgsl_engine.types
+    entry point group. Does nothing after the first call."""
+    if _PLUGINS['loaded']:
+        return
+    _PLUGINS['loaded'] = True
+    for entry_point in _entry_points():
+        entry_point.load()(sys.modules[__name__])
+
+
+# Helpers ##############################################################
+
+def _entry_points():
+    # Only imported when plugins are needed since it is slow to import
+    try:
+        # pylint: disable=import-outside-toplevel
+        from importlib import metadata
+    except ImportError:  # before python 3.8
+        return []
+    found = metadata.entry_points()
+    if hasattr(found, 'select'):
+        return found.select(group=ENTRY_POINT_GROUP)
+    return found.get(ENTRY_POINT_GROUP, [])
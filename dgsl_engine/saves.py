@@ -0,0 +1,240 @@
+"""Saved games that only store what has changed since the world was
+loaded.
+
+A game's progress is the WorldState it plays with (see world_state). A
+save file holds the values in the state that differ from the world as it
+was loaded, like where entities are, their states, what characters are
+wearing, and the flags of events that have run. Everything else comes
+from the world itself, so a save is usually a few hundred bytes.
+
+The file layout is::
+
+    MAGIC | version (1 byte) | zlib compressed json
+
+The json is a dict::
+
+    {
+        'world': [str, str],            # the world's name and version
+        'changes': {                    # field name -> changes
+            str: {str: value, ...},     # entity or event id -> value
+            ...
+        }
+    }
+
+References to entities are stored as entity IDs.
+"""
+import json
+import zlib
+from . import entity_base
+from . import equipment
+from . import event_base
+from . import event_composites
+from . import exceptions
+from . import world_state
+
+MAGIC = b'DGSLSV'
+FORMAT_VERSION = 2
+
+# How the values of a field are stored.
+_PLAIN = 'plain'
+_REF = 'ref'
+_ITEMS = 'items'
+_SLOTS = 'slots'
+
+# The part of an entity a field belongs to.
+_ENTITY = 'entity'
+_STATES = 'states'
+_INVENTORY = 'inventory'
+_EQUIPPED = 'equipped'
+_EVENT = 'event'
+
+# name: (field, part it belongs to, how values are stored)
+_FIELDS = {
+    'owner': (entity_base.Entity.owner, _ENTITY, _REF),
+    'active': (entity_base.EntityStates.active, _STATES, _PLAIN),
+    'obtainable': (entity_base.EntityStates.obtainable, _STATES, _PLAIN),
+    'hidden': (entity_base.EntityStates.hidden, _STATES, _PLAIN),
+    'items': (entity_base.Inventory.items, _INVENTORY, _ITEMS),
+    'protection': (entity_base.Inventory.protection, _INVENTORY, _PLAIN),
+    'equipment': (entity_base.Equipped.equipment, _EQUIPPED, _SLOTS),
+    'worn': (entity_base.Equipped.protection, _EQUIPPED, _PLAIN),
+    'equipped': (equipment.Equipment.equipped, _ENTITY, _PLAIN),
+    'is_done': (event_base.Event.is_done, _EVENT, _PLAIN),
+    'idx': (event_composites.OrderedGroup.idx, _EVENT, _PLAIN),
+    'passed': (event_composites.ConditionalEvent.passed, _EVENT, _PLAIN),
+}
+
+
+def dumps(game_world, state):
+    """Creates a save of the changes a state has made to a world.
+
+    Args:
+        game_world (World): The world as it was loaded.
+        state (WorldState): The changes to save.
+
+    Returns:
+        bytes: The save.
+    """
+    keys = _part_keys(game_world)
+    changes = {}
+    for name, (field, _, kind) in _FIELDS.items():
+        values = state.changes.get(field)
+        if not values:
+            continue
+        saved = {}
+        for obj, value in values.items():
+            encoded = _encode(value, kind)
+            if encoded != _encode(getattr(obj, field.store), kind):
+                saved[keys[id(obj)]] = encoded
+        if saved:
+            changes[name] = saved
+
+    payload = {'world': _world_id(game_world), 'changes': changes}
+    text = json.dumps(payload, separators=(',', ':'), sort_keys=True)
+    return MAGIC + bytes([FORMAT_VERSION]) + zlib.compress(text.encode())
+
+
+def loads(game_world, data):
+    """Creates a WorldState from a save.
+
+    Args:
+        game_world (World): The world the save was made for, as it was
+            loaded.
+        data (bytes): The save.
+
+    Returns:
+        WorldState: The saved changes.
+
+    Raises:
+        InvalidParameterError: If the data is not a save, has a different
+            format version, or was made for a different world.
+    """
+    if data[:len(MAGIC)] != MAGIC:
+        raise exceptions.InvalidParameterError("Error: not a saved game")
+    if data[len(MAGIC)] != FORMAT_VERSION:
+        raise exceptions.InvalidParameterError(
+            "Error: save format version {} is not supported".format(
+                data[len(MAGIC)]))
+
+    try:
+        payload = json.loads(zlib.decompress(data[len(MAGIC) + 1:]))
+    except (zlib.error, ValueError) as err:
+        raise exceptions.InvalidParameterError(
+            "Error: save is corrupt: " + str(err))
+
+    if payload['world'] != _world_id(game_world):
+        raise exceptions.InvalidParameterError(
+            "Error: save is for a different world: " + str(payload['world']))
+
+    state = world_state.WorldState()
+    for name, saved in payload['changes'].items():
+        if name not in _FIELDS:
+            raise exceptions.InvalidParameterError(
+                "Error: save has an unknown field: " + name)
+        field, part, kind = _FIELDS[name]
+        values = state.changes.setdefault(field, {})
+        for key, value in saved.items():
+            obj = _find_part(game_world, key, part)
+            values[obj] = _decode(game_world, value, kind)
+    return state
+
+
+def write(game_world, state, path):
+    """Saves the changes a state has made to a world to a file.
+
+    Args:
+        game_world (World): The world as it was loaded.
+        state (WorldState): The changes to save.
+        path (str): The path of the file to write.
+    """
+    with open(path, 'wb') as file:
+        file.write(dumps(game_world, state))
+
+
+def read(game_world, path):
+    """Reads a save file and returns its WorldState.
+
+    Args:
+        game_world (World): The world the save was made for.
+        path (str): The path of the save.
+
+    Returns:
+        WorldState: The saved changes.
+    """
+    with open(path, 'rb') as file:
+        return loads(game_world, file.read())
+
+
+# Helpers ##############################################################
+
+def _world_id(game_world):
+    details = game_world.details
+    if details is None:
+        return [None, None]
+    return [details.name, details.version]
+
+
+def _parts(entity):
+    """The parts of an entity that have fields."""
+    parts = [entity, entity.states]
+    inventory = getattr(entity, 'inventory', None)
+    if inventory is not None:
+        parts.append(inventory)
+    equipped = getattr(entity, 'equipped', None)
+    if isinstance(equipped, entity_base.Equipped):
+        parts.append(equipped)
+    return parts
+
+
+def _part_keys(game_world):
+    """Maps the ids of objects with fields to the ids they are saved
+    under."""
+    keys = {}
+    for id_, entity in game_world.entities.items():
+        for part in _parts(entity):
+            keys[id(part)] = id_
+    for id_, event in game_world.events.items():
+        keys[id(event)] = id_
+    return keys
+
+
+def _find_part(game_world, key, part):
+    try:
+        if part == _EVENT:
+            return game_world.events[key]
+        entity = game_world.entities[key]
+    except KeyError:
+        raise exceptions.InvalidParameterError(
+            "Error: save refers to an unknown entity or event: " + key)
+    if part == _STATES:
+        return entity.states
+    if part == _INVENTORY:
+        return entity.inventory
+    if part == _EQUIPPED:
+        return entity.equipped
+    return entity
+
+
+def _encode(value, kind):
+    if kind == _REF:
+        return value.spec.id if value is not None else None
+    if kind == _ITEMS:
+        return list(value)
+    if kind == _SLOTS:
+        return {slot: item.spec.id for slot, item in value.items()}
+    return value
+
+
+def _decode(game_world, value, kind):
+    entities = game_world.entities
+    try:
+        if kind == _REF:
+            return entities[value] if value is not None else None
+        if kind == _ITEMS:
+            return {id_: entities[id_] for id_ in value}
+        if kind == _SLOTS:
+            return {slot: entities[id_] for slot, id_ in value.items()}
+    except KeyError as err:
+        raise exceptions.InvalidParameterError(
+            "Error: save refers to an unknown entity: " + str(err))
+    return value
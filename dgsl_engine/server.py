@@ -0,0 +1,256 @@
+"""An asyncio server that hosts many game sessions at once.
+
+Players connect over TCP and play with a simple line protocol. The
+server sends the same text the console game would show, and every line
+the player sends is one command or one answer to a menu or question.
+Each connection plays its own game of one shared world.
+
+Games are driven with Game.step, which never waits for input, so one
+event loop can serve every session. A session that has not sent a line
+for a while is closed, and when the server shuts down the players still
+connected are given some time to finish before their sessions are
+closed.
+"""
+import asyncio
+import signal
+from . import game_factory
+from . import world_state
+
+SEPARATOR = "\n----------------------------------------------------"
+
+
+class SessionFactory:  # pylint: disable=too-few-public-methods
+    """Creates a new game for each session from one loaded world.
+
+    The world is loaded once and used as a template that every session
+    shares. Each session keeps its changes in its own WorldState (see
+    world_state), so a new session costs only as much memory as it has
+    changed.
+
+    Attributes:
+        world_path (str): The path of the world being served.
+        template (World): The shared world.
+    """
+
+    def __init__(self, world_path, cache=None):
+        self.world_path = world_path
+        self.template = game_factory.load_world(world_path, cache)
+
+    def new(self):
+        """Returns a new Game with its own state for the world."""
+        return game_factory.GameFactory().new_from_world(
+            self.template, world_state.WorldState())
+
+
+class GameServer:
+    """Hosts game sessions over a TCP line protocol.
+
+    Attributes:
+        session_factory (SessionFactory): Creates the game for each
+            session.
+        max_sessions (int): The most sessions that can be open at once.
+            Players that connect when the server is full are told to try
+            again later.
+        idle_timeout (float): Seconds a session can go without sending
+            a line before it is closed. None for no timeout.
+        drain_timeout (float): Seconds sessions are given to finish when
+            the server shuts down.
+    """
+
+    def __init__(self, session_factory, max_sessions=100, idle_timeout=600,
+                 drain_timeout=30):
+        self.session_factory = session_factory
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.drain_timeout = drain_timeout
+        self._server = None
+        self._sessions = {}
+        self._draining = False
+
+    @property
+    def session_count(self):
+        """The number of open sessions."""
+        return len(self._sessions)
+
+    @property
+    def sockets(self):
+        """The sockets the server is listening on."""
+        if self._server is None:
+            return []
+        return self._server.sockets
+
+    async def start(self, host='127.0.0.1', port=4000):
+        """Starts listening for connections.
+
+        Args:
+            host (str): The address to listen on.
+            port (int): The port to listen on. 0 picks a free port.
+        """
+        self._server = await asyncio.start_server(self._handle, host, port)
+
+    async def shutdown(self):
+        """Stops the server and drains the open sessions.
+
+        No new connections are accepted. Players still connected are
+        told the server is shutting down and their sessions are closed
+        once they finish or the drain timeout runs out.
+        """
+        self._draining = True
+        if self._server is not None:
+            self._server.close()
+
+        tasks = list(self._sessions)
+        if tasks:
+            message = ("\n*** The server is shutting down. Your game will "
+                       "end in {} seconds ***\n".format(self.drain_timeout))
+            for writer in self._sessions.values():
+                _send(writer, message)
+            _, pending = await asyncio.wait(tasks,
+                                            timeout=self.drain_timeout)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending)
+
+        if self._server is not None:
+            await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        """Runs one player's session."""
+        if self._draining or self.session_count >= self.max_sessions:
+            _send(writer, "The server is full. Try again later.\n")
+            await _close(writer)
+            return
+
+        self._sessions[asyncio.current_task()] = writer
+        try:
+            await self._play(reader, writer)
+        except asyncio.CancelledError:
+            _send(writer, "\nThe server has shut down.\n")
+        except (ConnectionError, ValueError):
+            # The player went away or sent a line that is too long
+            pass
+        finally:
+            del self._sessions[asyncio.current_task()]
+            await _close(writer)
+
+    async def _play(self, reader, writer):
+        game = self.session_factory.new()
+        _send(writer, SEPARATOR + '\n' + game.start() + '\n\n> ')
+        pending = None
+
+        while True:
+            try:
+                line = await asyncio.wait_for(reader.readline(),
+                                              self.idle_timeout)
+            except asyncio.TimeoutError:
+                _send(writer, "\n\nClosing idle session.\n")
+                return
+            if not line:
+                return
+
+            text = line.decode('utf-8', errors='replace').strip()
+            if pending is None and not text:
+                _send(writer, '\n> ')
+                continue
+
+            turn = game.step(text)
+            _send(writer, render(turn, pending))
+            pending = turn.prompt
+            if turn.over:
+                _send(writer, '\n' + game.farewell() + '\n')
+                return
+            await writer.drain()
+
+
+def render(turn, answered=None):
+    """Formats a Turn the way the console game shows it.
+
+    Args:
+        turn (Turn): The turn to format.
+        answered (Prompt): The prompt the turn answered. None if the turn
+            was a new command.
+
+    Returns:
+        str: The text to send to the player.
+    """
+    parts = []
+    if answered is None:
+        parts.append(SEPARATOR + '\n')
+    elif not answered.is_menu():
+        parts.append('\n')
+
+    prompt = turn.prompt
+    if prompt is None:
+        if turn.output != '':
+            parts.append(turn.output + '\n')
+        if not turn.over:
+            parts.append('\n> ')
+    elif prompt.is_menu():
+        if prompt.text is not None:
+            parts.append(prompt.text + '\n')
+        for i, choice in enumerate(prompt.choices):
+            parts.append("{}. {}\n".format(i + 1, choice))
+        parts.append("{}. Cancel\n\n".format(len(prompt.choices) + 1))
+        parts.append("Choice: ")
+    else:
+        if prompt.text is not None:
+            parts.append(prompt.text + '\n')
+        parts.append(prompt.label)
+    return ''.join(parts)
+
+
+def serve(world_path, host='127.0.0.1', port=4000, max_sessions=100,
+          idle_timeout=600, drain_timeout=30, cache=None):
+    """Serves a world until the process is interrupted.
+
+    Args:
+        world_path (str): The path to the world to serve.
+        host (str): The address to listen on.
+        port (int): The port to listen on.
+        max_sessions (int): The most sessions that can be open at once.
+        idle_timeout (float): Seconds before an idle session is closed.
+        drain_timeout (float): Seconds sessions are given to finish when
+            the server shuts down.
+        cache (WorldCache): The cache to load the world from, which can
+            be shared by many servers. None to not use a cache.
+    """
+    server = GameServer(SessionFactory(world_path, cache), max_sessions,
+                        idle_timeout, drain_timeout)
+    asyncio.run(_serve(server, host, port))
+
+
+async def _serve(server, host, port):
+    await server.start(host, port)
+    for sock in server.sockets:
+        print("Serving on {}:{}".format(*sock.getsockname()[:2]))
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass  # Not supported on this platform
+
+    try:
+        await stop.wait()
+    finally:
+        print("Shutting down, waiting for {} sessions".format(
+            server.session_count))
+        await server.shutdown()
+
+
+# Helpers ##############################################################
+
+def _send(writer, text):
+    if not writer.is_closing():
+        writer.write(text.encode('utf-8'))
+
+
+async def _close(writer):
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except ConnectionError:
+        pass
@@ -0,0 +1,219 @@
+"""An index of the entities of each type inside a container.
+
+Each container's entry holds every entity an EntityTypeCollector would
+visit starting from that container, grouped by type: the container
+itself, everything in it and in the containers in it, and the equipment
+worn by the characters in it. A type query only looks at the entities
+of the types asked for, instead of visiting every entity in the
+container.
+
+Containers are only indexed the first time they are searched. After
+that the index listens to the world's EntityIndex and adds or removes
+entities from the entries of the containers they move into or out of.
+
+Like the NameIndex, the index is for the WorldState that is in use when
+it is searched (see world_state). If a different state is in use the
+index starts over for that state.
+"""
+from . import entity_containers
+from . import world_state
+
+
+class TypeIndex:
+    """Per container index of the types of the entities in it.
+
+    Creating the index attaches it to the world's EntityIndex, where
+    EntityTypeCollector finds it.
+
+    Attributes:
+        world (World): The world being indexed.
+    """
+
+    def __init__(self, world):
+        self.world = world
+        self._containers = {}
+        self._seq = {}
+        self._next_seq = 0
+        self._state = world_state.current()
+        world.index.register(self)
+        world.index.type_index = self
+
+    def find(self, types, container):
+        """Finds the entities of some types in a container.
+
+        Args:
+            types (list of str): The type names, as used by
+                EntityTypeCollector.
+            container (Entity): The entity to search. It is included in
+                the results if it is one of the types.
+
+        Returns:
+            list of Entity: The entities in the order an
+                EntityTypeCollector would visit them.
+        """
+        state = world_state.current()
+        if state is not self._state:
+            self._reset(state)
+
+        entry = self._entry(container)
+        results = []
+        for type_name in set(types):
+            results.extend(entry.get(type_name, {}).values())
+        if len(results) > 1:
+            results.sort(key=self._visit_order)
+        return results
+
+    def entity_moved(self, entity, old_owner, new_owner):
+        """Moves an entity and what it holds between container entries.
+
+        Called by the world's EntityIndex.
+        """
+        moved = _descendants(entity)
+        for owner in _chain(old_owner):
+            entry = self._containers.get(owner.spec.id)
+            if entry is not None:
+                for item in moved:
+                    _remove(entry, item)
+
+        for item in moved:
+            self._number(item)
+
+        for owner in _chain(new_owner):
+            entry = self._containers.get(owner.spec.id)
+            if entry is not None:
+                for item in moved:
+                    _add(entry, item)
+
+    def forget_entities(self, entities):
+        """Drops entities that have been removed from the world, like the
+        rooms a LazyWorld removes. Called by the world's EntityIndex."""
+        for entity in entities:
+            self._containers.pop(entity.spec.id, None)
+            self._seq.pop(entity.spec.id, None)
+
+    def _reset(self, state):
+        """Starts the index over for a different WorldState."""
+        self._containers = {}
+        self._seq = {}
+        self._state = state
+        self.world.index.register(self)
+
+    def _entry(self, container):
+        """Returns a container's entry, building it if needed."""
+        entry = self._containers.get(container.spec.id)
+        if entry is None:
+            entry = {}
+            _add(entry, container)
+            # The container keeps its place among the things next to it.
+            for item in _children(container):
+                for entity in _descendants(item):
+                    self._number(entity)
+                    _add(entry, entity)
+            self._containers[container.spec.id] = entry
+        return entry
+
+    def _number(self, entity):
+        """Gives an entity the next place in the visiting order.
+
+        Items are added to the end of an inventory, and equipment to the
+        end of what is worn, so numbering them in the order they arrive
+        keeps them in the order a collector visits them.
+        """
+        self._seq[entity.spec.id] = self._next_seq
+        self._next_seq += 1
+
+    def _visit_order(self, entity):
+        """Key that sorts entities in the order a collector visits them."""
+        key = []
+        node = entity
+        while node is not None:
+            # Characters have an equipped attribute too, but only worn
+            # equipment has it set to True.
+            worn = 1 if getattr(node, 'equipped', False) is True else 0
+            key.append((worn, self._seq.get(node.spec.id, -1)))
+            node = node.owner
+        key.reverse()
+        return key
+
+
+class _TypeName:
+    """Visitor that finds the type name an EntityTypeCollector uses for
+    an entity."""
+
+    def __init__(self):
+        self.name = None
+
+    def visit_entity(self, _entity):
+        """Visit an Entity"""
+        self.name = 'entity'
+
+    def visit_container(self, _entity):
+        """Visit a Container"""
+        self.name = 'container'
+
+    def visit_player(self, _entity):
+        """Visit a Player"""
+        self.name = 'player'
+
+    def visit_npc(self, _entity):
+        """Visit an Npc"""
+        self.name = 'npc'
+
+    def visit_room(self, _entity):
+        """Visit a Room"""
+        self.name = 'room'
+
+    def visit_equipment(self, _entity):
+        """Visit Equipment"""
+        self.name = 'equipment'
+
+
+# Helpers ##############################################################
+
+def _type_name(entity):
+    visitor = _TypeName()
+    entity.accept(visitor)
+    return visitor.name
+
+
+def _add(entry, entity):
+    entry.setdefault(_type_name(entity), {})[entity.spec.id] = entity
+
+
+def _remove(entry, entity):
+    type_name = _type_name(entity)
+    members = entry.get(type_name)
+    if members is not None:
+        members.pop(entity.spec.id, None)
+        if not members:
+            del entry[type_name]
+
+
+def _chain(owner):
+    """An owner and the containers it is in."""
+    node = owner
+    while node is not None:
+        yield node
+        node = node.owner
+
+
+def _children(entity):
+    """The entities a collector visits inside an entity, in order."""
+    if not isinstance(entity, entity_containers.Container):
+        return []
+    items = list(entity.inventory)
+    if isinstance(entity, entity_containers.Character):
+        items.extend(entity.equipped)
+    return items
+
+
+def _descendants(entity):
+    """An entity and everything a collector would find inside it, in the
+    order a collector visits them."""
+    result = []
+    stack = [entity]
+    while stack:
+        item = stack.pop()
+        result.append(item)
+        stack.extend(reversed(_children(item)))
+    return result
@@ -8,18 +8,104 @@ class ParseCodes(enum.Enum):
     COMMAND = 2
 
 
+# The verbs every world has. Worlds can add more (see VerbTable).
+VERBS = ['get', 'take', 'drop', 'equip', 'remove', 'go', 'use', 'look',
+         'inventory', 'talk', 'give', 'put']
+
+COMMANDS = ['quit', 'exit', 'save', 'load']
+
+# Short forms that always mean the same verb, even if a world adds verbs
+# that start with the same letters.
+ABBREVIATIONS = {'l': 'look', 'i': 'inventory'}
+
+# The fewest letters a beginning of a verb can have, so that short words
+# like 'e' or 'd' are not taken as verbs by mistake.
+MIN_PREFIX = 3
+
+
+class VerbTable:
+    """Finds the verb or command a player means by the first word they
+    type.
+
+    The table is worked out once, so finding a word is one dict lookup.
+    It holds the verbs and commands, the synonyms of verbs, the
+    ABBREVIATIONS, and the beginnings of verbs and synonyms that only one
+    verb starts with (ie. 'inv' for inventory). Beginnings must be at
+    least MIN_PREFIX letters. Commands must be typed in full, so a player
+    can't quit or load a game by accident.
+
+    Attributes:
+        verbs (list): The verbs.
+        commands (list): The commands.
+        words (dict): The verb or command each word means, as a tuple of
+            the verb and its ParseCodes code. The code is None for verbs.
+    """
+
+    def __init__(self, verbs=None, commands=None, synonyms=None):
+        """
+        Args:
+            verbs (list of str): The verbs. Defaults to VERBS.
+            commands (list of str): The commands. Defaults to COMMANDS.
+            synonyms (dict): Lists of other words for verbs by verb.
+                Verbs that are not in verbs are added. Words that are
+                already verbs or commands are not changed.
+        """
+        self.verbs = list(VERBS if verbs is None else verbs)
+        self.commands = list(COMMANDS if commands is None else commands)
+        synonyms = synonyms if synonyms is not None else {}
+        for verb in synonyms:
+            if verb not in self.verbs and verb not in self.commands:
+                self.verbs.append(verb)
+
+        full = {}
+        for verb in self.verbs:
+            full[verb] = verb
+        for verb, others in synonyms.items():
+            for word in others:
+                full.setdefault(word, verb)
+        self.words = _prefixes(full)
+        for word, verb in full.items():
+            self.words[word] = (verb, None)
+        for word, verb in ABBREVIATIONS.items():
+            if word not in full and verb in self.verbs:
+                self.words[word] = (verb, None)
+        for command in self.commands:
+            self.words[command] = (command, ParseCodes.COMMAND)
+
+    def lookup(self, word):
+        """Finds what a word means.
+
+        Args:
+            word (str): The word.
+
+        Returns:
+            tuple: The verb or command and its ParseCodes code, None for
+                verbs. None if the word is not known.
+        """
+        return self.words.get(word)
+
+
 class Parser:  # pylint: disable=too-few-public-methods
     """Turns raw user input into form useable by a resolver.
 
+    The verb of the parsed input is always the verb the player means, so
+    synonyms and abbreviations are given as the verb they stand for.
+
     Attributes:
         verbs: A list of acceptable verbs.
         commands: A list of commands.
+        table (VerbTable): Finds the verbs and commands.
     """
 
-    def __init__(self):
-        self.verbs = ['get', 'take', 'drop', 'equip', 'remove', 'go',
-                      'use', 'look', 'inventory', 'talk', 'give', 'put']
-        self.commands = ['quit', 'exit']
+    def __init__(self, synonyms=None):
+        """
+        Args:
+            synonyms (dict): Verbs a world adds or other words for verbs
+                (see VerbTable and WorldDetails.verbs).
+        """
+        self.table = VerbTable(synonyms=synonyms)
+        self.verbs = self.table.verbs
+        self.commands = self.table.commands
 
     def parse(self, user_input):
         """Parses a string of user input.
@@ -37,12 +123,12 @@ class Parser:  # pylint: disable=too-few-public-methods
         code = None
         message = None
 
-        if verb not in self.verbs:
-            if verb in self.commands:
-                code = ParseCodes.COMMAND
-            else:
-                code = ParseCodes.ERROR
-                message = "You don't know how to " + verb
+        found = self.table.lookup(verb)
+        if found is None:
+            code = ParseCodes.ERROR
+            message = "You don't know how to " + verb
+        else:
+            verb, code = found
 
         return {
             'verb': verb,
@@ -79,18 +165,31 @@ class Menu:  # pylint: disable=too-few-public-methods
         self._out(str("{}. {}".format(len(self.choices) + 1, "Cancel")))
         self._out()
 
-        # Validate to make sure it is an int?
         if input_ is None:
-            try:
-                result = int(self._in("Choice: "))
-            except ValueError:
-                return -1
-        else:
-            result = int(input_[0])
+            return menu_choice(self._in("Choice: "), len(self.choices))
+        return menu_choice(input_[0], len(self.choices))
+
+
+def menu_choice(text, size):
+    """Turns the text a user typed for a menu into the chosen index.
 
-        if result > len(self.choices) + 1:
-            return -1
-        return result - 1  # Because the menu item is i + 1
+    Args:
+        text (str): The user's answer.
+        size (int): The number of choices in the menu, not counting
+            cancel.
+
+    Returns:
+        int: The index of the chosen item. size if the user chose to
+            cancel and -1 if the answer is not a menu item.
+    """
+    try:
+        result = int(text)
+    except ValueError:
+        return -1
+
+    if result < 1 or result > size + 1:
+        return -1
+    return result - 1  # Because the menu item is i + 1
 
 
 class MenuFactory:  # pylint: disable=too-few-public-methods
@@ -99,3 +198,23 @@ class MenuFactory:  # pylint: disable=too-few-public-methods
     def make(self, choices):  # pylint: disable=no-self-use
         """Returns a menu with the choices."""
         return Menu(choices)
+
+
+# Helpers ##############################################################
+
+def _prefixes(full):
+    """The beginnings of words, at least MIN_PREFIX letters long, that
+    only one verb starts with.
+
+    Args:
+        full (dict): The verb each whole word means.
+
+    Returns:
+        dict: (verb, None) tuples by the beginnings of the words.
+    """
+    starts = {}
+    for word, verb in full.items():
+        for end in range(MIN_PREFIX, len(word)):
+            starts.setdefault(word[:end], set()).add(verb)
+    return {start: (verbs.pop(), None) for start, verbs in starts.items()
+            if len(verbs) == 1}
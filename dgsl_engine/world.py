@@ -1,7 +1,10 @@
 """Game world and supporting functions."""
+import collections
 from . import entity_factory
 from . import event_factory
-from . import visitors
+from . import linker
+from . import registry
+from . import world_state
 
 
 class World:
@@ -12,6 +15,7 @@ class World:
         player (Player): The player character.
         entities (dict): All the entities in the world. Keys are entity IDs.
         events (dict): All the events in the world. Keys are event IDs.
+        index (EntityIndex): The index of where all the entities are.
     """
 
     def __init__(self):
@@ -19,10 +23,12 @@ class World:
         self.player = None
         self.entities = {}
         self.events = {}
+        self.index = EntityIndex(self.entities)
 
     def add_entity(self, entity):
         """Adds a given entity to the worlds entities."""
         self.entities[entity.spec.id] = entity
+        entity.index = self.index
 
     def add_event(self, event):
         """Adds a given event to the worlds events."""
@@ -33,6 +39,113 @@ class World:
         visitor.visit_world(self)
 
 
+class EntityIndex:
+    """Index of all the entities in a world and where they are.
+
+    Entities are found by id with a dict lookup. Where an entity is
+    is kept by its owner, so the chain of containers an entity is in
+    is found by following owners up to the room. This lets containment
+    checks take time proportional to how deeply an entity is nested
+    instead of how many entities a container holds.
+
+    Entities report every change of owner to the index (see
+    Entity.set_owner). Listeners registered with the index are told
+    about each move so other indexes can be kept up to date.
+
+    Attributes:
+        entities (dict): All the entities in the world. Keys are entity
+            IDs. Shared with the World.
+        listeners (list): Objects with an entity_moved(entity, old_owner,
+            new_owner) method to notify when an entity moves. Listeners
+            registered while a WorldState is in use only hear about moves
+            made with that state.
+        type_index (TypeIndex): The index EntityTypeCollector uses to
+            find entities by type, or None if the world does not have
+            one.
+    """
+
+    listeners = world_state.Field(copy=list)
+
+    def __init__(self, entities):
+        self.entities = entities
+        self.listeners = []
+        self.type_index = None
+
+    def register(self, listener):
+        """Register a listener to be notified when entities move."""
+        EntityIndex.listeners.for_write(self).append(listener)
+
+    def moved(self, entity, old_owner, new_owner):
+        """Records that an entity has changed owners.
+
+        Args:
+            entity (Entity): The entity that moved.
+            old_owner (Container): The entity's previous owner or None.
+            new_owner (Container): The entity's new owner or None.
+        """
+        for listener in self.listeners:
+            listener.entity_moved(entity, old_owner, new_owner)
+
+    def get(self, entity_id):
+        """Returns the entity with the given id or None."""
+        return self.entities.get(entity_id)
+
+    def forget(self, entities):
+        """Tells listeners that entities have been removed from the
+        world, for listeners with a forget_entities(entities) method."""
+        for listener in self.listeners:
+            forget = getattr(listener, 'forget_entities', None)
+            if forget is not None:
+                forget(entities)
+
+    def owners(self, entity):
+        """Returns the chain of containers an entity is in.
+
+        Args:
+            entity (Entity): The entity.
+
+        Returns:
+            list of Container: The owners starting with the closest.
+        """
+        chain = []
+        owner = entity.owner
+        while owner is not None:
+            chain.append(owner)
+            owner = owner.owner
+        return chain
+
+    def find(self, entity_id, container):
+        """Finds an entity if it is in a container or its sub containers.
+
+        A container is considered to contain itself, like when it is
+        searched by EntityIdCollector.
+
+        Args:
+            entity_id (str): The id of the entity to find.
+            container (Container): The container to look in.
+
+        Returns:
+            Entity: The entity if it is in the container, otherwise None.
+        """
+        # An entity that has not been built yet (see LazyWorld) can not
+        # be in a container that has been, so it is not built to check.
+        # It could be moved into one once it is, which is not a change to
+        # a field, so the answer is not remembered (see world_state).
+        entity = dict.get(self.entities, entity_id)
+        if entity is None and entity_id in self.entities:
+            world_state.volatile()
+        node = entity
+        while node is not None:
+            if node is container:
+                return entity
+            node = node.owner
+        return None
+
+    def contains(self, container, entity_id):
+        """Checks if an entity is in a container or its sub containers."""
+        return self.find(entity_id, container) is not None
+
+
 class WorldDetails:  # pylint: disable=too-few-public-methods
     """World details data.
 
@@ -41,13 +154,18 @@ class WorldDetails:  # pylint: disable=too-few-public-methods
         welcome (str): Information about the world.
         opening (str): The text to start the story.
         version (str): The worlds version.
+        verbs (dict): The verbs the world adds for the player to use,
+            with lists of their synonyms. Verbs that the engine already
+            has only add synonyms. (see user_input.VerbTable)
     """
 
-    def __init__(self, name, welcome, opening, version):
+    def __init__(self, name, welcome, opening, version, verbs=None):
+        # pylint: disable=too-many-arguments
         self.name = name
         self.welcome = welcome
         self.opening = opening
         self.version = version
+        self.verbs = verbs if verbs is not None else {}
 
 
 class WorldFactory:  # pylint: disable=too-few-public-methods
@@ -58,16 +176,24 @@ class WorldFactory:  # pylint: disable=too-few-public-methods
             entity json blueprints.
         event_factory: A factory object for creating events from
             event json blueprints.
+        lazy (bool): True to create LazyWorlds, which only build rooms
+            when they are needed.
     """
 
-    def __init__(self):
+    def __init__(self, lazy=False):
         self.entity_factory = entity_factory.EntityFactory()
         self.event_factory = event_factory.EventFactory()
+        self.lazy = lazy
 
     def new(self, world_json):
         """Creates and returns a new World object from the given
         json blueprint.
         """
+        if self.lazy:
+            new_world = LazyWorld(JsonBlueprints(world_json), self)
+            _setup_world(new_world, world_json)
+            return new_world
+
         new_world = World()
 
         self._create_objects(new_world, world_json)
@@ -104,51 +230,453 @@ class WorldFactory:  # pylint: disable=too-few-public-methods
 
 
 def _connect_objects(new_world, world_json):
-    """Connects all the objects in a world together.
+    """Connects all the objects in a world together in one pass.
 
     Some objects like options and conditions are created when
-    the objects that need them are connected.
+    the objects that need them are connected (see linker).
+
+    Raises:
+        InvalidParameterError: Listing all the references to objects
+            that the world does not have.
     """
-    for id_ in world_json['objects']:
-        obj = world_json['objects'][id_]
+    objects = world_json['objects']
+    world_linker = linker.Linker(new_world, {
+        id_: obj for id_, obj in objects.items() if create_later(obj)})
+    for id_, obj in objects.items():
         if is_entity(obj):
-            conn = visitors.EntityConnector(obj, new_world)
-            entity = new_world.entities[id_]
-            conn.connect(entity)
-            if obj['type'] == 'player':
-                start_room = new_world.entities[obj['start']['id']]
-                start_room.add(entity)
+            world_linker.link(new_world.entities[id_], obj)
         elif is_event(obj):
-            conn = visitors.EventConnector(
-                obj, new_world, world_json['objects'])
-            event = new_world.events[id_]
-            conn.connect(event)
+            world_linker.link(new_world.events[id_], obj)
+    world_linker.check()
 
 
 def _setup_world(new_world, world_json):
     """Adds the world details to a world."""
     details = WorldDetails(
         world_json['name'], world_json['welcome'],
-        "You are playing this game!", world_json['version'])
+        "You are playing this game!", world_json['version'],
+        world_json.get('verbs'))
     new_world.details = details
     #new_world.details.opening = world_json['opening']
 
 
+class LazyWorld(World):
+    """A world that builds its rooms the first time they are needed.
+
+    Only the room the player starts in is built when the world is
+    created. The world is split into regions: each room with everything
+    in it, and any entity that is not in a room on its own. A region is
+    built with all the events its entities have, the events those
+    events run, and the regions of any other entities they refer to.
+    Moves only keep the id of their destination (see MoveEntity), so a
+    room is not built until something moves into it. Looking up an id
+    in entities or events also builds what it belongs to. Iterating
+    over them only gives what has been built.
+
+    Rooms the player left more than idle_moves moves ago, and the least
+    recently used rooms when more than max_regions are built, are removed
+    again if nothing in them has changed, nothing outside them refers to
+    them, and they are not being used. The next time they are needed
+    they are built from their blueprints again. Changes are only known
+    when they are kept in a WorldState, so rooms are only removed while
+    a state is in use and only that state is checked. A world that
+    removes rooms should not be shared by several games.
+
+    The blueprints are kept in memory by JsonBlueprints or on disk by a
+    WorldStore (see world_store). Entities and events take up much more
+    memory than their json, so either way the world uses memory in
+    proportion to how much of it has been built. References to objects
+    the world does not have are only found when the part of the world
+    with them is built, so worlds should be checked by loading them
+    normally first.
+
+    Attributes:
+        idle_moves (int): Moves the player has to make after leaving a
+            room before it can be removed. 0 to remove rooms as soon as
+            the move out of them is done. None to keep every room that
+            is built.
+        max_regions (int): The most regions to keep built. Only rooms
+            that can be removed are, so more can be built for a while.
+            None for no limit.
+        compile_events (bool): True to compile the composite events that
+            are built (see event_vm.compile_world).
+    """
+
+    def __init__(self, blueprints, factory):
+        """
+        Args:
+            blueprints: Where the world's blueprints are kept, like a
+                JsonBlueprints or a WorldStore (see world_store).
+            factory (WorldFactory): Creates the entities and events.
+        """
+        super(LazyWorld, self).__init__()
+        self.idle_moves = None
+        self.max_regions = None
+        self.compile_events = False
+        self._blueprints = blueprints
+        self._factory = factory
+        self.entities = _LazyTable(self._build_entity, blueprints.entity_ids)
+        self.events = _LazyTable(self._build_event, blueprints.event_ids)
+        self.index = EntityIndex(self.entities)
+        self._linker = _LazyLinker(self, blueprints.conditions)
+        self._regions = collections.OrderedDict()
+        self._owner = {}
+        self._pins = {}
+        self._pinning = {}
+        self._building = []
+        self._moves = 0
+
+        with world_state.using(None):
+            self.index.register(self)
+            if blueprints.player is not None:
+                self.entities[blueprints.player]  # pylint: disable=pointless-statement
+
+    @property
+    def regions(self):
+        """list of str: The ids of the rooms and other regions that are
+        built, from the least to the most recently used."""
+        return list(self._regions)
+
+    def entity_moved(self, entity, old_owner, new_owner):
+        # pylint: disable=unused-argument
+        """Keeps track of the rooms the player enters and removes idle
+        rooms. Called by the world's EntityIndex."""
+        if entity is not self.player or new_owner is None:
+            return
+        root = self._owner.get(new_owner.spec.id)
+        region = self._regions.get(root)
+        if region is None:
+            return
+        self._moves += 1
+        # The player is still in the room it is leaving until the move is
+        # done, so that room counts as used too.
+        if old_owner is not None:
+            self._use(self._owner.get(old_owner.spec.id))
+        self._use(root)
+        self.evict_idle()
+
+    def evict_idle(self):
+        """Removes the rooms that have been idle for idle_moves moves, or
+        the least recently used rooms past max_regions, that can be
+        removed."""
+        state = world_state.current()
+        if (state is None or self._building
+                or self.idle_moves is None and self.max_regions is None):
+            return
+        changes = {}
+        for field, values in state.changes.items():
+            for obj in values:
+                changes.setdefault(id(obj), []).append((field, values))
+        for root, region in list(self._regions.items()):
+            idle = self._moves - region.used
+            over = (self.max_regions is not None
+                    and len(self._regions) > self.max_regions)
+            # Rooms used in this move are never removed
+            if idle == 0 or not (over or self.idle_moves is not None
+                                 and idle > self.idle_moves):
+                break
+            if self._pins.get(root):
+                continue
+            # Values the state has for the region that are the same as
+            # the template, like the inventory of a room the player has
+            # been in and left, do not count as changes.
+            found = [(field, values, part) for part in region.parts()
+                     for field, values in changes.get(id(part), ())]
+            if all(_same(values[part], getattr(part, field.store))
+                   for field, values, part in found):
+                for _, values, part in found:
+                    del values[part]
+                self._evict(root)
+
+    def _use(self, root):
+        region = self._regions.get(root)
+        if region is not None:
+            region.used = self._moves
+            self._regions.move_to_end(root)
+
+    # Building #########################################################
+
+    def _build_entity(self, id_):
+        root = id_
+        seen = {root}
+        while True:
+            parent = self._blueprints.parent(root)
+            if parent is None or parent in seen:
+                break  # a parent in seen means containers inside each other
+            root = parent
+            seen.add(root)
+        if root in self._regions:
+            return
+        region = _Region(self._moves)
+        self._regions[root] = region
+        self._building.append(root)
+        try:
+            with world_state.using(None):
+                blueprints = self._blueprints.entities(self._region_ids(root))
+                for obj in blueprints:
+                    entity = self._factory.entity_factory.new(obj)
+                    self.add_entity(entity)
+                    self._owner[obj['id']] = root
+                    region.entities.append(entity)
+                    if obj['type'] == 'player':
+                        self.player = entity
+                for entity, obj in zip(region.entities, blueprints):
+                    self._linker.link(entity, obj)
+        finally:
+            self._building.pop()
+        self._linker.check()
+
+    def _build_event(self, id_):
+        root = self._building[-1] if self._building else None
+        region = self._regions.get(root)
+        blueprints = self._event_blueprints(id_)
+        with world_state.using(None):
+            for obj in blueprints:
+                event = self._factory.event_factory.new(obj)
+                self.add_event(event)
+                self._owner[obj['id']] = root
+                if region is not None:
+                    region.events.append(event)
+            for obj in blueprints:
+                self._linker.link(dict.__getitem__(self.events, obj['id']),
+                                  obj)
+        self._linker.check()
+        if self.compile_events:
+            # Only worlds run as programs need the compiler
+            from . import event_vm  # pylint: disable=import-outside-toplevel
+            for obj in blueprints:
+                event_vm.prepare(dict.__getitem__(self.events, obj['id']))
+
+    def _region_ids(self, root):
+        """The ids of a root entity and everything in it."""
+        ids = [root]
+        seen = {root}
+        for id_ in ids:
+            for content in self._blueprints.contents(id_):
+                # Ids the world does not have are reported by the linker
+                if (content not in seen
+                        and content in self._blueprints.entity_ids):
+                    seen.add(content)
+                    ids.append(content)
+        return ids
+
+    def _event_blueprints(self, id_):
+        """The blueprints of an event and the events it runs that have not
+        been built yet."""
+        blueprints = [self._blueprints.get(id_)]
+        seen = {id_}
+        for obj in blueprints:
+            for ref_id in linker.references(obj):
+                if ref_id in self._blueprints.conditions:
+                    option = self._blueprints.conditions[ref_id]
+                    if option['type'] not in ('option', 'conditional_option'):
+                        continue
+                    ref_id = option['event']['id']
+                if (ref_id not in seen and ref_id in self.events
+                        and not dict.__contains__(self.events, ref_id)):
+                    seen.add(ref_id)
+                    blueprints.append(self._blueprints.get(ref_id))
+        return blueprints
+
+    # Regions ##########################################################
+
+    def _used(self, id_):
+        """Records that the region being built refers to an object."""
+        owner = self._owner.get(id_)
+        user = self._building[-1] if self._building else None
+        if owner is not None and owner != user:
+            self._pins.setdefault(owner, set()).add(user)
+            self._pinning.setdefault(user, set()).add(owner)
+
+    def _owned(self, id_):
+        """Records that the region being built made a condition."""
+        root = self._building[-1] if self._building else None
+        self._owner[id_] = root
+        region = self._regions.get(root)
+        if region is not None:
+            region.conditions.append(id_)
+
+    def _evict(self, root):
+        region = self._regions.pop(root)
+        for entity in region.entities:
+            dict.__delitem__(self.entities, entity.spec.id)
+            del self._owner[entity.spec.id]
+        for event in region.events:
+            dict.__delitem__(self.events, event.id)
+            del self._owner[event.id]
+        for id_ in region.conditions:
+            self._linker.forget_condition(id_)
+            del self._owner[id_]
+        for other in self._pinning.pop(root, ()):
+            self._pins[other].discard(root)
+        self.index.forget(region.entities)
+
+
+class JsonBlueprints:
+    """The blueprints of a LazyWorld, kept in memory as the world's json.
+
+    Attributes:
+        player (str): The id of the player, or None.
+        entity_ids (dict): The ids of the entities, with their place in
+            the file.
+        event_ids (set): The ids of the events.
+        conditions (dict): The blueprints of the conditions and options.
+    """
+
+    def __init__(self, world_json):
+        self.player = None
+        self.entity_ids = {}
+        self.event_ids = set()
+        self.conditions = {}
+        self._objects = world_json['objects']
+        self._parent = {}
+        self._contents = {}
+        for id_, obj in self._objects.items():
+            if is_entity(obj):
+                self.entity_ids[id_] = len(self.entity_ids)
+                for ref in obj.get('items', ()):
+                    self._add_content(id_, ref['id'])
+                if obj['type'] == 'player':
+                    self._add_content(obj['start']['id'], id_)
+                    self.player = id_
+            elif is_event(obj):
+                self.event_ids.add(id_)
+            elif create_later(obj):
+                self.conditions[id_] = obj
+            else:
+                raise AttributeError(  # the same error WorldFactory raises
+                    "*** Error: World creator does not recognize type: "
+                    + obj['type'] + " ***")
+
+    def get(self, id_):
+        """Returns the blueprint of an object."""
+        return self._objects[id_]
+
+    def entities(self, ids):
+        """Returns the blueprints of some entities in the order they are
+        in the world file."""
+        return [self._objects[id_]
+                for id_ in sorted(ids, key=self.entity_ids.get)]
+
+    def parent(self, id_):
+        """Returns the id of the entity an entity starts in, or None."""
+        return self._parent.get(id_)
+
+    def contents(self, id_):
+        """Returns the ids of the entities an entity starts with."""
+        return self._contents.get(id_, ())
+
+    def _add_content(self, container_id, id_):
+        self._parent[id_] = container_id
+        self._contents.setdefault(container_id, []).append(id_)
+
+
+class _Region:  # pylint: disable=too-few-public-methods
+    """The objects built for one region of a LazyWorld.
+
+    Attributes:
+        used (int): The move the player was last in the region.
+        entities (list): The region's entities.
+        events (list): The events built for the region.
+        conditions (list): The ids of the conditions built for it.
+    """
+
+    def __init__(self, used):
+        self.used = used
+        self.entities = []
+        self.events = []
+        self.conditions = []
+
+    def parts(self):
+        """Yields the region's objects that can have fields."""
+        for entity in self.entities:
+            yield entity
+            yield entity.states
+            for name in ('inventory', 'equipped'):
+                part = getattr(entity, name, None)
+                if part is not None and not isinstance(part, bool):
+                    yield part
+        yield from self.events
+
+
+def _same(value, template):
+    """Checks if a field's value is the same as its template value,
+    including the order of dicts."""
+    if isinstance(value, dict) and isinstance(template, dict):
+        return list(value.items()) == list(template.items())
+    return value == template
+
+
+class _LazyTable(dict):
+    """The built entities or events of a LazyWorld. Looking up an object
+    that has not been built yet builds it.
+
+    ``in`` is True for every object the world has, built or not.
+    """
+
+    def __init__(self, build, known):
+        super(_LazyTable, self).__init__()
+        self._build = build
+        self._known = known
+
+    def __missing__(self, key):
+        if key not in self._known:
+            raise KeyError(key)
+        self._build(key)
+        return dict.__getitem__(self, key)
+
+    def __contains__(self, key):
+        return dict.__contains__(self, key) or key in self._known
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
+class _LazyLinker(linker.Linker):
+    """Links the objects of a LazyWorld as they are built.
+
+    Keeps track of which regions refer to which so that regions that are
+    referred to are not removed, and does not build the destinations of
+    moves.
+    """
+
+    def forget_condition(self, id_):
+        """Drops a condition made for a region that was removed."""
+        self._conditions.pop(id_, None)
+
+    def _link_move(self, move, blueprint, source):
+        move.destination_id = blueprint['destination']['id']
+        if move.destination_id not in self.world.entities:
+            self.missing.setdefault(move.destination_id, []).append(source)
+
+    def condition(self, ref, source):
+        made = ref['id'] not in self._conditions
+        condition = super(_LazyLinker, self).condition(ref, source)
+        if made and condition is not None:
+            self.world._owned(ref['id'])  # pylint: disable=protected-access
+        return condition
+
+    def _lookup(self, table, ref, source):
+        obj = super(_LazyLinker, self)._lookup(table, ref, source)
+        if obj is not None:
+            self.world._used(ref['id'])  # pylint: disable=protected-access
+        return obj
+
+
 def is_entity(obj):
     """Checks if json blueprint is an entity."""
-    return obj['type'] in ['entity', 'container', 'room', 'player', 'equipment', 'npc']
+    return registry.kind(obj['type']) == registry.ENTITY
 
 
 def is_event(obj):
-    """Checks if json blueprint is an entity."""
-    return obj['type'] in ['inform', 'event', 'move', 'give', 'end_game',
-                           'take', 'toggle_active',
-                           'toggle_obtainable', 'toggle_hidden', 'group',
-                           'ordered', 'conditional', 'interaction']
+    """Checks if json blueprint is an event."""
+    return registry.kind(obj['type']) == registry.EVENT
 
 
 def create_later(obj):
     """Checks if json blueprint is an object that has creation delayed
     until connection time."""
-    return obj['type'] in ['option', 'conditional_option', 'hasItem',
-                           'protected', 'question', 'is_active']
+    return registry.kind(obj['type']) in (registry.CONDITION, registry.OPTION)
@@ -0,0 +1,229 @@
+"""A cache of compiled worlds on disk, keyed by the content of the .world
+file they were loaded from.
+
+Loading a .world file parses its json and links every object. The cache
+keeps the linked world as a compiled world (see compiled_world) so the
+next time the same file is loaded it only has to be decompiled. Entries
+are named by the sha256 of the .world file, so an edited world gets a new
+entry and the old one is never used again.
+
+Each entry is::
+
+    sha256 of the .world file (32 bytes) | compiled world
+
+The hash at the start is checked against the name of the entry when it
+is read. An entry that does not match, is corrupt, or was compiled with
+another format version is treated as a miss and replaced.
+
+Entries are written to a temporary file in the cache directory and then
+renamed into place, so a reader never sees a partly written entry and
+many processes (like the workers of a server) can share one cache.
+When the cache grows past its size limit the least recently used
+entries are removed. Reading an entry updates its modification time,
+which is what recency is measured by.
+
+::
+
+    cache = world_cache.WorldCache()
+    new_world = cache.load('my_world.world')
+"""
+import hashlib
+import os
+import site
+from . import compiled_world
+from . import exceptions
+from . import world_loader
+
+DEFAULT_DIR = os.path.join(site.USER_BASE, 'dgsl', 'cache')
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_SUFFIX = '.cworld'
+_HASH_SIZE = hashlib.sha256().digest_size
+
+
+class WorldCache:
+    """A size bounded, least recently used cache of compiled worlds.
+
+    Attributes:
+        directory (str): The directory the entries are kept in. It is
+            created when the first entry is written.
+        max_bytes (int): The most bytes the entries can take up together.
+            An entry bigger than this is not kept.
+    """
+
+    def __init__(self, directory=DEFAULT_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def load(self, world_path):
+        """Loads a .world file, from the cache if it has the file's world.
+
+        On a miss the file is loaded with the streaming loader and the
+        world is added to the cache. Problems with the cache itself,
+        like a directory that can not be written to, never stop the
+        world from loading.
+
+        Args:
+            world_path (str): The path of the .world file.
+
+        Returns:
+            World: The new world.
+        """
+        digest = file_hash(world_path)
+        cached = self.get(digest)
+        if cached is not None:
+            return cached
+
+        # Read without newline translation so the text hashes to the
+        # same bytes as the file.
+        with open(world_path, encoding='utf-8', newline='') as file:
+            reader = _HashingReader(file)
+            new_world = world_loader.load(reader)
+            reader.read()  # hash anything after the end of the json
+        # Key the entry by what was loaded in case the file changed
+        # after it was hashed.
+        self.put(reader.digest(), new_world)
+        return new_world
+
+    def get(self, digest):
+        """Returns the cached world for a hash, or None on a miss.
+
+        Args:
+            digest (bytes): The sha256 of the .world file.
+
+        Returns:
+            World: The new world, or None.
+        """
+        path = self._path(digest)
+        try:
+            with open(path, 'rb') as file:
+                data = file.read()
+        except OSError:
+            return None
+        if data[:_HASH_SIZE] != digest:
+            return None
+        try:
+            new_world = compiled_world.decompile_world(data[_HASH_SIZE:])
+        except exceptions.InvalidParameterError:
+            return None
+        _touch(path)
+        return new_world
+
+    def put(self, digest, game_world):
+        """Adds a world to the cache and evicts old entries if the cache
+        is too big.
+
+        Args:
+            digest (bytes): The sha256 of the .world file.
+            game_world (World): The fully linked world loaded from it.
+
+        Returns:
+            bool: True if the entry was written.
+        """
+        data = digest + compiled_world.compile_world(game_world)
+        if len(data) > self.max_bytes:
+            return False
+        # Only needed on a miss, and slow to import
+        import tempfile  # pylint: disable=import-outside-toplevel
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            handle, temp_path = tempfile.mkstemp(
+                suffix='.tmp', dir=self.directory)
+            try:
+                with os.fdopen(handle, 'wb') as file:
+                    file.write(data)
+                os.replace(temp_path, self._path(digest))
+            except BaseException:
+                _remove(temp_path)
+                raise
+        except OSError:
+            return False
+        self.evict()
+        return True
+
+    def evict(self):
+        """Removes the least recently used entries until the cache is no
+        bigger than max_bytes."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            _remove(path)
+            total -= size
+
+    def entries(self):
+        """Returns (last used time, size, path) for each entry."""
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return entries
+        for name in names:
+            if not name.endswith(_SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue  # removed by another process
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def clear(self):
+        """Removes every entry."""
+        for _, _, path in self.entries():
+            _remove(path)
+
+    def _path(self, digest):
+        return os.path.join(self.directory, digest.hex() + _SUFFIX)
+
+
+def file_hash(path):
+    """Returns the sha256 of a file's contents.
+
+    Args:
+        path (str): The path of the file.
+
+    Returns:
+        bytes: The digest.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(world_loader.CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.digest()
+
+
+# Helpers ##############################################################
+
+class _HashingReader:
+    """Wraps a text file and hashes everything read from it."""
+
+    def __init__(self, file):
+        self.file = file
+        self.hash = hashlib.sha256()
+
+    def read(self, size=-1):
+        """Reads from the file like file.read."""
+        text = self.file.read(size)
+        self.hash.update(text.encode('utf-8'))
+        return text
+
+    def digest(self):
+        """Returns the sha256 of what has been read."""
+        return self.hash.digest()
+
+
+def _touch(path):
+    try:
+        os.utime(path)
+    except OSError:
+        pass  # evicted by another process
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
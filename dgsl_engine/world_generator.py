@@ -0,0 +1,358 @@
+"""Generates synthetic worlds of any size for scale testing.
+
+The worlds are .world json files using the same blueprints as worlds
+made with the editor, so they load with WorldFactory like any other
+world. Each room gets
+
+* a door to the next room and a few doors to random rooms,
+* a tree of containers ``depth`` levels deep with ``fan_out`` children
+  in each container,
+* npcs that each carry a gift and have a tree of events for talking,
+* equipment that protects from a random effect,
+* a key and some loose items with their own trees of events.
+
+Event trees are ``event_depth`` levels of group, ordered, conditional,
+and interaction events with ``event_fan_out`` children each. The leaves
+are plain, move, give, take, and toggle events that act on things in
+the same room.
+
+The world only depends on the settings and the seed, so the same
+settings always make the same file. The file is written one room at a
+time so worlds much larger than memory can be made.
+
+::
+
+    generator = WorldGenerator(rooms=10000, seed=42)
+    with open('big.world', 'w') as file:
+        generator.write(file)
+"""
+import json
+import random
+from . import exceptions
+
+_COMPOSITES = ['group', 'ordered', 'conditional', 'interaction']
+_LEAVES = ['event', 'move', 'give', 'take', 'toggle_active',
+           'toggle_obtainable', 'toggle_hidden']
+_CONDITIONS = ['hasItem', 'is_active', 'protected']
+_SLOTS = ['head', 'body', 'hands', 'feet']
+_EFFECTS = ['space', 'radiation', 'heat', 'cold']
+
+_WORDS = ['red', 'blue', 'old', 'shiny', 'broken', 'heavy', 'small',
+          'dusty', 'strange', 'golden', 'wooden', 'cold', 'tiny', 'bent']
+_THINGS = ['lamp', 'book', 'coin', 'ring', 'rope', 'cup', 'map',
+           'bottle', 'stone', 'knife', 'scroll', 'bell', 'mask', 'pipe']
+_HOLDERS = ['crate', 'chest', 'sack', 'barrel', 'locker', 'basket']
+_PEOPLE = ['guard', 'merchant', 'cook', 'sailor', 'robot', 'wizard']
+_WEAR = {'head': 'helmet', 'body': 'suit', 'hands': 'gloves',
+         'feet': 'boots'}
+
+
+class WorldGenerator:  # pylint: disable=too-many-instance-attributes
+    """Makes synthetic worlds.
+
+    Attributes:
+        rooms (int): The number of rooms.
+        depth (int): Levels of containers in each room's container tree.
+        fan_out (int): Items in each container.
+        npcs (int): Npcs in each room.
+        equipment (int): Equipment in each room.
+        items (int): Loose items in each room.
+        doors (int): Doors to random rooms in each room, besides the
+            door to the next room.
+        event_depth (int): Levels of composite events in event trees.
+        event_fan_out (int): Events in each group, ordered group, and
+            interaction.
+        seed (int): The seed for the random choices.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, rooms=100, depth=2, fan_out=3, npcs=1, equipment=1,
+                 items=2, doors=1, event_depth=2, event_fan_out=2,
+                 seed=0):
+        if rooms < 1:
+            raise exceptions.InvalidParameterError(
+                "Error: a world needs at least one room")
+        if min(depth, fan_out, npcs, equipment, items, doors, event_depth,
+               event_fan_out) < 0:
+            raise exceptions.InvalidParameterError(
+                "Error: world generator settings can not be negative")
+        self.rooms = rooms
+        self.depth = depth
+        self.fan_out = fan_out
+        self.npcs = npcs
+        self.equipment = equipment
+        self.items = items
+        self.doors = doors
+        self.event_depth = event_depth
+        self.event_fan_out = event_fan_out
+        self.seed = seed
+
+    def objects_per_room(self, sample=16):
+        """Returns about how many objects each room adds to the world.
+
+        Event trees are random so rooms vary in size. This is the average
+        of the first few rooms.
+
+        Args:
+            sample (int): The number of rooms to average.
+        """
+        total = sum(1 for idx in range(sample)
+                    for _ in _Room(self, idx).objects())
+        return total / sample
+
+    def set_size(self, objects):
+        """Sets the number of rooms so the world has about the given
+        number of objects.
+
+        Args:
+            objects (int): The number of objects wanted.
+        """
+        self.rooms = max(1, round(objects / self.objects_per_room()))
+
+    def objects(self):
+        """Generates the objects of the world one room at a time.
+
+        Yields:
+            (str, dict): The id and json blueprint of each object.
+        """
+        for idx in range(self.rooms):
+            yield from _Room(self, idx).objects()
+        yield 'player', {
+            'id': 'player', 'type': 'player', 'name': 'player',
+            'description': 'an intrepid explorer', 'events': [],
+            'items': [], 'start': _ref(_room_id(0))}
+
+    def write(self, file):
+        """Writes the world as json to a text file.
+
+        Args:
+            file: A file opened for writing text.
+
+        Returns:
+            int: The number of objects written.
+        """
+        details = {
+            'name': 'Synthetic World {}'.format(self.seed),
+            'version': '1.0',
+            'welcome': 'A world of {} rooms'.format(self.rooms),
+            'player': _ref('player'),
+        }
+        head = json.dumps(details, sort_keys=True)
+        file.write(head[:-1] + ', "objects": {')
+        count = 0
+        for id_, obj in self.objects():
+            if count:
+                file.write(', ')
+            file.write(json.dumps(id_))
+            file.write(': ')
+            file.write(json.dumps(obj, sort_keys=True))
+            count += 1
+        file.write('}}\n')
+        return count
+
+
+class _Room:
+    """Makes the objects for one room.
+
+    Each room has its own random generator seeded from the world's seed
+    and the room number, so rooms can be made in any order.
+    """
+
+    def __init__(self, generator, idx):
+        self.gen = generator
+        self.id = _room_id(idx)
+        self.idx = idx
+        self.rng = random.Random('{}:{}'.format(generator.seed, idx))
+        self.objects_made = []
+        self.entities = []
+        self.next_id = 0
+
+    def objects(self):
+        """Yields the ids and blueprints of the room's objects."""
+        gen = self.gen
+        rng = self.rng
+        contents = []
+
+        for door in range(gen.doors + 1):
+            if door == 0:
+                target = (self.idx + 1) % gen.rooms
+            else:
+                target = rng.randrange(gen.rooms)
+            move = self._event('move', "You go through the door.")
+            move['destination'] = _ref(_room_id(target))
+            contents.append(self._entity(
+                'entity', 'a door to room {}'.format(target),
+                events=[(move['id'], 'use')]))
+
+        if gen.depth > 0:
+            contents.append(self._container(gen.depth))
+        key = self._entity('entity', 'a key', obtainable=1)
+        contents.append(key)
+        for _ in range(gen.equipment):
+            contents.append(self._equipment())
+        items = [self._entity('entity', 'a ' + self._name(), obtainable=1)
+                 for _ in range(gen.items)]
+        contents.extend(items)
+
+        # Event trees are made after the items so they can refer to them
+        for _ in range(gen.npcs):
+            gift = self._entity('entity', 'a ' + self._name(), obtainable=1)
+            npc = self._entity('npc', 'a ' + rng.choice(_PEOPLE),
+                               items=[gift])
+            contents.append(npc)
+            npc['events'].append(_verb(
+                self._event_tree(gen.event_depth, npc, gift, key), 'talk'))
+        for item in items:
+            item['events'].append(_verb(
+                self._event_tree(gen.event_depth, None, None, key), 'use'))
+
+        room = self._entity('room', 'room {}'.format(self.idx),
+                            items=contents, id_=self.id)
+        room['description'] = 'You are in room {}.'.format(self.idx)
+        return iter(self.objects_made)
+
+    # Entities #########################################################
+
+    def _entity(self, type_, name, items=(), events=(), obtainable=0,
+                id_=None):
+        # pylint: disable=too-many-arguments
+        if id_ is None:
+            id_ = self._new_id()
+        entity = {
+            'id': id_, 'type': type_, 'name': name,
+            'description': name + ' in room {}'.format(self.idx),
+            'active': 1, 'obtainable': obtainable, 'hidden': 0,
+            'items': [_ref(item['id']) for item in items],
+            'events': [_verb(event_id, verb) for event_id, verb in events],
+        }
+        self.objects_made.append((id_, entity))
+        if type_ != 'room':
+            self.entities.append(entity)
+        return entity
+
+    def _container(self, depth):
+        children = []
+        for _ in range(self.gen.fan_out):
+            if depth > 1:
+                children.append(self._container(depth - 1))
+            else:
+                children.append(self._entity(
+                    'entity', 'a ' + self._name(), obtainable=1))
+        return self._entity('container', 'a ' + self.rng.choice(_HOLDERS),
+                            items=children)
+
+    def _equipment(self):
+        slot = self.rng.choice(_SLOTS)
+        equip = self._entity(
+            'equipment', 'a {} {}'.format(self.rng.choice(_WORDS),
+                                          _WEAR[slot]),
+            obtainable=1)
+        equip['slot'] = slot
+        equip['protects'] = [self.rng.choice(_EFFECTS)]
+        equip['must_equip'] = self.rng.randrange(2)
+        return equip
+
+    # Events ###########################################################
+
+    def _event_tree(self, depth, npc, gift, key):
+        """Makes a tree of events and returns the id of its root."""
+        if depth == 0:
+            return self._leaf(npc, gift, key)['id']
+
+        type_ = self.rng.choice(_COMPOSITES)
+        event = self._event(type_, '')
+        if type_ == 'conditional':
+            event['condition'] = _ref(self._condition(key))
+            event['success'] = _ref(
+                self._event_tree(depth - 1, npc, gift, key))
+            event['failure'] = _ref(
+                self._event_tree(depth - 1, npc, gift, key))
+            return event['id']
+
+        children = [self._event_tree(depth - 1, npc, gift, key)
+                    for _ in range(self.gen.event_fan_out)]
+        if type_ == 'interaction':
+            event['message'] = 'What do you do?'
+            event['breakout'] = self.rng.randrange(2)
+            event['options'] = [_ref(self._option(child, key))
+                                for child in children]
+            event['events'] = event['options']
+        else:
+            event['events'] = [_verb(child, '') for child in children]
+        return event['id']
+
+    def _leaf(self, npc, gift, key):
+        type_ = self.rng.choice(_LEAVES)
+        if type_ == 'give' and npc is None:
+            type_ = 'event'
+        event = self._event(type_, 'Something happens ({}).'.format(type_))
+        if type_ == 'move':
+            event['destination'] = _ref(
+                _room_id(self.rng.randrange(self.gen.rooms)))
+        elif type_ == 'give':
+            event['item'] = _ref(gift['id'])
+            event['item_owner'] = _ref(npc['id'])
+        elif type_ == 'take':
+            event['item'] = _ref(key['id'])
+            event['new_owner'] = _ref(npc['id'] if npc is not None
+                                      else self.id)
+        elif type_.startswith('toggle'):
+            event['target'] = _ref(self.rng.choice(self.entities)['id'])
+        return event
+
+    def _event(self, type_, message):
+        id_ = self._new_id()
+        event = {'id': id_, 'type': type_, 'name': type_, 'message': message,
+                 'once': 0, 'subjects': [], 'verb': None}
+        self.objects_made.append((id_, event))
+        return event
+
+    def _condition(self, key):
+        type_ = self.rng.choice(_CONDITIONS)
+        id_ = self._new_id()
+        condition = {'id': id_, 'type': type_, 'name': type_}
+        if type_ == 'hasItem':
+            condition['item'] = _ref(key['id'])
+            condition['other'] = None
+        elif type_ == 'is_active':
+            condition['item'] = _ref(self.rng.choice(self.entities)['id'])
+            condition['other'] = None
+        else:
+            condition['effects'] = [self.rng.choice(_EFFECTS)]
+        self.objects_made.append((id_, condition))
+        return id_
+
+    def _option(self, event_id, key):
+        id_ = self._new_id()
+        option = {'id': id_, 'type': 'option', 'name': 'option',
+                  'text': 'Try the ' + self._name(),
+                  'event': _verb(event_id, None)}
+        if self.rng.randrange(2):
+            option['type'] = 'conditional_option'
+            option['condition'] = _ref(self._condition(key))
+        self.objects_made.append((id_, option))
+        return id_
+
+    # Helpers ##########################################################
+
+    def _new_id(self):
+        id_ = '{}.{}'.format(self.id, self.next_id)
+        self.next_id += 1
+        return id_
+
+    def _name(self):
+        return self.rng.choice(_WORDS) + ' ' + self.rng.choice(_THINGS)
+
+
+# Helpers ##############################################################
+
+def _room_id(idx):
+    return 'room{}'.format(idx)
+
+
+def _ref(id_):
+    return {'id': id_, 'name': id_}
+
+
+def _verb(id_, verb):
+    return {'id': id_, 'name': id_, 'verb': verb}
@@ -0,0 +1,330 @@
+"""Loads .world files without reading them into memory all at once.
+
+WorldFactory builds a world from the parsed json of the whole file, so
+while it works the file's text, the parsed json, and the new world are
+all in memory. The streaming loader reads the file in chunks and parses
+the objects map one object at a time. Each entity and event is created
+as soon as it is read and connected to the objects it refers to as soon
+as they have all been read. Until then only the ids it refers to are
+kept, in a pending table keyed by the ids that are still missing.
+The blueprints of conditions and options are kept until the whole file
+is read, since they are created by the objects that use them.
+
+Each object is connected to all of its references at once, so the
+events of entities, the events of groups, etc. are in the same order as
+with WorldFactory. Entities are put in the containers they start in once
+the whole file is read, in the order of the file, since the player adds
+itself to the contents of the room it starts in. So the contents of
+containers are also in the same order as with WorldFactory.
+
+::
+
+    with open('my_world.world') as file:
+        new_world = world_loader.load(file)
+"""
+import json
+import re
+from . import exceptions
+from . import linker
+from . import registry
+from . import world
+
+CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+def load(file, chunk_size=CHUNK_SIZE):
+    """Loads a world from a .world json file.
+
+    Args:
+        file: A file with the world json opened for reading text.
+        chunk_size (int): Characters to read from the file at a time.
+
+    Returns:
+        World: The new world.
+
+    Raises:
+        InvalidParameterError: If the file is not valid world json or
+            refers to objects that it does not have.
+    """
+    factory = world.WorldFactory()
+    new_world = world.World()
+    links = _Linker(new_world)
+    details = {}
+
+    for key, value in read_items(file, chunk_size):
+        if key != 'objects':
+            details[key] = value
+            continue
+        id_, obj = value
+        object_type = registry.get(obj['type'])
+        kind = object_type.kind if object_type is not None else None
+        if kind == registry.ENTITY:
+            entity = factory.entity_factory.new(obj)
+            new_world.add_entity(entity)
+            if obj['type'] == 'player':
+                new_world.player = entity
+            links.add(entity, obj, object_type)
+        elif kind == registry.EVENT:
+            new_world.add_event(factory.event_factory.new(obj))
+            links.add(new_world.events[id_], obj, object_type)
+        elif kind is not None:
+            links.add(None, obj, object_type)
+        else:
+            raise AttributeError(  # the same error WorldFactory raises
+                "*** Error: World creator does not recognize type: "
+                + obj['type'] + " ***")
+
+    links.finish()
+    try:
+        new_world.details = world.WorldDetails(
+            details['name'], details['welcome'],
+            "You are playing this game!", details['version'],
+            details.get('verbs'))
+    except KeyError as err:
+        raise exceptions.InvalidParameterError(
+            "Error: world is missing " + str(err))
+    return new_world
+
+
+def load_path(path, chunk_size=CHUNK_SIZE):
+    """Loads a world from the .world file at a path. See load."""
+    with open(path) as file:
+        return load(file, chunk_size)
+
+
+def read_items(file, chunk_size=CHUNK_SIZE):
+    """Reads a .world json file a piece at a time.
+
+    Args:
+        file: A file with the world json opened for reading text.
+        chunk_size (int): Characters to read from the file at a time.
+
+    Yields:
+        (key, value) for each top level key of the world except objects,
+        and ('objects', (id, object)) for each of its objects.
+
+    Raises:
+        InvalidParameterError: If the file is not valid json.
+    """
+    return _Reader(file, chunk_size).items()
+
+
+class _Linker:
+    """Connects objects once everything they refer to has been read.
+
+    Entities and events can be referred to as soon as they are created.
+    Conditions and options can only be referred to once the objects they
+    refer to have been read, since they are created when the objects that
+    use them are connected.
+
+    Attributes:
+        world (World): The world being loaded.
+        linker (Linker): Links the objects. Its blueprints are the
+            conditions and options that can be referred to.
+        waiting (dict): Ids that have not been read yet to the pending
+            links waiting for them. A pending link is a list of the
+            object, its references, and how many ids it is still
+            waiting for.
+        contents (list): The entities whose items, or the room they
+            start in, are added when the file is read, with the
+            references to them, in the order of the file.
+    """
+
+    def __init__(self, new_world):
+        self.world = new_world
+        self.linker = linker.Linker(new_world)
+        self.waiting = {}
+        self.contents = []
+
+    def add(self, obj, blueprint, object_type):
+        """Adds a newly read object.
+
+        Args:
+            obj: The Entity or Event, or None for conditions and options.
+            blueprint (dict): The object's json blueprint.
+            object_type (ObjectType): The registered type of the object.
+        """
+        refs = _refs(blueprint, object_type)
+        missing = {id_ for id_ in _ref_ids(refs, object_type)
+                   if not self._ready(id_)}
+        if object_type.kind == registry.ENTITY:
+            refs = self._defer_contents(obj, refs)
+        if missing:
+            link = [obj, refs, len(missing)]
+            for id_ in missing:
+                self.waiting.setdefault(id_, []).append(link)
+        else:
+            self._link(obj, refs)
+        if obj is not None:
+            self._arrived(blueprint['id'])
+
+    def finish(self):
+        """Checks that every reference was found and adds entities to the
+        containers they start in.
+
+        Raises:
+            InvalidParameterError: Listing all the ids that were referred
+                to but never read.
+        """
+        if self.waiting:
+            raise exceptions.InvalidParameterError(
+                "Error: world refers to objects it does not have: "
+                + ', '.join(sorted(self.waiting)))
+        for obj, refs in self.contents:
+            self.linker.link(obj, refs)
+        self.contents = []
+        self.linker.check()
+        self.linker.blueprints = {}
+
+    def _defer_contents(self, entity, refs):
+        """Keeps the references that add entities to containers to link
+        in finish, and returns the rest."""
+        if not refs.get('items') and refs.get('start') is None:
+            return refs
+        self.contents.append((entity, {
+            'type': refs['type'], 'id': refs['id'], 'events': [],
+            'items': refs.get('items', []), 'start': refs.get('start')}))
+        return dict(refs, items=[], start=None)
+
+    def _ready(self, id_):
+        return (id_ in self.world.entities or id_ in self.world.events
+                or id_ in self.linker.blueprints)
+
+    def _arrived(self, id_):
+        for link in self.waiting.pop(id_, ()):
+            link[2] -= 1
+            if link[2] == 0:
+                self._link(link[0], link[1])
+
+    def _link(self, obj, refs):
+        if obj is not None:
+            self.linker.link(obj, refs)
+        else:
+            self.linker.blueprints[refs['id']] = refs
+            self._arrived(refs['id'])
+
+
+# Helpers ##############################################################
+
+def _refs(blueprint, object_type):
+    """The parts of a blueprint needed to connect it.
+
+    Conditions and options are kept whole since they are created from
+    their blueprints, and so are objects whose type links them itself.
+    """
+    if (object_type.kind not in (registry.ENTITY, registry.EVENT)
+            or object_type.link is not None):
+        return blueprint
+    refs = {'type': blueprint['type'], 'id': blueprint['id']}
+    for field in object_type.references:
+        if field in blueprint:
+            refs[field] = blueprint[field]
+    return refs
+
+
+def _ref_ids(refs, object_type):
+    for field in object_type.references:
+        value = refs.get(field)
+        if isinstance(value, dict):
+            yield value['id']
+        elif isinstance(value, list):
+            for item in value:
+                yield item['id']
+
+
+class _Reader:
+    """Reads the top level of a world json file a piece at a time.
+
+    Values of the top level keys are decoded whole except for the
+    objects map, whose members are decoded one at a time.
+    """
+
+    def __init__(self, file, chunk_size):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def items(self):
+        """Yields (key, value) for each top level key, and
+        ('objects', (id, object)) for each member of the objects map."""
+        self._next_of('{')
+        if self._peek() == '}':
+            return
+        while True:
+            key = self._value()
+            self._next_of(':')
+            if key == 'objects':
+                for member in self._members():
+                    yield key, member
+            else:
+                yield key, self._value()
+            if self._next_of(',}') == '}':
+                return
+
+    def _members(self):
+        self._next_of('{')
+        if self._peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self._value()
+            self._next_of(':')
+            yield key, self._value()
+            if self._next_of(',}') == '}':
+                return
+
+    def _value(self):
+        """Decodes the next json value, reading more of the file until
+        the whole value is in the buffer."""
+        self._skip()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as err:
+                if self.eof:
+                    raise exceptions.InvalidParameterError(
+                        "Error: world is not valid json: " + str(err))
+                # Read at least as much again as is buffered so large
+                # values are not decoded too many times.
+                self._read(max(self.chunk_size, len(self.buffer) - self.pos))
+                continue
+            # A number may continue into the next chunk
+            if (end == len(self.buffer) and not self.eof
+                    and not isinstance(value, (dict, list, str))):
+                self._read(self.chunk_size)
+                continue
+            self.pos = end
+            return value
+
+    def _next_of(self, chars):
+        found = self._peek()
+        if found is None or found not in chars:
+            raise exceptions.InvalidParameterError(
+                "Error: world is not valid json: expected one of " + chars)
+        self.pos += 1
+        return found
+
+    def _peek(self):
+        self._skip()
+        if self.pos >= len(self.buffer):
+            return None
+        return self.buffer[self.pos]
+
+    def _skip(self):
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer) or self.eof:
+                return
+            self._read(self.chunk_size)
+
+    def _read(self, size):
+        text = self.file.read(size)
+        self.eof = text == ''
+        # Drop what has been used so the buffer stays small
+        self.buffer = self.buffer[self.pos:] + text
+        self.pos = 0
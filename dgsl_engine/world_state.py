@@ -0,0 +1,251 @@
+"""Per session state for worlds that are shared between sessions.
+
+A loaded World can be used as a template that many sessions share. The
+parts of the world that never change during play (specs, descriptions,
+event messages, conditions and how things are connected) are only held
+once. The parts that change during play are declared as Fields. While a
+WorldState is in use, changes to fields are written to the state instead
+of the objects, and reads see the state's changes over the template
+values. So a session only costs as much memory as it has changed.
+
+Fields that hold a dict or list that is changed in place copy the
+template value into the state the first time they are written to (see
+Field.for_write).
+
+When no WorldState is in use fields read and write the objects directly,
+so a world that is only played by one game works the same as before.
+
+::
+
+    state = WorldState()
+    with using(state):
+        actions.move(item, player)  # only changes state
+
+Results that are worked out only from fields, like the results of
+conditions, can be kept with remember. The fields read while working a
+result out are recorded, and the result is kept until one of them is
+written to. Results are kept per WorldState, so sessions never see each
+other's results.
+"""
+import contextlib
+import contextvars
+
+_CURRENT = contextvars.ContextVar('dgsl_world_state', default=None)
+_READS = contextvars.ContextVar('dgsl_world_reads', default=None)
+_MISSING = object()
+
+
+class WorldState:
+    """The changes one session has made to a shared world.
+
+    Attributes:
+        changes (dict): The changed values. Keys are Fields and values
+            are dicts of changed objects to their values.
+        memo (Memo): The results remembered with this state in use.
+    """
+
+    def __init__(self):
+        self.changes = {}
+        self.memo = Memo()
+
+    def __len__(self):
+        """The number of values that have been changed."""
+        return sum(len(values) for values in self.changes.values())
+
+
+class Field:
+    """An attribute whose value can be changed per WorldState.
+
+    The template value is stored on the object under the name with an
+    underscore in front, so classes with slots must have a slot for it
+    (e.g. ``_hidden`` for a field named ``hidden``).
+
+    Attributes:
+        name (str): The name of the attribute.
+        copy: A function that copies the value before it is changed in
+            place. None if the value is only ever replaced.
+    """
+
+    def __init__(self, copy=None):
+        self.name = None
+        self.store = None
+        self.copy = copy
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.store = '_' + name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        reads = _READS.get()
+        if reads is not None:
+            reads.add((self, obj))
+        state = _CURRENT.get()
+        if state is not None:
+            values = state.changes.get(self)
+            if values is not None:
+                value = values.get(obj, _MISSING)
+                if value is not _MISSING:
+                    return value
+        return getattr(obj, self.store)
+
+    def __set__(self, obj, value):
+        state = _CURRENT.get()
+        if state is None:
+            setattr(obj, self.store, value)
+            if _TEMPLATE_MEMO.readers:
+                _TEMPLATE_MEMO.changed(self, obj)
+        else:
+            state.changes.setdefault(self, {})[obj] = value
+            if state.memo.readers:
+                state.memo.changed(self, obj)
+
+    def for_write(self, obj):
+        """Returns the value of the field to change in place.
+
+        If a WorldState is in use and the value has not been changed yet
+        the template value is copied into the state first.
+
+        Args:
+            obj: The object the field belongs to.
+
+        Returns:
+            The value that can be changed.
+        """
+        state = _CURRENT.get()
+        if state is None:
+            if _TEMPLATE_MEMO.readers:
+                _TEMPLATE_MEMO.changed(self, obj)
+            return getattr(obj, self.store)
+        if state.memo.readers:
+            state.memo.changed(self, obj)
+        values = state.changes.setdefault(self, {})
+        value = values.get(obj, _MISSING)
+        if value is _MISSING:
+            value = self.copy(getattr(obj, self.store))
+            values[obj] = value
+        return value
+
+    def __repr__(self):
+        return "<Field '{}'>".format(self.name)
+
+
+class Memo:
+    """Results remembered with remember, and the fields they were worked
+    out from.
+
+    Attributes:
+        results (dict): The remembered results by key.
+        reads (dict): The fields read to work out each result by key, as
+            sets of (Field, object) pairs.
+        readers (dict): The keys of the results that read each field.
+            Keys are Fields and values are dicts of objects to sets of
+            result keys.
+    """
+
+    def __init__(self):
+        self.results = {}
+        self.reads = {}
+        self.readers = {}
+
+    def __len__(self):
+        """The number of results remembered."""
+        return len(self.results)
+
+    def keep(self, key, result, reads):
+        """Remembers a result until one of the fields it read changes."""
+        self.results[key] = result
+        self.reads[key] = reads
+        for field, obj in reads:
+            self.readers.setdefault(field, {}).setdefault(obj, set()).add(key)
+
+    def changed(self, field, obj):
+        """Forgets the results that read a field of an object."""
+        objs = self.readers.get(field)
+        if objs is None:
+            return
+        keys = objs.pop(obj, None)
+        if keys is None:
+            return
+        if not objs:
+            del self.readers[field]
+        for key in keys:
+            self.results.pop(key, None)
+            self.reads.pop(key, None)
+
+    def __repr__(self):
+        return "<Memo - Results: {}>".format(len(self.results))
+
+
+_TEMPLATE_MEMO = Memo()
+
+
+def remember(key, compute, *args):
+    """Returns compute(*args), remembering the result until a field it
+    read changes.
+
+    Results are kept in the Memo of the WorldState in use, or of the
+    template values if none is. If one remembered result is worked out
+    from another, the first also depends on the fields the second read.
+    compute must only depend on fields, the arguments, and values that
+    do not change during play, otherwise it can call volatile.
+
+    Args:
+        key: Names the result. Must be hashable and is held on to, so it
+            is usually the object working the result out and its
+            arguments.
+        compute: A function that works out the result.
+        args: The arguments for compute.
+
+    Returns:
+        The result.
+    """
+    state = _CURRENT.get()
+    memo = _TEMPLATE_MEMO if state is None else state.memo
+    outer = _READS.get()
+    result = memo.results.get(key, _MISSING)
+    if result is not _MISSING:
+        if outer is not None:
+            outer.update(memo.reads[key])
+        return result
+
+    reads = set()
+    token = _READS.set(reads)
+    try:
+        result = compute(*args)
+    finally:
+        _READS.reset(token)
+    if outer is not None:
+        outer.update(reads)
+    if None not in reads:
+        memo.keep(key, result, reads)
+    return result
+
+
+def volatile():
+    """Keeps the result being worked out for remember from being
+    remembered, when it depends on something that is not a field."""
+    reads = _READS.get()
+    if reads is not None:
+        reads.add(None)
+
+
+def current():
+    """Returns the WorldState in use, or None if there is none."""
+    return _CURRENT.get()
+
+
+@contextlib.contextmanager
+def using(state):
+    """Context manager to use a WorldState.
+
+    Args:
+        state (WorldState): The state to use. None to use the template
+            values.
+    """
+    token = _CURRENT.set(state)
+    try:
+        yield state
+    finally:
+        _CURRENT.reset(token)
@@ -0,0 +1,290 @@
+"""World stores, which keep the blueprints of a world in a SQLite file.
+
+A LazyWorld only builds the rooms the player reaches, but with
+JsonBlueprints it still keeps the json of the whole world in memory. A
+world store keeps the blueprints on disk instead, so a world with
+millions of objects can be played with only the rooms in use in memory.
+A .world file is imported into a store once, and the store is opened as
+a LazyWorld each time the world is played::
+
+    world_store.import_world('my_world.world', 'my_world.dgsldb')
+    new_world = world_store.open_world('my_world.dgsldb')
+
+The store has three tables::
+
+    objects(id, kind, blueprint)    -- every object's json blueprint, in
+                                    -- the order of the .world file
+    contents(container, item)       -- the entities each entity starts
+                                    -- with, and the player's start room
+    details(key, value)             -- the world's name, welcome, etc.
+
+The store is only read while a world is played. The changes a game
+makes are kept in its WorldState and saved like those of any other
+world. The rooms a LazyWorld has built act as the cache in front of the
+store. Limit them with LazyWorld.max_regions and LazyWorld.idle_moves.
+"""
+import collections.abc
+import json
+import os
+import pathlib
+import sqlite3
+import tempfile
+from . import exceptions
+from . import registry
+from . import world
+from . import world_loader
+
+STORE_VERSION = 1
+
+_HEADER = b'SQLite format 3\0'
+
+# Ids are looked up this many at a time, below SQLite's variable limit.
+_BATCH_SIZE = 500
+
+_SCHEMA = """
+CREATE TABLE objects (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    blueprint TEXT NOT NULL
+);
+CREATE TABLE contents (
+    container TEXT NOT NULL,
+    item TEXT NOT NULL
+);
+CREATE INDEX contents_container ON contents (container);
+CREATE INDEX contents_item ON contents (item);
+CREATE TABLE details (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def import_world(world_path, store_path,
+                 chunk_size=world_loader.CHUNK_SIZE):
+    """Imports a .world file into a new world store.
+
+    The .world file is read a piece at a time (see world_loader), so it
+    never has to fit in memory. The store is written to a temporary file
+    and renamed into place, so an existing store at store_path is only
+    replaced once the import has worked. References are not checked, so
+    worlds should be checked by loading them normally first.
+
+    Args:
+        world_path (str): The path of the .world file.
+        store_path (str): The path to write the store to.
+        chunk_size (int): Characters to read from the file at a time.
+
+    Returns:
+        int: The number of objects imported.
+
+    Raises:
+        InvalidParameterError: If the file is not valid world json.
+    """
+    handle, temp_path = tempfile.mkstemp(
+        suffix='.tmp', dir=os.path.dirname(os.path.abspath(store_path)))
+    os.close(handle)
+    try:
+        connection = sqlite3.connect(temp_path)
+        try:
+            with open(world_path) as file:
+                count = _import(connection, file, chunk_size)
+        finally:
+            connection.close()
+        os.replace(temp_path, store_path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    return count
+
+
+def open_world(store_path):
+    """Opens a world store as a LazyWorld.
+
+    Args:
+        store_path (str): The path of the world store.
+
+    Returns:
+        LazyWorld: The new world.
+
+    Raises:
+        InvalidParameterError: If the file is not a world store made by
+            this version of the engine.
+    """
+    store = WorldStore(store_path)
+    new_world = world.LazyWorld(store, world.WorldFactory())
+    new_world.details = store.details()
+    return new_world
+
+
+def is_store(path):
+    """Checks if the file at the given path is a SQLite database, like a
+    world store.
+
+    Args:
+        path (str): The path to the file.
+
+    Returns:
+        bool: True if the file starts with the SQLite header.
+    """
+    with open(path, 'rb') as file:
+        return file.read(len(_HEADER)) == _HEADER
+
+
+class WorldStore:
+    """The blueprints of a LazyWorld, read from a world store.
+
+    Attributes:
+        player (str): The id of the player, or None.
+        entity_ids (Mapping): The blueprints of the entities by id.
+        event_ids (Mapping): The blueprints of the events by id.
+        conditions (Mapping): The blueprints of the conditions and
+            options by id.
+    """
+
+    def __init__(self, path):
+        if not is_store(path):
+            raise exceptions.InvalidParameterError(
+                "Error: not a world store: " + path)
+        uri = pathlib.Path(path).absolute().as_uri() + '?mode=ro'
+        self.connection = sqlite3.connect(uri, uri=True)
+        try:
+            self._details = dict(
+                (key, json.loads(value)) for key, value in
+                self.connection.execute('SELECT key, value FROM details'))
+        except sqlite3.DatabaseError:
+            self.connection.close()
+            raise exceptions.InvalidParameterError(
+                "Error: not a world store: " + path)
+        if self._details.get('store_version') != STORE_VERSION:
+            self.connection.close()
+            raise exceptions.InvalidParameterError(
+                "Error: {} was made by another version of the engine and "
+                "must be imported again".format(path))
+        self.player = self._details.get('player')
+        self.entity_ids = _Blueprints(self.connection, registry.ENTITY)
+        self.event_ids = _Blueprints(self.connection, registry.EVENT)
+        self.conditions = _Blueprints(self.connection, registry.CONDITION)
+
+    def details(self):
+        """Returns the WorldDetails of the world."""
+        return world.WorldDetails(
+            self._details['name'], self._details['welcome'],
+            "You are playing this game!", self._details['version'],
+            self._details.get('verbs'))
+
+    def get(self, id_):
+        """Returns the blueprint of an object."""
+        row = self.connection.execute(
+            'SELECT blueprint FROM objects WHERE id = ?', (id_,)).fetchone()
+        if row is None:
+            raise KeyError(id_)
+        return json.loads(row[0])
+
+    def entities(self, ids):
+        """Returns the blueprints of some entities in the order they are
+        in the world file."""
+        rows = []
+        for start in range(0, len(ids), _BATCH_SIZE):
+            batch = ids[start:start + _BATCH_SIZE]
+            rows.extend(self.connection.execute(
+                'SELECT rowid, blueprint FROM objects WHERE id IN ({})'
+                .format(', '.join('?' * len(batch))), batch))
+        rows.sort()
+        return [json.loads(blueprint) for _, blueprint in rows]
+
+    def parent(self, id_):
+        """Returns the id of the entity an entity starts in, or None."""
+        row = self.connection.execute(
+            'SELECT container FROM contents WHERE item = ? '
+            'ORDER BY rowid DESC LIMIT 1', (id_,)).fetchone()
+        return row[0] if row is not None else None
+
+    def contents(self, id_):
+        """Returns the ids of the entities an entity starts with."""
+        return [item for item, in self.connection.execute(
+            'SELECT item FROM contents WHERE container = ? ORDER BY rowid',
+            (id_,))]
+
+    def close(self):
+        """Closes the store. Worlds opened from it can not build any more
+        of themselves."""
+        self.connection.close()
+
+
+# Helpers ##############################################################
+
+class _Blueprints(collections.abc.Mapping):
+    """The blueprints of one kind of object in a world store."""
+
+    def __init__(self, connection, kind):
+        self.connection = connection
+        self.kind = kind
+
+    def __getitem__(self, id_):
+        row = self.connection.execute(
+            'SELECT blueprint FROM objects WHERE id = ? AND kind = ?',
+            (id_, self.kind)).fetchone()
+        if row is None:
+            raise KeyError(id_)
+        return json.loads(row[0])
+
+    def __contains__(self, id_):
+        return self.connection.execute(
+            'SELECT 1 FROM objects WHERE id = ? AND kind = ?',
+            (id_, self.kind)).fetchone() is not None
+
+    def __iter__(self):
+        for id_, in self.connection.execute(
+                'SELECT id FROM objects WHERE kind = ? ORDER BY rowid',
+                (self.kind,)):
+            yield id_
+
+    def __len__(self):
+        return self.connection.execute(
+            'SELECT COUNT(*) FROM objects WHERE kind = ?',
+            (self.kind,)).fetchone()[0]
+
+
+def _import(connection, file, chunk_size):
+    connection.executescript(_SCHEMA)
+    details = {'store_version': STORE_VERSION}
+    count = 0
+    with connection:
+        for key, value in world_loader.read_items(file, chunk_size):
+            if key != 'objects':
+                details[key] = value
+                continue
+            id_, obj = value
+            kind = registry.kind(obj['type'])
+            if kind == registry.OPTION:
+                kind = registry.CONDITION  # looked up with the conditions
+            elif kind is None:
+                raise AttributeError(  # the same error WorldFactory raises
+                    "*** Error: World creator does not recognize type: "
+                    + obj['type'] + " ***")
+            try:
+                connection.execute('INSERT INTO objects VALUES (?, ?, ?)',
+                                   (id_, kind, json.dumps(obj)))
+            except sqlite3.IntegrityError:
+                raise exceptions.InvalidParameterError(
+                    "Error: world has more than one object with id " + id_)
+            count += 1
+            if kind != registry.ENTITY:
+                continue
+            connection.executemany(
+                'INSERT INTO contents VALUES (?, ?)',
+                [(id_, ref['id']) for ref in obj.get('items', ())])
+            if obj['type'] == 'player':
+                connection.execute('INSERT INTO contents VALUES (?, ?)',
+                                   (obj['start']['id'], id_))
+                details['player'] = id_
+
+        for key in ('name', 'welcome', 'version'):
+            if key not in details:
+                raise exceptions.InvalidParameterError(
+                    "Error: world is missing '{}'".format(key))
+        connection.executemany(
+            'INSERT INTO details VALUES (?, ?)',
+            [(key, json.dumps(value)) for key, value in details.items()])
+    return count
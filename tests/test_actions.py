@@ -1,6 +1,10 @@
 import unittest
 from unittest import mock
 import dgsl_engine.actions as actions
+from dgsl_engine.entity_base import Entity
+from dgsl_engine.event_base import Event
+from dgsl_engine.interaction import Interaction, Option
+import dgsl_engine.prompts as prompts
 
 
 # Tests ################################################################
@@ -291,6 +295,28 @@ class TestUse(unittest.TestCase):
         result = self.action.take_action(self.entity, None)
         self.assertEqual(result, "You use a hat")
 
+    def test_interaction(self):
+        said = Event('said')
+        said.message = 'The mask fits.'
+        talk = Interaction('talk')
+        talk.break_out = True
+        talk.add(Option('Put it on', said))
+        mask = Entity('mask')
+        mask.spec.name = 'a blue mask'
+        mask.events.add('use', talk)
+
+        result = prompts.run(self.action.take_action_steps(mask, None),
+                             lambda prompt: 0)
+        self.assertTrue(result.endswith('\nThe mask fits.'))
+        self.assertNotIn('You use', result)
+
+        shown = []
+        with prompts.printing(shown.append):
+            result = prompts.run(self.action.take_action_steps(mask, None),
+                                 lambda prompt: 0)
+        self.assertEqual(result, 'You use a blue mask')
+        self.assertEqual(shown[-1], 'The mask fits.')
+
     def test_no_event(self):
         self.entity.events.has_event.return_value = False
 
@@ -524,10 +550,51 @@ class TestPlace(unittest.TestCase):
 
 # Action Factory #######################################################
 
+class TestCustom(unittest.TestCase):
+    def setUp(self):
+        self.entity = mock.MagicMock()
+        self.entity.spec.name = 'a button'
+        self.entity.events.execute.return_value = "Event executed"
+        self.player = mock.MagicMock()
+        self.action = actions.Custom(self.player, 'push')
+
+    def test_no_entity(self):
+        result = self.action.take_action(None, None)
+        self.assertEqual(result, 'Push What?')
+
+    def test_has_event(self):
+        self.entity.events.has_event.return_value = True
+        result = self.action.take_action(self.entity, None)
+        self.entity.events.execute.assert_called_with('push', self.player)
+        self.assertEqual(result, "Event executed")
+
+    def test_has_event_no_result(self):
+        self.entity.events.has_event.return_value = True
+        self.entity.events.execute.return_value = ''
+        result = self.action.take_action(self.entity, None)
+        self.assertEqual(result, "You push a button")
+
+    def test_no_event(self):
+        self.entity.events.has_event.return_value = False
+        result = self.action.take_action(self.entity, None)
+        self.assertEqual(result, "You can't push that")
+
+
 class TestActionFactory(unittest.TestCase):
     def setUp(self):
         self.fact = actions.ActionFactory()
 
+    def test_custom(self):
+        fact = actions.ActionFactory({'push': [], 'get': ['grab']})
+        result = fact.new('push', None)
+        self.assertIsInstance(result, actions.Custom)
+        self.assertEqual(result.verb, 'push')
+        self.assertIsInstance(fact.new('get', None), actions.Get)
+
+    def test_unknown(self):
+        result = self.fact.new('push', None)
+        self.assertIsInstance(result, actions.NullAction)
+
     def test_drop(self):
         result = self.fact.new('drop', None)
         self.assertIsInstance(result, actions.Drop)
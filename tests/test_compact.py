@@ -0,0 +1,37 @@
+import unittest
+from unittest import mock
+import dgsl_engine.compact as compact
+from dgsl_engine.entity_base import Entity
+from dgsl_engine.event_base import Event
+
+
+class TestCompact(unittest.TestCase):
+    def test_slots_compact(self):
+        with mock.patch('dgsl_engine.compact.COMPACT', True):
+            self.assertEqual(compact.slots('a', 'b'), ('a', 'b'))
+            self.assertEqual(compact.slots('a', base=True), ('a',))
+
+    def test_slots_not_compact(self):
+        with mock.patch('dgsl_engine.compact.COMPACT', False):
+            self.assertEqual(compact.slots('a', 'b'), ())
+            self.assertEqual(compact.slots('a', base=True),
+                             ('__dict__', '__weakref__'))
+
+    @unittest.skipUnless(compact.COMPACT, 'compact layout is off')
+    def test_no_dicts(self):
+        entity = Entity('id')
+        for obj in [entity, entity.spec, entity.states, entity.events,
+                    Event('id')]:
+            self.assertFalse(hasattr(obj, '__dict__'))
+
+    def test_subjects_created_when_needed(self):
+        event = Event('id')
+        self.assertIsNone(event._subjects)
+        event.register(Event('other'))
+        self.assertEqual(len(event.subjects), 1)
+
+
+# Main #################################################################
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+import json
+import os
+import tempfile
+import dgsl_engine.compiled_world as compiled_world
+import dgsl_engine.exceptions as exceptions
+import dgsl_engine.game_factory as game_factory
+import dgsl_engine.world as world
+
+test_world_path = 'tests/worlds/testing_ground'
+lethbridge_path = 'worlds/disaster_on_the_good_ship_lethbridge.world'
+
+
+def _load_json_world(path):
+    with open(path) as file:
+        return world.WorldFactory().new(json.load(file))
+
+
+# Tests ################################################################
+
+class TestCompiledWorld(unittest.TestCase):
+    def setUp(self):
+        self.world = _load_json_world(lethbridge_path)
+        self.compiled = compiled_world.decompile_world(
+            compiled_world.compile_world(self.world))
+
+    def test_same_objects(self):
+        self.assertEqual(list(self.world.entities),
+                         list(self.compiled.entities))
+        self.assertEqual(list(self.world.events),
+                         list(self.compiled.events))
+        self.assertEqual(self.compiled.details.name, self.world.details.name)
+
+    def test_player(self):
+        player = self.compiled.player
+        self.assertIs(player, self.compiled.entities[player.spec.id])
+        self.assertIs(player,
+                      player.owner.inventory.items[player.spec.id])
+        self.assertEqual(player.owner.spec.id,
+                         self.world.player.owner.spec.id)
+
+    def test_references_resolved(self):
+        for id_, entity in self.compiled.entities.items():
+            original = self.world.entities[id_]
+            self.assertEqual(repr(entity), repr(original))
+            self.assertEqual(entity.describe(), original.describe())
+            for verb, event in entity.events.events.items():
+                self.assertIs(event, self.compiled.events[event.id])
+                self.assertEqual(verb in original.events.events, True)
+
+    def test_owners_shared(self):
+        for entity in self.compiled.entities.values():
+            for item in getattr(entity, 'inventory', []):
+                self.assertIs(item.owner, entity)
+                self.assertIs(item, self.compiled.entities[item.spec.id])
+
+    def test_conditions(self):
+        for id_, event in self.compiled.events.items():
+            condition = getattr(event, 'condition', None)
+            if condition is not None:
+                self.assertIs(
+                    type(condition),
+                    type(self.world.events[id_].condition))
+
+    def test_bad_magic(self):
+        with self.assertRaises(exceptions.InvalidParameterError):
+            compiled_world.decompile_world(b'{"name": "world"}')
+
+    def test_bad_version(self):
+        data = compiled_world.compile_world(self.world)
+        idx = len(compiled_world.MAGIC)
+        data = data[:idx] + bytes([99]) + data[idx + 1:]
+        with self.assertRaises(exceptions.InvalidParameterError):
+            compiled_world.decompile_world(data)
+
+    def test_unknown_class(self):
+        data = compiled_world.compile_world(self.world)
+        data = data.replace(b'dgsl_engine.conditions.Question',
+                            b'dgsl_engine.conditions.Questiom')
+        with self.assertRaises(exceptions.InvalidParameterError):
+            compiled_world.decompile_world(data)
+
+
+class TestCompiledWorldFiles(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'testing_ground.cworld')
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_write_read(self):
+        compiled_world.write(_load_json_world(test_world_path), self.path)
+        self.assertTrue(compiled_world.is_compiled(self.path))
+        self.assertFalse(compiled_world.is_compiled(test_world_path))
+        new_world = compiled_world.read(self.path)
+        self.assertEqual(new_world.details.name, 'testing ground')
+
+    def test_game_factory_loads_compiled(self):
+        compiled_world.write(_load_json_world(test_world_path), self.path)
+        game = game_factory.GameFactory().new(self.path)
+        self.assertEqual(game.world.details.name, 'testing ground')
+        self.assertEqual(game.world.player.owner.spec.name, 'captains room')
+
+
+# Main #################################################################
+
+if __name__ == '__main__':
+    unittest.main()
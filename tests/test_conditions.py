@@ -3,7 +3,12 @@ import unittest
 from unittest import mock
 from io import StringIO
 from contextlib import redirect_stdout
+import dgsl_engine.actions as actions
 import dgsl_engine.conditions as conditions
+import dgsl_engine.world_state as world_state
+from dgsl_engine.entity_base import Entity
+from dgsl_engine.entity_containers import Container, Player, Room
+from dgsl_engine.equipment import Equipment
 
 
 class TestQuestion(unittest.TestCase):
@@ -64,35 +69,94 @@ class TestHasItem(unittest.TestCase):
 class TestProtected(unittest.TestCase):
     def setUp(self):
         self.protected = conditions.Protected(['cold', 'wind'])
-        self.hat = mock.MagicMock(protects=['cold', 'wind'], must_equip=True)
-        self.cap = mock.MagicMock(protects=[])
-        self.player = mock.MagicMock()
-        # Can be lists because equipped and inventory are iterable
-        self.player.equipped = []
-        self.player.inventory = []
+        self.hat = Equipment('hat')
+        self.hat.protects = ['cold', 'wind']
+        self.hat.slot = 'head'
+        self.cap = Equipment('cap')
+        self.cap.slot = 'head'
+        self.player = Player('player')
+        self.bag = Container('bag')
+        self.player.add(self.bag)
 
     def test_has_protection_equipped(self):
-        self.player.equipped.append(self.hat)
-        self.hat.equipped = True
+        self.player.equipped.equip(self.hat)
         result = self.protected.test(self.player)
         self.assertTrue(result)
 
-    @mock.patch('dgsl_engine.collectors.EntityTypeCollector')
-    def test_has_protection_carrying(self, mock_collector):
-        mock_collector.return_value.collect.return_value = [self.hat]
+    def test_has_protection_carrying(self):
         self.hat.must_equip = False
-        self.hat.equipped = False
+        self.bag.add(self.hat)
         result = self.protected.test(self.player)
         self.assertTrue(result)
 
-    @mock.patch('dgsl_engine.collectors.EntityTypeCollector')
-    def test_no_protection(self, mock_collector):
-        mock_collector.return_value.collect.return_value = [self.hat]
-        self.hat.equipped = False
-        self.player.equipped.append(self.cap)
+    def test_no_protection(self):
+        self.bag.add(self.hat)
+        self.player.equipped.equip(self.cap)
         result = self.protected.test(self.player)
         self.assertFalse(result)
 
+    def test_protection_counts(self):
+        self.hat.must_equip = False
+        self.player.add(self.hat)
+        self.assertEqual(self.player.inventory.protection,
+                         {'cold': 1, 'wind': 1})
+        self.player.inventory.remove('hat')
+        self.player.equipped.equip(self.hat)
+        self.assertEqual(self.player.inventory.protection, {})
+        self.assertEqual(self.player.equipped.protection,
+                         {'cold': 1, 'wind': 1})
+        self.player.equipped.equip(self.cap)
+        self.assertEqual(self.player.equipped.protection, {})
+        self.assertFalse(self.protected.test(self.player))
+
+    def test_bag_moves_protection(self):
+        self.hat.must_equip = False
+        self.bag.add(self.hat)
+        room = Room('room')
+        room.add(self.player)
+        actions.move(self.bag, room)
+        self.assertFalse(self.protected.test(self.player))
+        self.assertEqual(room.inventory.protection, {'cold': 1, 'wind': 1})
+
+
+class TestRemembered(unittest.TestCase):
+    def setUp(self):
+        self.player = Player('player')
+        self.bag = Container('bag')
+        self.coin = Entity('coin')
+        self.hat = Equipment('hat')
+        self.hat.protects = ['cold']
+        self.hat.slot = 'head'
+        self.room = Room('room')
+        for entity in [self.player, self.coin, self.hat]:
+            self.room.add(entity)
+        self.player.add(self.bag)
+        self.state = world_state.WorldState()
+
+    def test_has_item_changes_with_contents(self):
+        has_item = conditions.HasItem('coin')
+        with world_state.using(self.state):
+            self.assertFalse(has_item.test(self.player))
+            self.assertEqual(len(self.state.memo), 1)
+            actions.move(self.coin, self.bag)
+            self.assertTrue(has_item.test(self.player))
+            actions.move(self.coin, self.room)
+            self.assertFalse(has_item.test(self.player))
+
+    def test_protected_changes_with_equipment(self):
+        protected = conditions.Protected(['cold'])
+        with world_state.using(self.state):
+            actions.move(self.hat, self.bag)
+            self.assertFalse(protected.test(self.player))
+            self.bag.inventory.remove('hat')
+            self.player.equipped.equip(self.hat)
+            self.assertTrue(protected.test(self.player))
+            self.player.equipped.remove('head')
+            self.hat.must_equip = False
+            self.bag.add(self.hat)
+            self.assertTrue(protected.test(self.player))
+        self.assertEqual(len(self.state.memo.results), 0)
+
 
 class TestIsActive(unittest.TestCase):
     def test_is_active(self):
@@ -1,6 +1,7 @@
 import unittest
 import unittest.mock as mock
 import dgsl_engine.entity_containers as container
+import dgsl_engine.world_state as world_state
 
 # Constants ############################################################
 
@@ -53,6 +54,16 @@ class TestContainer(unittest.TestCase):
         self.assertEqual(self.container.describe(),
                          "a small golden box\nIt holds a leather pouch")
 
+    def test_describe_changes_with_states(self):
+        self.container.spec.description = 'a small golden box'
+        self.entity.spec.name = 'a leather pouch'
+        self.container.add(self.entity)
+        with world_state.using(world_state.WorldState()):
+            self.container.describe()
+            self.container.states.toggle_active()
+            self.assertEqual(self.container.describe(),
+                             'a small golden box')
+
     def test_accept(self):
         visitor = mock.MagicMock()
         self.container.accept(visitor)
@@ -93,6 +104,25 @@ class TestRoom(unittest.TestCase):
         self.room.add(self.entity)
         self.assertFalse(self.room.add(self.entity))
 
+    def test_describe(self):
+        self.room.spec.description = 'a dusty cellar'
+        self.entity.spec.name = 'a crate'
+        player = container.Player('player')
+        self.room.add(self.entity)
+        self.room.add(player)
+        self.assertEqual(self.room.describe(),
+                         "a dusty cellar\n\nThere is ...\n   a crate")
+
+    def test_describe_remembered(self):
+        state = world_state.WorldState()
+        with world_state.using(state):
+            first = self.room.describe()
+            self.assertIs(self.room.describe(), first)
+            self.room.add(self.entity)
+            self.assertNotEqual(self.room.describe(), first)
+            self.room.inventory.remove(self.entity.spec.id)
+            self.assertEqual(self.room.describe(), first)
+
     def test_accept(self):
         visitor = mock.MagicMock()
         self.room.accept(visitor)
@@ -1,10 +1,39 @@
 import unittest
+import dgsl_engine.conditions as conditions
+import dgsl_engine.event_composites as event_composites
+from dgsl_engine.event_base import Event
 from dgsl_engine.event_factory import EventFactory
 import dgsl_engine.exceptions as exceptions
+from dgsl_engine.interaction import Interaction, Option
+import dgsl_engine.prompts as prompts
 from . import json_objects as objects
 from . import fakes
 
 
+# Helpers ##############################################################
+
+def chain(depth):
+    """Returns groups nested depth deep around an event."""
+    root = Event('leaf')
+    root.message = 'Leaf.'
+    for idx in range(depth):
+        group = event_composites.GroupEvent('group{}'.format(idx))
+        group.add(root)
+        root = group
+    return root
+
+
+def talk(name):
+    """Returns an interaction with one option that ends it."""
+    said = Event(name + '_said')
+    said.message = '{} says hi.'.format(name)
+    talk_to = Interaction(name)
+    talk_to.message = 'Talk to {}.'.format(name)
+    talk_to.break_out = True
+    talk_to.add(Option('Hi', said))
+    return talk_to
+
+
 # Tests ################################################################
 
 class TestGroupEvent(unittest.TestCase):
@@ -150,6 +179,106 @@ class TestConditionalEvent(unittest.TestCase):
         self.assertEqual(visitor.result, self.conditional.id)
 
 
+class TestRunSteps(unittest.TestCase):
+    def test_deep_nesting(self):
+        root = chain(5000)
+        limits = event_composites.Limits(max_depth=6000)
+        with event_composites.limited(limits):
+            self.assertEqual(root.execute(None), 'Leaf.')
+
+    def test_depth_limit(self):
+        with self.assertRaises(exceptions.EventLimitError) as caught:
+            chain(event_composites.MAX_DEPTH + 1).execute(None)
+        self.assertIn('nested more than 100 deep: group100 -> group99',
+                      str(caught.exception))
+        self.assertIn('... -> group4 -> group3', str(caught.exception))
+        self.assertEqual(chain(event_composites.MAX_DEPTH).execute(None),
+                         'Leaf.')
+
+    def test_cycle(self):
+        first = event_composites.GroupEvent('first')
+        second = event_composites.ConditionalEvent('second')
+        second.condition = conditions.Question('Again?', 'yes')
+        second.success = first
+        first.add(Event('leaf'))
+        first.add(second)
+        with self.assertRaises(exceptions.EventLimitError) as caught:
+            prompts.run(first.execute_steps(None), lambda prompt: 'yes')
+        self.assertEqual(str(caught.exception),
+                         "Error: event 'first' runs itself: "
+                         "first -> second -> first")
+
+    def test_step_limit(self):
+        wide = event_composites.GroupEvent('wide')
+        for idx in range(20):
+            wide.add(Event('event{}'.format(idx)))
+        with event_composites.limited(event_composites.Limits(max_steps=10)):
+            with self.assertRaises(exceptions.EventLimitError) as caught:
+                wide.execute(None)
+        self.assertEqual(str(caught.exception),
+                         "Error: more than 10 events run in one turn, "
+                         "stopped in event 'wide'")
+        self.assertEqual(wide.execute(None), '')
+
+    def test_turn_not_current_while_asking(self):
+        asking = event_composites.ConditionalEvent('asking')
+        asking.condition = conditions.Question('Password?', 'yes')
+        asking.success = Event('open')
+        asking.success.message = 'Open.'
+        steps = chain(3)
+        steps.events[0].events[0].events[0] = asking
+        steps = steps.execute_steps(None)
+        prompt = steps.send(None)
+        self.assertEqual(prompt.text, 'Password?')
+        self.assertIsNone(event_composites._TURN.get())
+        with self.assertRaises(StopIteration) as stop:
+            steps.send('yes')
+        self.assertEqual(stop.exception.value, 'Open.')
+
+    def test_results_shown_before_later_prompts(self):
+        both = event_composites.GroupEvent('both')
+        both.message = 'Both.'
+        both.add(talk('ann'))
+        both.add(talk('bob'))
+        asked = []
+        result = prompts.run(both.execute_steps(None),
+                             lambda prompt: asked.append(prompt.text) or 0)
+        line = '\n' + '-' * 50
+        self.assertEqual(asked, ['Both.\nTalk to ann.\n',
+                                 line + '\nann says hi.\nTalk to bob.\n'])
+        self.assertEqual(result, line + '\nbob says hi.')
+
+    def test_results_returned_at_end_on_console(self):
+        both = event_composites.GroupEvent('both')
+        both.message = 'Both.'
+        both.add(talk('ann'))
+        both.add(talk('bob'))
+        shown = []
+        asked = []
+        with prompts.printing(shown.append):
+            result = prompts.run(
+                both.execute_steps(None),
+                lambda prompt: asked.append(prompt.text) or 0)
+        self.assertEqual(asked, [None, None])
+        self.assertEqual(shown, ['Talk to ann.', '', '\n' + '-' * 50,
+                                 'ann says hi.', 'Talk to bob.', '',
+                                 '\n' + '-' * 50, 'bob says hi.'])
+        self.assertEqual(result, 'Both.')
+
+    def test_subclass_runs_own_execute(self):
+        class Loud(event_composites.GroupEvent):
+            def execute_steps(self, affected):
+                result = yield from super(Loud, self).execute_steps(affected)
+                return result.upper()
+
+        loud = Loud('loud')
+        loud.add(Event('leaf'))
+        loud.events[0].message = 'Leaf.'
+        root = event_composites.GroupEvent('root')
+        root.add(loud)
+        self.assertEqual(root.execute(None), 'LEAF.')
+
+
 # Main #################################################################
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,257 @@
+import io
+import json
+import random
+import unittest
+from unittest import mock
+import dgsl_engine.compiled_world as compiled_world
+import dgsl_engine.conditions as conditions
+import dgsl_engine.event_composites as event_composites
+import dgsl_engine.event_vm as event_vm
+import dgsl_engine.exceptions as exceptions
+import dgsl_engine.prompts as prompts
+import dgsl_engine.world as world
+import dgsl_engine.world_generator as world_generator
+import dgsl_engine.world_state as world_state
+from dgsl_engine.event_base import Event
+from dgsl_engine.event_composites import (ConditionalEvent, GroupEvent,
+                                          OrderedGroup)
+
+
+# Helpers ##############################################################
+
+MESSAGES = [None, '', ' ', '\n', 'First.', 'Second.\n']
+
+
+def generated_json(seed, rooms=3, event_depth=4, event_fan_out=3):
+    file = io.StringIO()
+    world_generator.WorldGenerator(
+        rooms=rooms, depth=1, fan_out=2, event_depth=event_depth,
+        event_fan_out=event_fan_out, seed=seed).write(file)
+    return json.loads(file.getvalue())
+
+
+def vary(game_world, seed):
+    """Gives the events of a world random messages, once flags, and
+    some questions, the same way for the same seed."""
+    rng = random.Random(seed)
+    for id_ in sorted(game_world.events):
+        event = game_world.events[id_]
+        event.message = rng.choice(MESSAGES)
+        event.only_once = rng.random() < 0.3
+        if isinstance(event, ConditionalEvent) and rng.random() < 0.3:
+            event.condition = conditions.Question('Password?', 'yes')
+            if rng.random() < 0.3:
+                event.failure = None
+
+
+def snapshot(game_world):
+    entities = {}
+    for id_, entity in game_world.entities.items():
+        owner = entity.owner.spec.id if entity.owner is not None else None
+        states = entity.states
+        entities[id_] = (owner, states.active, states.obtainable,
+                         states.hidden)
+    events = {id_: (event.is_done, getattr(event, 'idx', None),
+                    getattr(event, 'passed', None))
+              for id_, event in game_world.events.items()}
+    return entities, events
+
+
+def play(game_world, seed, turns):
+    """Runs random events of a world and returns what happened in each
+    turn: the event, its result, the prompts asked, and the state after.
+    """
+    rng = random.Random(seed)
+    player = game_world.player
+    roots = sorted((id_, verb) for id_, entity in game_world.entities.items()
+                   for verb in entity.events.events)
+    asked = []
+
+    def ask(prompt):
+        asked.append((prompt.text, prompt.choices))
+        if prompt.is_menu():
+            return rng.randrange(-1, len(prompt.choices) + 1)
+        return rng.choice(['yes', 'no'])
+
+    log = []
+    for _ in range(turns):
+        id_, verb = rng.choice(roots)
+        del asked[:]
+        steps = game_world.entities[id_].events.execute_steps(verb, player)
+        try:
+            result = prompts.run(steps, ask)
+        except Exception as err:  # pylint: disable=broad-except
+            result = type(err)
+        log.append((id_, verb, result, list(asked), snapshot(game_world)))
+    return log
+
+
+def programs(game_world):
+    return [event.program for event in game_world.events.values()
+            if isinstance(getattr(event, 'program', None),
+                          event_vm.Program)]
+
+
+def group(id_, *events, message=None):
+    new = GroupEvent(id_)
+    new.message = message
+    for event in events:
+        new.add(event)
+    return new
+
+
+def event(id_, message=None, once=False):
+    new = Event(id_)
+    new.message = message
+    new.only_once = once
+    return new
+
+
+# Tests ################################################################
+
+class TestDifferential(unittest.TestCase):
+    """Plays the same worlds with and without programs and checks that
+    every result, prompt, and change is the same."""
+
+    def compare(self, world_json, seed, turns=150, state=False):
+        tree = world.WorldFactory().new(world_json)
+        compiled = world.WorldFactory().new(world_json)
+        vary(tree, seed)
+        vary(compiled, seed)
+        event_vm.compile_world(compiled)
+
+        with world_state.using(world_state.WorldState() if state else None):
+            expected = play(tree, seed, turns)
+        with world_state.using(world_state.WorldState() if state else None):
+            actual = play(compiled, seed, turns)
+
+        for turn, (want, got) in enumerate(zip(expected, actual)):
+            self.assertEqual(want, got, 'turn {}'.format(turn))
+        self.assertTrue(programs(compiled))
+        self.assertFalse(programs(tree))
+
+    def test_generated_worlds(self):
+        for seed in range(3):
+            with self.subTest(seed=seed):
+                self.compare(generated_json(seed), seed)
+
+    def test_generated_worlds_with_state(self):
+        self.compare(generated_json(10), 10, state=True)
+
+    def test_deep_events(self):
+        self.compare(generated_json(20, rooms=1, event_depth=9,
+                                    event_fan_out=2), 20, turns=60)
+
+    def test_small_programs(self):
+        with mock.patch.object(event_vm, 'MAX_INSTRUCTIONS', 8):
+            self.compare(generated_json(30), 30)
+
+
+class TestEventVM(unittest.TestCase):
+    def test_nested_groups_in_one_program(self):
+        inner = event('inner', 'Inner.')
+        root = inner
+        for depth in range(50):
+            root = group('group{}'.format(depth), root,
+                         event('leaf{}'.format(depth), 'Leaf.'),
+                         message=None if depth % 2 else 'Group.')
+        expected = root.execute(None)
+
+        program = event_vm.compile_event(root)
+        self.assertNotIn(event_vm.RUN, [op for op, _, _ in program.code])
+        root.program = program
+        self.assertEqual(root.execute(None), expected)
+
+    def test_ordered_message_before_results(self):
+        ordered = OrderedGroup('ordered')
+        ordered.message = 'Ordered.'
+        ordered.add(event('first', 'First.'))
+        ordered.add(event('second', 'Second.'))
+        ordered.program = event_vm.compile_event(ordered)
+        results = [ordered.execute(None) for _ in range(3)]
+        self.assertEqual(results, ['Ordered.\nFirst.', 'Ordered.\nSecond.',
+                                   'Ordered.\nSecond.'])
+
+    def test_results_shown_before_later_prompts(self):
+        asking = ConditionalEvent('asking')
+        asking.message = 'Asked.'
+        asking.condition = conditions.Question('Password?', 'yes')
+        asking.success = event('open', 'Open.')
+        ordered = OrderedGroup('ordered')
+        ordered.message = 'Ordered.'
+        ordered.add(group('inner', event('first', 'First.'), asking))
+        root = group('root', ordered, event('last', 'Last.'),
+                     message='Root.')
+        root.program = event_vm.compile_event(root)
+        asked = []
+        result = prompts.run(
+            root.execute_steps(None),
+            lambda prompt: asked.append(prompt.text) or 'yes')
+        self.assertEqual(asked, ['Root.\nFirst.\nPassword?'])
+        self.assertEqual(result, 'Ordered.\nAsked.\nOpen.\nLast.')
+
+    def test_limits_count_instructions_run(self):
+        asking = ConditionalEvent('asking')
+        asking.condition = conditions.Question('Password?', 'yes')
+        asking.success = group('big', *[event('event{}'.format(idx), 'E.')
+                                        for idx in range(50)])
+        asking.program = event_vm.compile_event(asking)
+        self.assertGreater(len(asking.program.code), 50)
+        with event_composites.limited(event_composites.Limits(max_steps=10)):
+            result = prompts.run(asking.execute_steps(None),
+                                 lambda prompt: 'no')
+            self.assertEqual(result, '')
+            with self.assertRaises(exceptions.EventLimitError):
+                prompts.run(asking.execute_steps(None), lambda prompt: 'yes')
+
+    def test_cycle_runs_event(self):
+        root = group('root', event('leaf', 'Leaf.'))
+        root.events.append(root)
+        program = event_vm.compile_event(root)
+        self.assertIn((event_vm.RUN, root, None), program.code)
+
+    def test_subclass_runs_event(self):
+        class Loud(GroupEvent):
+            pass
+
+        loud = Loud('loud')
+        root = group('root', loud)
+        program = event_vm.compile_event(root)
+        self.assertIn((event_vm.RUN, loud, None), program.code)
+        with self.assertRaises(exceptions.InvalidParameterError):
+            event_vm.compile_event(loud)
+
+    def test_compiled_on_first_execute(self):
+        root = group('root', event('leaf', 'Leaf.'))
+        event_vm.prepare(root)
+        self.assertIs(root.program, event_vm.PENDING)
+        self.assertEqual(root.execute(None), 'Leaf.')
+        self.assertIsInstance(root.program, event_vm.Program)
+        self.assertIn('MESSAGE leaf', root.program.listing())
+
+    def test_compiled_world_drops_programs(self):
+        new_world = world.WorldFactory().new(generated_json(0))
+        event_vm.compile_world(new_world)
+        loaded = compiled_world.decompile_world(
+            compiled_world.compile_world(new_world))
+        self.assertTrue(all(getattr(event, 'program', None) is None
+                            for event in loaded.events.values()))
+
+    def test_lazy_world_prepares_built_events(self):
+        lazy = world.WorldFactory(lazy=True).new(generated_json(0))
+        event_vm.compile_world(lazy)
+        self.assertTrue(lazy.compile_events)
+        for id_ in list(lazy._blueprints.entity_ids):
+            lazy.entities[id_]  # pylint: disable=pointless-statement
+        composites = [event for event in lazy.events.values()
+                      if type(event) in (GroupEvent, OrderedGroup,
+                                         ConditionalEvent)]
+        self.assertTrue(composites)
+        for composite in composites:
+            self.assertIs(composite.program, event_vm.PENDING)
+
+
+# Main #################################################################
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,16 @@
 import unittest
 import unittest.mock as mock
+import dgsl_engine.actions as actions
+import dgsl_engine.collectors as collectors
+import dgsl_engine.conditions as conditions
+import dgsl_engine.event_base as event_base
+import dgsl_engine.event_composites as event_composites
 import dgsl_engine.game as game
+import dgsl_engine.interaction as interaction
 import dgsl_engine.world as world
 import dgsl_engine.user_input as user_input
-from dgsl_engine.entity_containers import Player, Room
+from dgsl_engine.entity_base import Entity
+from dgsl_engine.entity_containers import Npc, Player, Room
 from . import fakes
 
 input_text = ['get test entity', 'drop test entity', 'dance', 'quit']
@@ -41,6 +48,133 @@ class TestGame(unittest.TestCase):
         self.assertEqual(out, expected_out + "\n".join(other_results) + '\n')
 
 
+class TestGameStep(unittest.TestCase):
+    def setUp(self):
+        self.world = world.World()
+        self.room = Room('room')
+        self.room.spec.name = 'a room'
+        self.world.player = Player('player')
+        self.room.add(self.world.player)
+
+        self.npc = Npc('npc')
+        self.npc.spec.name = 'an old man'
+        self.room.add(self.npc)
+        talk = interaction.Interaction('talk')
+        talk.message = 'The old man looks up'
+        talk.end_message = 'Goodbye'
+        hello = event_base.Event('hello')
+        hello.message = 'Hello there'
+        talk.add(interaction.Option('Say hello', hello))
+        self.npc.events.add('talk', talk)
+
+        for id_ in ['coin', 'nugget']:
+            gold = Entity(id_)
+            gold.spec.name = 'gold ' + id_
+            gold.states.obtainable = True
+            self.room.add(gold)
+
+        self.door = Entity('door')
+        self.door.spec.name = 'a locked door'
+        locked = event_composites.ConditionalEvent('locked')
+        locked.condition = conditions.Question('Password?', 'swordfish')
+        locked.success = event_base.Event('open')
+        locked.success.message = 'The door opens'
+        locked.failure = event_base.Event('closed')
+        locked.failure.message = 'Nothing happens'
+        self.door.events.add('use', locked)
+        self.room.add(self.door)
+
+        resolver = actions.ActionResolver(
+            collectors.EntityCollectorFactory(), user_input.MenuFactory(),
+            actions.ActionFactory())
+        self.game = game.Game(self.world, user_input.Parser(), resolver)
+        self.game._in = None
+        self.game._out = None
+
+    def test_start(self):
+        self.assertEqual(self.game.start(), self.room.describe())
+
+    def test_command(self):
+        self.game.start()
+        turn = self.game.step('look old man')
+        self.assertEqual(turn.output, 'You see ' + self.npc.describe())
+        self.assertIsNone(turn.prompt)
+        self.assertFalse(turn.over)
+
+    def test_interaction(self):
+        self.game.start()
+        turn = self.game.step('talk old man')
+        self.assertEqual(turn.output, 'The old man looks up\n')
+        self.assertEqual(turn.prompt.choices, ['Say hello'])
+
+        turn = self.game.step('1')
+        self.assertEqual(
+            turn.output,
+            '\n--------------------------------------------------\n'
+            'Hello there\n')
+        self.assertEqual(turn.prompt.choices, ['Say hello'])
+
+        turn = self.game.step('5')
+        self.assertEqual(
+            turn.output,
+            '\n--------------------------------------------------\n'
+            'Not a valid choice!\n')
+        self.assertIsNotNone(turn.prompt)
+
+        turn = self.game.step('2')
+        self.assertEqual(
+            turn.output,
+            '\n--------------------------------------------------\n'
+            '\nGoodbye')
+        self.assertIsNone(turn.prompt)
+
+    def test_choose_entity(self):
+        self.game.start()
+        turn = self.game.step('get gold')
+        self.assertEqual(turn.prompt.choices, ['gold coin', 'gold nugget'])
+        turn = self.game.step('2')
+        self.assertEqual(turn.output, '\nYou take gold nugget')
+        self.assertEqual(self.world.player.get('nugget').spec.id, 'nugget')
+
+    def test_question(self):
+        self.game.start()
+        turn = self.game.step('use door')
+        self.assertEqual(turn.output, 'Password?')
+        self.assertFalse(turn.prompt.is_menu())
+        self.assertEqual(self.game.step('open sesame').output,
+                         'Nothing happens')
+        self.game.step('use door')
+        self.assertEqual(self.game.step(' Swordfish ').output,
+                         'The door opens')
+
+    def test_quit(self):
+        self.game.start()
+        turn = self.game.step('quit')
+        self.assertEqual(turn.prompt.choices, ['Quit'])
+        turn = self.game.step('2')
+        self.assertEqual(turn.output, '\nCancelled')
+        self.assertFalse(turn.over)
+        self.game.step('quit')
+        turn = self.game.step('1')
+        self.assertEqual(turn.output, '\nQuitting ...')
+        self.assertTrue(turn.over)
+
+    def test_event_limit(self):
+        loop = event_composites.GroupEvent('loop')
+        loop.events.append(loop)
+        lever = Entity('lever')
+        lever.spec.name = 'a lever'
+        lever.events.add('use', loop)
+        self.room.add(lever)
+        self.game.start()
+        turn = self.game.step('use lever')
+        self.assertEqual(turn.output,
+                         "Error: event 'loop' runs itself: loop -> loop")
+        self.assertFalse(turn.over)
+        self.assertEqual(self.game.step('look old man').output,
+                         'You see ' + self.npc.describe())
+
+
 # Main #################################################################
 
 if __name__ == '__main__':
@@ -1,4 +1,5 @@
 import unittest
+import dgsl_engine.compiled_world as compiled_world
 import dgsl_engine.game_factory as factory
 
 
@@ -20,6 +21,9 @@ class TestGameFactory(unittest.TestCase):
         path = 'some_fun_world.world'
         self.assertEqual(factory.name_to_path(name), path)
 
+    def test_compiled_header(self):
+        self.assertEqual(factory._COMPILED_HEADER, compiled_world.MAGIC)
+
 # Main #################################################################
 
 
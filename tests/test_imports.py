@@ -0,0 +1,80 @@
+import os
+import subprocess
+import sys
+import unittest
+import dgsl_engine
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# Helpers ##############################################################
+
+def loaded_after(statement):
+    """Runs a statement in a new python and returns the modules loaded."""
+    code = statement + "\nimport sys\nprint(' '.join(sys.modules))"
+    out = subprocess.run([sys.executable, '-c', code], cwd=ROOT,
+                         stdout=subprocess.PIPE, check=True,
+                         universal_newlines=True)
+    return set(out.stdout.split())
+
+
+def submodule_names():
+    """Returns the names of the package's modules, except __main__."""
+    return sorted(
+        name[:-3] for name in os.listdir(os.path.join(ROOT, 'dgsl_engine'))
+        if name.endswith('.py') and not name.startswith('_'))
+
+
+# Tests ################################################################
+
+class TestImports(unittest.TestCase):
+    def test_package_loads_nothing(self):
+        loaded = loaded_after('import dgsl_engine')
+        self.assertEqual({name for name in loaded
+                          if name.startswith('dgsl_engine.')}, set())
+
+    def test_submodule_attributes(self):
+        loaded = loaded_after('import dgsl_engine\n'
+                              'assert dgsl_engine.world.World\n'
+                              'assert "world" in dir(dgsl_engine)')
+        self.assertIn('dgsl_engine.world', loaded)
+
+    def test_submodules_listed(self):
+        self.assertEqual(sorted(dgsl_engine._SUBMODULES), submodule_names())
+
+    def test_every_submodule_attribute(self):
+        names = submodule_names()
+        loaded = loaded_after('import dgsl_engine\n'
+                              'for name in {!r}:\n'
+                              '    getattr(dgsl_engine, name)\n'
+                              '    assert name in dir(dgsl_engine)'
+                              .format(names))
+        for name in names:
+            self.assertIn('dgsl_engine.' + name, loaded)
+
+    def test_cli_loads_commands_lazily(self):
+        loaded = loaded_after('import dgsl_engine.__main__')
+        for name in ['asyncio', 'sqlite3', 'dgsl_engine.server',
+                     'dgsl_engine.world_store',
+                     'dgsl_engine.world_generator',
+                     'dgsl_engine.journal', 'dgsl_engine.world_cache']:
+            self.assertNotIn(name, loaded)
+
+    def test_play_loads_options_lazily(self):
+        loaded = loaded_after(
+            'import dgsl_engine.game\n'
+            'dgsl_engine.game.Game.run = lambda self: None\n'
+            'from dgsl_engine.__main__ import main\n'
+            'main(["play", "worlds/disaster_on_the_good_ship_lethbridge'
+            '.world", "--no-cache"])')
+        self.assertIn('dgsl_engine.world_loader', loaded)
+        for name in ['dgsl_engine.compiled_world', 'dgsl_engine.event_vm',
+                     'dgsl_engine.journal', 'dgsl_engine.saves',
+                     'dgsl_engine.world_cache']:
+            self.assertNotIn(name, loaded)
+
+
+# Main #################################################################
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+import os
+import tempfile
+import unittest
+import dgsl_engine.__main__ as main_module
+import dgsl_engine.exceptions as exceptions
+import dgsl_engine.game_factory as game_factory
+import dgsl_engine.journal as journal
+
+lethbridge_path = 'worlds/disaster_on_the_good_ship_lethbridge.world'
+
+
+class TestJournal(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'game.journal')
+        self.factory = game_factory.GameFactory()
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def new_game(self, **kwargs):
+        game = self.factory.new(lethbridge_path)
+        game.start()
+        game_journal = journal.Journal(self.path, **kwargs)
+        replayed = game_journal.attach(game)
+        return game, game_journal, replayed
+
+    def records(self):
+        with open(self.path, 'rb') as file:
+            return journal.read_records(file.read())
+
+    def test_new_journal_has_checkpoint(self):
+        game, game_journal, replayed = self.new_game()
+        self.assertEqual(replayed, 0)
+        self.assertIs(game.journal, game_journal)
+        records = self.records()
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0][0], b'C')
+
+    def test_recover(self):
+        game, game_journal, _ = self.new_game()
+        game.step('get medkit')
+        game.step('quit')
+        game.step('2')
+        game.step('drop medkit')
+        expected = game.step('look').output
+        game_journal.flush()
+
+        recovered, _, replayed = self.new_game()
+        self.assertEqual(replayed, 5)
+        self.assertEqual(recovered.step('look').output, expected)
+
+    def test_unflushed_records_lost(self):
+        game, _, _ = self.new_game(batch_size=100, flush_interval=100)
+        game.step('get medkit')
+        recovered, _, replayed = self.new_game()
+        self.assertEqual(replayed, 0)
+        self.assertIn('a medkit', recovered.step('look').output)
+
+    def test_fsync_always_writes_every_record(self):
+        game, _, _ = self.new_game(fsync=journal.FSYNC_ALWAYS,
+                                   batch_size=100, flush_interval=100)
+        game.step('get medkit')
+        self.assertEqual(len(self.records()), 2)
+
+    def test_partial_turn_cut(self):
+        game, game_journal, _ = self.new_game()
+        game.step('get medkit')
+        game.step('quit')
+        game_journal.flush()
+        size = os.path.getsize(self.path)
+
+        recovered, _, replayed = self.new_game()
+        self.assertEqual(replayed, 1)
+        self.assertLess(os.path.getsize(self.path), size)
+        self.assertIsNone(recovered.step('inventory').prompt)
+
+    def test_torn_record_cut(self):
+        game, game_journal, _ = self.new_game()
+        game.step('get medkit')
+        game.step('inventory')
+        game_journal.flush()
+        with open(self.path, 'r+b') as file:
+            file.truncate(os.path.getsize(self.path) - 2)
+
+        _, _, replayed = self.new_game()
+        self.assertEqual(replayed, 1)
+        self.assertEqual(len(self.records()), 2)
+
+    def test_checkpoint_replaces_records(self):
+        game, game_journal, _ = self.new_game(checkpoint_every=2)
+        game.step('get medkit')
+        game.step('inventory')
+        game.step('look')
+        game_journal.flush()
+        records = self.records()
+        self.assertEqual([kind for kind, _, _ in records], [b'C', b'T'])
+
+        recovered, _, replayed = self.new_game()
+        self.assertEqual(replayed, 1)
+        self.assertNotIn('a medkit', recovered.step('look').output)
+
+    def test_close(self):
+        game, game_journal, _ = self.new_game()
+        game_journal.close()
+        self.assertIsNone(game.journal)
+        game.step('look')
+        self.assertEqual(len(self.records()), 1)
+
+    def test_fsync_choices(self):
+        self.assertEqual(main_module._FSYNC_CHOICES,
+                         [journal.FSYNC_ALWAYS, journal.FSYNC_BATCH,
+                          journal.FSYNC_NEVER])
+
+    def test_bad_fsync(self):
+        with self.assertRaises(exceptions.InvalidParameterError):
+            journal.Journal(self.path, fsync='sometimes')
+
+    def test_not_a_journal(self):
+        with open(self.path, 'wb') as file:
+            file.write(b'not a journal')
+        with self.assertRaises(exceptions.InvalidParameterError):
+            self.new_game()
+
+    def test_game_without_state(self):
+        game = self.factory.new(lethbridge_path)
+        game.state = None
+        with self.assertRaises(exceptions.InvalidParameterError):
+            journal.Journal(self.path).attach(game)
+
+
+# Main #################################################################
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,12 +1,13 @@
 import unittest
-import dgsl_engine.visitors as visitor
+import dgsl_engine.exceptions as exceptions
+import dgsl_engine.linker as linker
 from dgsl_engine.entity_factory import EntityFactory
 from dgsl_engine.event_factory import EventFactory
 from dgsl_engine.world import World
 from . import json_objects as objects
 
 
-class TestEntityConnector(unittest.TestCase):
+class TestLinkEntities(unittest.TestCase):
     def setUp(self):
         self.ent_fact = EntityFactory()
         self.evt_fact = EventFactory()
@@ -27,13 +28,11 @@ class TestEntityConnector(unittest.TestCase):
         self.world.add_event(self.evt_fact.new(objects.INFORM))
 
     def test_connect_entity(self):
-        connector = visitor.EntityConnector(objects.ENTITY, self.world)
-        connector.connect(self.entity)
+        linker.Linker(self.world).link(self.entity, objects.ENTITY)
         self.assertTrue(self.entity.events.has_event('use'))
 
     def test_connect_container(self):
-        connector = visitor.EntityConnector(objects.ROOM, self.world)
-        connector.connect(self.room)
+        linker.Linker(self.world).link(self.room, objects.ROOM)
         self.assertTrue(self.room.events.has_event('use'))
         self.assertTrue(self.room.inventory.has_item(self.entity.spec.id))
         self.assertTrue(self.room.inventory.has_item(self.player.spec.id))
@@ -41,17 +40,15 @@ class TestEntityConnector(unittest.TestCase):
         self.assertTrue(self.room.inventory.has_item(self.container.spec.id))
 
     def test_connect_player(self):
-        connector = visitor.EntityConnector(objects.PLAYER, self.world)
-        connector.connect(self.player)
+        linker.Linker(self.world).link(self.player, objects.PLAYER)
         self.assertTrue(self.player.events.has_event('use'))
 
     def test_connect_npc(self):
-        connector = visitor.EntityConnector(objects.NPC, self.world)
-        connector.connect(self.npc)
+        linker.Linker(self.world).link(self.npc, objects.NPC)
         self.assertTrue(self.npc.events.has_event('use'))
 
 
-class TestEventConnector(unittest.TestCase):
+class TestLinkEvents(unittest.TestCase):
     def setUp(self):
         self.evt_fact = EventFactory()
         self.event = self.evt_fact.new(objects.EVENT)
@@ -66,13 +63,11 @@ class TestEventConnector(unittest.TestCase):
         self.world.add_entity(self.room)
 
     def test_connect_event(self):
-        connector = visitor.EventConnector(objects.INFORM, self.world, {})
-        connector.connect(self.inform)
+        linker.Linker(self.world).link(self.inform, objects.INFORM)
         self.assertIn(self.event, self.inform.subjects)
 
     def test_connect_move(self):
-        connector = visitor.EventConnector(objects.MOVE, self.world, {})
-        connector.connect(self.move)
+        linker.Linker(self.world).link(self.move, objects.MOVE)
         self.assertIn(self.inform, self.move.subjects)
         self.assertIs(self.move.destination, self.room)
 
@@ -80,39 +75,34 @@ class TestEventConnector(unittest.TestCase):
         give = self.evt_fact.new(objects.GIVE)
         cont = self.ent_fact.new(objects.NPC)
         self.world.add_entity(cont)
-        connector = visitor.EventConnector(objects.GIVE, self.world, {})
-        connector.connect(give)
+        linker.Linker(self.world).link(give, objects.GIVE)
         self.assertEqual(give.item_owner, cont)
 
     def test_connect_take(self):
         take = self.evt_fact.new(objects.TAKE)
         cont = self.ent_fact.new(objects.NPC)
         self.world.add_entity(cont)
-        connector = visitor.EventConnector(objects.TAKE, self.world, {})
-        connector.connect(take)
+        linker.Linker(self.world).link(take, objects.TAKE)
         self.assertEqual(take.new_owner, cont)
 
     def test_connect_toggle(self):
         toggle = self.evt_fact.new(objects.TOGGLE_ACTIVE)
         cont = self.ent_fact.new(objects.NPC)
         self.world.add_entity(cont)
-        connector = visitor.EventConnector(
-            objects.TOGGLE_ACTIVE, self.world, {})
-        connector.connect(toggle)
+        linker.Linker(self.world).link(toggle, objects.TOGGLE_ACTIVE)
         self.assertEqual(toggle.target, cont)
 
     def test_connect_group(self):
         group = self.evt_fact.new(objects.GROUP)
-        connector = visitor.EventConnector(objects.GROUP, self.world, {})
-        connector.connect(group)
+        linker.Linker(self.world).link(group, objects.GROUP)
         self.assertIn(self.event, group.events)
         self.assertIn(self.inform, group.events)
 
     def test_connect_conditional(self):
         conditional = self.evt_fact.new(objects.CONDITIONAL)
-        connector = visitor.EventConnector(objects.CONDITIONAL, self.world,
-                                           {objects.QUESTION['id']: objects.QUESTION})
-        connector.connect(conditional)
+        world_linker = linker.Linker(
+            self.world, {objects.QUESTION['id']: objects.QUESTION})
+        world_linker.link(conditional, objects.CONDITIONAL)
         self.assertEqual(conditional.condition.question,
                          objects.QUESTION['question'])
         self.assertIs(conditional.success, self.event)
@@ -126,18 +116,45 @@ class TestEventConnector(unittest.TestCase):
     @unittest.skip
     def test_connect_interaction(self):
         interaction = self.evt_fact.new(objects.INTERACTION)
-        connector = visitor.EventConnector(objects.INTERACTION, self.world,
-                                           {objects.QUESTION['id']: objects.QUESTION,
-                                            objects.INTERACTION['options'][0]['id']:
-                                               objects.INTERACTION['options'][0],
-                                            objects.INTERACTION['options'][1]['id']:
-                                               objects.INTERACTION['options'][1]})
-        connector.connect(interaction)
+        world_linker = linker.Linker(
+            self.world, {objects.QUESTION['id']: objects.QUESTION,
+                         objects.INTERACTION['options'][0]['id']:
+                             objects.INTERACTION['options'][0],
+                         objects.INTERACTION['options'][1]['id']:
+                             objects.INTERACTION['options'][1]})
+        world_linker.link(interaction, objects.INTERACTION)
         opt_1 = interaction.options[0]
         opt_2 = interaction.options[1]
         self.assertIs(opt_1.event, self.event)
         self.assertIs(opt_2.event, self.inform)
 
+    def test_shared_condition(self):
+        first = self.evt_fact.new(objects.CONDITIONAL)
+        second = self.evt_fact.new(dict(objects.CONDITIONAL, id='second'))
+        world_linker = linker.Linker(
+            self.world, {objects.QUESTION['id']: objects.QUESTION})
+        world_linker.link(first, objects.CONDITIONAL)
+        world_linker.link(second, objects.CONDITIONAL)
+        self.assertIs(first.condition, second.condition)
+
+    def test_missing_reported_together(self):
+        group = self.evt_fact.new(objects.GROUP)
+        blueprint = dict(objects.GROUP, events=[{'id': 'a'}, {'id': 'b'}],
+                         subjects=[{'id': 'a'}])
+        world_linker = linker.Linker(self.world)
+        world_linker.link(group, blueprint)
+        world_linker.link(self.move, dict(objects.MOVE,
+                                          destination={'id': 'c'}))
+        self.assertEqual(world_linker.missing,
+                         {'a': [blueprint['id'], blueprint['id']],
+                          'b': [blueprint['id']],
+                          'c': [objects.MOVE['id']]})
+        with self.assertRaises(exceptions.InvalidParameterError) as context:
+            world_linker.check()
+        self.assertIn("a (from", str(context.exception))
+        self.assertIn("c (from", str(context.exception))
+
+
 # Main #################################################################
 
 
@@ -0,0 +1,151 @@
+import unittest
+import json
+import dgsl_engine.actions as actions
+import dgsl_engine.collectors as collectors
+import dgsl_engine.name_index as name_index
+import dgsl_engine.world as world
+from dgsl_engine.entity_base import Entity
+from dgsl_engine.entity_containers import Container, Npc, Player, Room
+from dgsl_engine.equipment import Equipment
+
+lethbridge_path = 'worlds/disaster_on_the_good_ship_lethbridge.world'
+
+
+def _rooms(game_world):
+    return [entity for entity in game_world.entities.values()
+            if isinstance(entity, Room)]
+
+
+# Tests ################################################################
+
+class TestNameIndexMatchesCollector(unittest.TestCase):
+    def setUp(self):
+        with open(lethbridge_path) as file:
+            self.world = world.WorldFactory().new(json.load(file))
+        self.index = name_index.NameIndex(self.world)
+        self.queries = ['door', 'a', 'the', 'an', 'box of', 'suit', 'x',
+                        'common area', 'nothing at all', 'r', 'e ']
+
+    def assert_same(self):
+        for room in _rooms(self.world):
+            for query in self.queries:
+                expected = collectors.EntityCollector(
+                    query, None, room).collect()
+                found = self.index.find(query, room)
+                self.assertEqual(found, expected,
+                                 "{} in {}".format(query, room.spec.name))
+
+    def test_same_results(self):
+        self.assert_same()
+
+    def test_same_results_after_moves(self):
+        self.assert_same()
+        player = self.world.player
+        rooms = _rooms(self.world)
+        for room in rooms:
+            for item in list(room):
+                if item.states.obtainable and item is not player:
+                    actions.move(item, player)
+        actions.move(player, rooms[-1])
+        for item in list(player)[::2]:
+            actions.move(item, rooms[0])
+        self.assert_same()
+
+
+class TestNameIndex(unittest.TestCase):
+    def setUp(self):
+        self.world = world.World()
+        self.room = Room('room')
+        self.other_room = Room('other room')
+        self.player = Player('player')
+        self.npc = Npc('npc')
+        self.box = Container('box')
+        self.coin = Entity('coin')
+        self.gold = Entity('gold')
+        self.hat = Equipment('hat')
+        names = {self.room: 'a room', self.other_room: 'another room',
+                 self.player: 'you', self.npc: 'an old gold miner',
+                 self.box: 'a wooden box', self.coin: 'a gold coin',
+                 self.gold: 'a gold nugget', self.hat: 'a hard hat'}
+        for entity, name in names.items():
+            entity.spec.name = name
+            self.world.add_entity(entity)
+        self.room.add(self.player)
+        self.room.add(self.npc)
+        self.room.add(self.box)
+        self.box.add(self.coin)
+        self.npc.add(self.gold)
+        self.player.equipped.equip(self.hat)
+        self.index = name_index.NameIndex(self.world)
+
+    def test_substring(self):
+        self.assertEqual(self.index.find('gold', self.room),
+                         [self.npc, self.coin])
+
+    def test_npc_items_not_found(self):
+        self.assertEqual(self.index.find('nugget', self.room), [])
+
+    def test_worn_equipment_found(self):
+        self.assertEqual(self.index.find('hat', self.room), [self.hat])
+
+    def test_words(self):
+        self.assertEqual(
+            self.index.find('gold coin', self.room, name_index.MATCH_WORDS),
+            [self.coin])
+        self.assertEqual(
+            self.index.find('old', self.room, name_index.MATCH_WORDS),
+            [self.npc])
+        self.assertEqual(
+            self.index.find('ol', self.room, name_index.MATCH_WORDS), [])
+
+    def test_best(self):
+        self.assertEqual(
+            self.index.find('gold coin purse', self.room,
+                            name_index.MATCH_BEST),
+            [self.coin])
+        self.assertEqual(
+            self.index.find('gold', self.room, name_index.MATCH_BEST),
+            [self.npc, self.coin])
+
+    def test_hidden(self):
+        self.coin.states.hidden = True
+        self.assertEqual(self.index.find('coin', self.room), [self.coin])
+        self.assertEqual(
+            self.index.find('coin', self.room, include_hidden=False), [])
+
+    def test_moves_between_rooms(self):
+        self.index.find('coin', self.other_room)
+        actions.move(self.box, self.other_room)
+        self.assertEqual(self.index.find('coin', self.room), [])
+        self.assertEqual(self.index.find('coin', self.other_room),
+                         [self.coin])
+
+    def test_given_to_npc(self):
+        actions.move(self.coin, self.npc)
+        self.assertEqual(self.index.find('coin', self.room), [])
+        actions.move(self.coin, self.player)
+        self.assertEqual(self.index.find('coin', self.room), [self.coin])
+
+    def test_order_after_move(self):
+        self.index.find('a', self.room)
+        actions.move(self.npc, self.other_room)
+        actions.move(self.npc, self.room)
+        self.assertEqual(
+            self.index.find('gold', self.room),
+            collectors.EntityCollector('gold', None, self.room).collect())
+        self.assertEqual(self.index.find('gold', self.room),
+                         [self.coin, self.npc])
+
+    def test_factory(self):
+        factory = collectors.EntityCollectorFactory(self.index)
+        collector = factory.make('coin', None, self.room)
+        self.assertIsInstance(collector, collectors.IndexedEntityCollector)
+        self.assertEqual(collector.collect(), [self.coin])
+        collector = factory.make('coin', None, self.box)
+        self.assertIsInstance(collector, collectors.EntityCollector)
+
+
+# Main #################################################################
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+import dgsl_engine.prompts as prompts
+from . import fakes
+
+
+def ask_twice():
+    first = yield prompts.Prompt('First?')
+    second = yield prompts.Prompt('Second?', ['a', 'b'])
+    return first, second
+
+
+class Plain:
+    def execute(self, affected):
+        return 'plain ' + affected
+
+
+class Stepped:
+    def execute(self, affected):
+        return prompts.run(self.execute_steps(affected))
+
+    def execute_steps(self, affected):
+        answer = yield prompts.Prompt('Name?')
+        return answer + ' ' + affected
+
+
+class TestPrompt(unittest.TestCase):
+    def test_read_text(self):
+        prompt = prompts.Prompt('Name?')
+        self.assertFalse(prompt.is_menu())
+        self.assertEqual(prompt.read('Bob'), 'Bob')
+
+    def test_read_menu(self):
+        prompt = prompts.Prompt(choices=['a', 'b'])
+        self.assertTrue(prompt.is_menu())
+        self.assertEqual(prompt.read('2'), 1)
+        self.assertEqual(prompt.read('3'), 2)
+        self.assertEqual(prompt.read('4'), -1)
+        self.assertEqual(prompt.read('0'), -1)
+        self.assertEqual(prompt.read('b'), -1)
+
+
+class TestRun(unittest.TestCase):
+    def test_run(self):
+        answers = iter(['yes', 1])
+        asked = []
+
+        def ask(prompt):
+            asked.append(prompt.text)
+            return next(answers)
+
+        result = prompts.run(ask_twice(), ask)
+        self.assertEqual(result, ('yes', 1))
+        self.assertEqual(asked, ['First?', 'Second?'])
+
+    def test_console_asker(self):
+        output = fakes.FakeOutput()
+        asker = prompts.ConsoleAsker(
+            output.make_capture(), fakes.FakeInput(['yes', '1']).make_stream())
+        result = prompts.run(ask_twice(), asker)
+        self.assertEqual(result, ('yes', 0))
+        self.assertEqual(output.get_text(),
+                         'First?\n\nSecond?\n1. a\n2. b\n3. Cancel\n\n')
+
+
+class TestCall(unittest.TestCase):
+    def test_plain(self):
+        result = prompts.run(prompts.call(Plain(), 'execute', 'x'), None)
+        self.assertEqual(result, 'plain x')
+
+    def test_stepped(self):
+        steps = prompts.call(Stepped(), 'execute', 'x')
+        self.assertEqual(next(steps).text, 'Name?')
+        with self.assertRaises(StopIteration) as stop:
+            steps.send('Bob')
+        self.assertEqual(stop.exception.value, 'Bob x')
+
+    def test_flushing(self):
+        lines = ['waiting', 'lines']
+        steps = prompts.flushing(prompts.call(Stepped(), 'execute', 'x'),
+                                 lines)
+        self.assertEqual(next(steps).text, 'waiting\nlines\nName?')
+        self.assertEqual(lines, [])
+
+    def test_flushing_no_prompt(self):
+        lines = ['waiting']
+        result = prompts.run(
+            prompts.flushing(prompts.call(Plain(), 'execute', 'x'), lines))
+        self.assertEqual(result, 'plain x')
+        self.assertEqual(lines, ['waiting'])
+
+
+# Main #################################################################
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import io
+import json
+import unittest
+import unittest.mock as mock
+import dgsl_engine.compiled_world as compiled_world
+import dgsl_engine.exceptions as exceptions
+import dgsl_engine.registry as registry
+import dgsl_engine.world as world
+import dgsl_engine.world_generator as world_generator
+import dgsl_engine.world_loader as world_loader
+from dgsl_engine.entity_base import Entity
+from dgsl_engine.event_base import Event
+
+
+# Helpers ##############################################################
+
+class Lamp(Entity):
+    pass
+
+
+class Alarm(Event):
+    def __init__(self, obj_id):
+        super(Alarm, self).__init__(obj_id)
+        self.target = None
+
+
+def link_alarm(linker, alarm, blueprint):
+    alarm.target = linker.entity(blueprint['target'], blueprint['id'])
+
+
+class FakeEntryPoint:
+    def __init__(self, function):
+        self.function = function
+
+    def load(self):
+        return self.function
+
+
+def alarm_world():
+    file = io.StringIO()
+    world_generator.WorldGenerator(rooms=2).write(file)
+    world_json = json.loads(file.getvalue())
+    objects = world_json['objects']
+    objects['alarm'] = {'type': 'alarm', 'id': 'alarm', 'once': 0,
+                        'message': 'Ring!', 'subjects': [],
+                        'target': {'id': 'room1'}}
+    objects['lamp'] = {'type': 'lamp', 'id': 'lamp', 'name': 'lamp',
+                       'description': 'A lamp.', 'events': []}
+    objects['room0']['events'].append({'verb': 'ring', 'id': 'alarm'})
+    objects['room0']['items'].append({'id': 'lamp'})
+    return world_json
+
+
+# Tests ################################################################
+
+class TestRegistry(unittest.TestCase):
+    def setUp(self):
+        self.classes = list(registry._CLASSES)
+        registry.register_event('alarm', Alarm, link=link_alarm,
+                                references=('subjects', 'target'))
+        registry.register_entity('lamp', Lamp)
+
+    def tearDown(self):
+        for name in ['alarm', 'lamp', 'siren']:
+            registry._TYPES.pop(name, None)
+        registry._CLASSES[:] = self.classes
+
+    def test_built_in_types(self):
+        self.assertEqual(registry.kind('room'), registry.ENTITY)
+        self.assertEqual(registry.kind('move'), registry.EVENT)
+        self.assertEqual(registry.kind('hasItem'), registry.CONDITION)
+        self.assertEqual(registry.kind('option'), registry.OPTION)
+        self.assertIsNone(registry.get('nothing'))
+
+    def test_register_twice(self):
+        with self.assertRaises(exceptions.InvalidParameterError):
+            registry.register_entity('lamp', Lamp)
+        registry.register_entity('lamp', Lamp, replace=True)
+
+    def test_custom_types_in_every_loader(self):
+        world_json = alarm_world()
+        loaded = [
+            world.WorldFactory().new(world_json),
+            world_loader.load(io.StringIO(json.dumps(world_json))),
+            world.WorldFactory(lazy=True).new(world_json),
+        ]
+        for new_world in loaded:
+            alarm = new_world.events['alarm']
+            self.assertIsInstance(alarm, Alarm)
+            self.assertIs(alarm.target, new_world.entities['room1'])
+            lamp = new_world.entities['lamp']
+            self.assertIsInstance(lamp, Lamp)
+            self.assertIs(lamp.owner, new_world.entities['room0'])
+
+    def test_custom_types_compiled(self):
+        new_world = compiled_world.decompile_world(
+            compiled_world.compile_world(
+                world.WorldFactory().new(alarm_world())))
+        alarm = new_world.events['alarm']
+        self.assertIsInstance(alarm, Alarm)
+        self.assertIs(alarm.target, new_world.entities['room1'])
+
+    def test_plugins_loaded_once(self):
+        def register(module):
+            module.register_event('siren', Alarm, link=link_alarm)
+
+        plugins = [FakeEntryPoint(register)]
+        with mock.patch.dict(registry._PLUGINS, loaded=False), \
+                mock.patch.object(registry, '_entry_points',
+                                  return_value=plugins) as entry_points:
+            self.assertEqual(registry.kind('siren'), registry.EVENT)
+            self.assertIsNone(registry.get('klaxon'))
+        entry_points.assert_called_once_with()
+
+
+# Main #################################################################
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import os
+import tempfile
+import unittest
+import dgsl_engine.actions as actions
+import dgsl_engine.event_composites as event_composites
+import dgsl_engine.exceptions as exceptions
+import dgsl_engine.game_factory as game_factory
+import dgsl_engine.saves as saves
+import dgsl_engine.world as world
+import dgsl_engine.world_state as world_state
+from dgsl_engine.entity_base import Entity
+from dgsl_engine.entity_containers import Player, Room
+from dgsl_engine.equipment import Equipment
+
+lethbridge_path = 'worlds/disaster_on_the_good_ship_lethbridge.world'
+
+
+class TestSaves(unittest.TestCase):
+    def setUp(self):
+        self.world = world.World()
+        self.world.details = world.WorldDetails('test', '', '', '1.0')
+        self.room = Room('room')
+        self.player = Player('player')
+        self.coin = Entity('coin')
+        self.hat = Equipment('hat')
+        self.hat.slot = 'head'
+        for entity in [self.room, self.player, self.coin, self.hat]:
+            self.world.add_entity(entity)
+        self.group = event_composites.OrderedGroup('group')
+        self.world.add_event(self.group)
+        self.room.add(self.player)
+        self.room.add(self.coin)
+        self.room.add(self.hat)
+        self.world.player = self.player
+        self.state = world_state.WorldState()
+
+    def round_trip(self):
+        return saves.loads(self.world, saves.dumps(self.world, self.state))
+
+    def test_changes_restored(self):
+        with world_state.using(self.state):
+            actions.move(self.coin, self.player)
+            self.room.inventory.remove('hat')
+            self.player.equipped.equip(self.hat)
+            self.coin.states.hidden = True
+            self.group.idx = 2
+            self.group.is_done = True
+
+        with world_state.using(self.round_trip()):
+            self.assertIs(self.coin.owner, self.player)
+            self.assertEqual(list(self.player.inventory), [self.coin])
+            self.assertEqual(list(self.room.inventory), [self.player])
+            self.assertIs(self.player.equipped.get('head'), self.hat)
+            self.assertTrue(self.hat.equipped)
+            self.assertTrue(self.coin.states.hidden)
+            self.assertEqual(self.group.idx, 2)
+            self.assertTrue(self.group.is_done)
+
+    def test_unchanged_values_not_saved(self):
+        with world_state.using(self.state):
+            actions.move(self.hat, self.player)
+            actions.move(self.hat, self.room)
+            self.coin.states.toggle_active()
+            self.coin.states.toggle_active()
+            self.group.idx = 0
+        self.assertEqual(len(self.state), 5)
+        self.assertEqual(len(self.round_trip()), 0)
+
+    def test_different_world(self):
+        data = saves.dumps(self.world, self.state)
+        self.world.details.version = '2.0'
+        with self.assertRaises(exceptions.InvalidParameterError):
+            saves.loads(self.world, data)
+
+    def test_not_a_save(self):
+        with self.assertRaises(exceptions.InvalidParameterError):
+            saves.loads(self.world, b'not a save')
+        data = saves.dumps(self.world, self.state)
+        with self.assertRaises(exceptions.InvalidParameterError):
+            saves.loads(self.world, data[:7] + b'junk')
+
+    def test_unknown_entity(self):
+        with world_state.using(self.state):
+            actions.move(self.coin, self.player)
+        data = saves.dumps(self.world, self.state)
+        del self.world.entities['coin']
+        with self.assertRaises(exceptions.InvalidParameterError):
+            saves.loads(self.world, data)
+
+
+class TestSaveCommands(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.factory = game_factory.GameFactory()
+        self.game = self.new_game()
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def new_game(self):
+        game = self.factory.new(lethbridge_path)
+        game.save_dir = os.path.join(self.dir.name, 'saves')
+        game.start()
+        return game
+
+    def test_save_and_load(self):
+        self.game.step('get medkit')
+        self.assertEqual(self.game.step('save First Try!').output,
+                         'Game saved as first_try')
+        path = os.path.join(self.game.save_dir, 'first_try.save')
+        self.assertLess(os.path.getsize(path), 500)
+
+        other = self.new_game()
+        output = other.step('load first try').output
+        self.assertTrue(output.startswith('Loaded first_try\n\n'))
+        self.assertEqual(other.step('inventory').output,
+                         self.game.step('inventory').output)
+
+    def test_load_in_same_game(self):
+        self.game.step('save')
+        self.game.step('get medkit')
+        self.game.step('load')
+        self.assertIn('a medkit', self.game.step('look').output)
+
+    def test_load_missing(self):
+        self.assertEqual(self.game.step('load nothing').output,
+                         'There is no saved game called nothing')
+
+
+# Main #################################################################
+
+if __name__ == '__main__':
+    unittest.main()
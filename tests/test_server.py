@@ -0,0 +1,115 @@
+import asyncio
+import unittest
+import dgsl_engine.game as game
+import dgsl_engine.prompts as prompts
+import dgsl_engine.server as server
+
+world_path = 'tests/worlds/testing_ground'
+
+
+async def read_until(reader, text):
+    data = await asyncio.wait_for(reader.readuntil(text.encode()), 5)
+    return data.decode()
+
+
+class TestServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = server.GameServer(server.SessionFactory(world_path),
+                                        max_sessions=2, idle_timeout=5,
+                                        drain_timeout=5)
+        await self.server.start('127.0.0.1', 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.connections = []
+
+    async def asyncTearDown(self):
+        for _, writer in self.connections:
+            writer.close()
+        await self.server.shutdown()
+
+    async def connect(self):
+        reader, writer = await asyncio.open_connection('127.0.0.1',
+                                                       self.port)
+        self.connections.append((reader, writer))
+        return reader, writer
+
+    async def send(self, connection, line, until='\n> '):
+        reader, writer = connection
+        writer.write((line + '\n').encode())
+        await writer.drain()
+        return await read_until(reader, until)
+
+    async def test_play(self):
+        connection = await self.connect()
+        text = await read_until(connection[0], '\n> ')
+        self.assertIn('Best room on the ship', text)
+
+        text = await self.send(connection, 'get ring')
+        self.assertIn('You take ring', text)
+        text = await self.send(connection, 'quit', 'Choice: ')
+        self.assertIn('1. Quit\n2. Cancel', text)
+        text = await self.send(connection, '1', 'Thanks for playing\n')
+        self.assertIn('Quitting ...', text)
+        self.assertEqual(await connection[0].read(), b'')
+
+    async def test_sessions_have_own_world(self):
+        first = await self.connect()
+        second = await self.connect()
+        await read_until(first[0], '\n> ')
+        await read_until(second[0], '\n> ')
+
+        await self.send(first, 'get ring')
+        text = await self.send(second, 'look')
+        self.assertIn('ring', text)
+        text = await self.send(first, 'look')
+        self.assertNotIn('ring', text)
+
+    async def test_full(self):
+        for _ in range(2):
+            reader, _ = await self.connect()
+            await read_until(reader, '\n> ')
+        reader, _ = await self.connect()
+        self.assertIn(b'The server is full', await reader.read())
+        self.assertEqual(self.server.session_count, 2)
+
+    async def test_idle_timeout(self):
+        self.server.idle_timeout = 0.1
+        reader, _ = await self.connect()
+        text = await read_until(reader, 'Closing idle session.\n')
+        self.assertIn('Best room on the ship', text)
+
+    async def test_shutdown_drains(self):
+        self.server.drain_timeout = 0.1
+        reader, _ = await self.connect()
+        await read_until(reader, '\n> ')
+        await self.server.shutdown()
+        text = (await reader.read()).decode()
+        self.assertIn('The server is shutting down', text)
+        self.assertIn('The server has shut down', text)
+        self.assertEqual(self.server.session_count, 0)
+
+
+class TestRender(unittest.TestCase):
+    def test_command(self):
+        self.assertEqual(server.render(game.Turn('You take ring')),
+                         server.SEPARATOR + '\nYou take ring\n\n> ')
+
+    def test_menu(self):
+        turn = game.Turn('', prompts.Prompt(choices=['Quit']))
+        self.assertEqual(server.render(turn),
+                         server.SEPARATOR + '\n1. Quit\n2. Cancel\n\nChoice: ')
+
+    def test_after_question(self):
+        turn = game.Turn('The door opens')
+        self.assertEqual(server.render(turn, prompts.Prompt('Password?')),
+                         '\nThe door opens\n\n> ')
+
+    def test_over(self):
+        turn = game.Turn('\nQuitting ...', over=True)
+        self.assertEqual(server.render(turn, prompts.Prompt(choices=['Quit'])),
+                         '\nQuitting ...\n')
+
+
+# Main #################################################################
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+import unittest
+import json
+import dgsl_engine.actions as actions
+import dgsl_engine.collectors as collectors
+import dgsl_engine.type_index as type_index
+import dgsl_engine.world as world
+import dgsl_engine.world_state as world_state
+from dgsl_engine.entity_base import Entity
+from dgsl_engine.entity_containers import Container, Npc, Player, Room
+from dgsl_engine.equipment import Equipment
+
+lethbridge_path = 'worlds/disaster_on_the_good_ship_lethbridge.world'
+
+TYPES = [['entity'], ['container'], ['equipment'], ['npc', 'player'],
+         ['room', 'equipment', 'entity']]
+
+
+def _visited(types, entity):
+    """Collects by visiting, without the index."""
+    collector = collectors.EntityTypeCollector(types, entity)
+    entity.accept(collector)
+    return collector.results
+
+
+# Tests ################################################################
+
+class TestTypeIndexMatchesCollector(unittest.TestCase):
+    def setUp(self):
+        with open(lethbridge_path) as file:
+            self.world = world.WorldFactory().new(json.load(file))
+        self.index = type_index.TypeIndex(self.world)
+
+    def assert_same(self):
+        containers = [entity for entity in self.world.entities.values()
+                      if isinstance(entity, Container)]
+        for container in containers:
+            for types in TYPES:
+                found = collectors.EntityTypeCollector(
+                    types, container).collect()
+                self.assertEqual(found, _visited(types, container),
+                                 "{} in {}".format(types, container))
+
+    def test_same_results(self):
+        self.assert_same()
+
+    def test_same_results_after_moves(self):
+        self.assert_same()
+        player = self.world.player
+        rooms = [entity for entity in self.world.entities.values()
+                 if isinstance(entity, Room)]
+        for room in rooms:
+            for item in list(room):
+                if item.states.obtainable and item is not player:
+                    actions.move(item, player)
+        actions.move(player, rooms[-1])
+        for item in list(player)[::2]:
+            actions.move(item, rooms[0])
+        self.assert_same()
+
+
+class TestTypeIndex(unittest.TestCase):
+    def setUp(self):
+        self.world = world.World()
+        self.room = Room('room')
+        self.other_room = Room('other room')
+        self.player = Player('player')
+        self.npc = Npc('npc')
+        self.box = Container('box')
+        self.coin = Entity('coin')
+        self.hat = Equipment('hat')
+        self.hat.slot = 'head'
+        self.boots = Equipment('boots')
+        self.boots.slot = 'feet'
+        for entity in [self.room, self.other_room, self.player, self.npc,
+                       self.box, self.coin, self.hat, self.boots]:
+            self.world.add_entity(entity)
+        self.room.add(self.player)
+        self.room.add(self.npc)
+        self.player.add(self.box)
+        self.box.add(self.coin)
+        self.box.add(self.boots)
+        self.player.equipped.equip(self.hat)
+        self.index = type_index.TypeIndex(self.world)
+
+    def test_find(self):
+        self.assertEqual(self.index.find(['equipment'], self.player),
+                         [self.boots, self.hat])
+        self.assertEqual(self.index.find(['npc', 'room'], self.room),
+                         [self.room, self.npc])
+
+    def test_collector_uses_index(self):
+        self.assertIs(self.world.index.type_index, self.index)
+        collector = collectors.EntityTypeCollector(['entity'], self.room)
+        self.assertEqual(collector.collect(), [self.coin])
+
+    def test_equip(self):
+        self.index.find(['equipment'], self.player)
+        self.box.inventory.remove('boots')
+        self.player.equipped.equip(self.boots)
+        self.assertEqual(self.index.find(['equipment'], self.player),
+                         [self.hat, self.boots])
+        self.player.equipped.remove('head')
+        self.assertEqual(self.index.find(['equipment'], self.player),
+                         [self.boots])
+
+    def test_moves_between_containers(self):
+        self.index.find(['entity'], self.other_room)
+        self.index.find(['entity'], self.player)
+        actions.move(self.box, self.other_room)
+        self.assertEqual(self.index.find(['entity'], self.player), [])
+        self.assertEqual(self.index.find(['entity'], self.other_room),
+                         [self.coin])
+        actions.move(self.coin, self.npc)
+        self.assertEqual(self.index.find(['entity'], self.room),
+                         [self.coin])
+
+    def test_other_state(self):
+        self.index.find(['entity'], self.player)
+        with world_state.using(world_state.WorldState()):
+            actions.move(self.coin, self.room)
+            self.assertEqual(self.index.find(['entity'], self.box), [])
+        self.assertEqual(self.index.find(['entity'], self.box), [self.coin])
+
+
+# Main #################################################################
+
+if __name__ == '__main__':
+    unittest.main()
@@ -26,6 +26,57 @@ class TestParser(unittest.TestCase):
         self.assertEqual(parsed['code'], user_input.ParseCodes.ERROR)
         self.assertEqual(parsed['message'], "You don't know how to crump")
 
+    def test_prefix(self):
+        parsed = self.parser.parse('inv')
+        self.assertEqual(parsed['verb'], 'inventory')
+        self.assertIsNone(parsed['code'])
+
+    def test_abbreviation(self):
+        self.assertEqual(self.parser.parse('l')['verb'], 'look')
+        self.assertEqual(self.parser.parse('i')['verb'], 'inventory')
+
+    def test_ambiguous_prefix(self):
+        parsed = self.parser.parse('g door')
+        self.assertEqual(parsed['code'], user_input.ParseCodes.ERROR)
+
+    def test_short_prefix(self):
+        for word in ['e', 'd', 'u', 'r', 'p', 'eq', 'dr']:
+            parsed = self.parser.parse(word + ' hat')
+            self.assertEqual(parsed['code'], user_input.ParseCodes.ERROR)
+        self.assertEqual(self.parser.parse('equ hat')['verb'], 'equip')
+
+    def test_command_not_abbreviated(self):
+        parsed = self.parser.parse('qui')
+        self.assertEqual(parsed['code'], user_input.ParseCodes.ERROR)
+
+    def test_world_verbs(self):
+        parser = user_input.Parser({'push': ['shove'], 'get': ['grab'],
+                                    'lick': []})
+        parsed = parser.parse('shove the button')
+        self.assertEqual(parsed['verb'], 'push')
+        self.assertEqual(parsed['object'], 'the button')
+        self.assertEqual(parser.parse('grab cake')['verb'], 'get')
+        self.assertEqual(parser.parse('pu')['code'],
+                         user_input.ParseCodes.ERROR)
+        self.assertEqual(parser.parse('l')['verb'], 'look')
+        self.assertEqual(parser.parse('lic')['verb'], 'lick')
+        self.assertIn('push', parser.verbs)
+
+
+class TestVerbTable(unittest.TestCase):
+    def test_lookup(self):
+        table = user_input.VerbTable()
+        self.assertEqual(table.lookup('take'), ('take', None))
+        self.assertEqual(table.lookup('save'),
+                         ('save', user_input.ParseCodes.COMMAND))
+        self.assertIsNone(table.lookup('dance'))
+
+    def test_synonym_does_not_replace_verb(self):
+        table = user_input.VerbTable(synonyms={'push': ['use', 'quit']})
+        self.assertEqual(table.lookup('use'), ('use', None))
+        self.assertEqual(table.lookup('quit'),
+                         ('quit', user_input.ParseCodes.COMMAND))
+
 
 class TestMenu(unittest.TestCase):
     def setUp(self):
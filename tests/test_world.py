@@ -1,13 +1,80 @@
 import unittest
+import io
 import os
 import json
+import unittest.mock as mock
+import dgsl_engine.actions as actions
+import dgsl_engine.exceptions as exceptions
+import dgsl_engine.game_factory as game_factory
 import dgsl_engine.world as world
+import dgsl_engine.world_generator as world_generator
+import dgsl_engine.world_state as world_state
+from dgsl_engine.entity_base import Entity
+from dgsl_engine.entity_containers import Container, Npc, Room
+from dgsl_engine.equipment import Equipment
 
 test_world_path = 'tests/worlds/testing_ground'
+lethbridge_path = 'worlds/disaster_on_the_good_ship_lethbridge.world'
 
 
 class TestWorld(unittest.TestCase):
-    pass
+    def test_add_entity(self):
+        new_world = world.World()
+        room = Room('room')
+        new_world.add_entity(room)
+        self.assertIs(new_world.entities['room'], room)
+        self.assertIs(room.index, new_world.index)
+
+
+class TestEntityIndex(unittest.TestCase):
+    def setUp(self):
+        self.world = world.World()
+        self.room = Room('room')
+        self.npc = Npc('npc')
+        self.box = Container('box')
+        self.coin = Entity('coin')
+        self.hat = Equipment('hat')
+        self.hat.slot = 'head'
+        for entity in [self.room, self.npc, self.box, self.coin, self.hat]:
+            self.world.add_entity(entity)
+        self.room.add(self.npc)
+        self.npc.add(self.box)
+        self.box.add(self.coin)
+        self.npc.equipped.equip(self.hat)
+
+    def test_find(self):
+        self.assertIs(self.world.index.find('coin', self.room), self.coin)
+        self.assertIs(self.world.index.find('coin', self.box), self.coin)
+        self.assertIs(self.world.index.find('hat', self.npc), self.hat)
+        self.assertIs(self.world.index.find('box', self.box), self.box)
+        self.assertIsNone(self.world.index.find('npc', self.box))
+        self.assertIsNone(self.world.index.find('nothing', self.room))
+
+    def test_container_get(self):
+        self.assertIs(self.room.get('coin'), self.coin)
+        self.assertIs(self.room.get('hat'), self.hat)
+        self.assertIsNone(self.box.get('hat'))
+
+    def test_owners(self):
+        self.assertEqual(self.world.index.owners(self.coin),
+                         [self.box, self.npc, self.room])
+
+    def test_move_updates(self):
+        actions.move(self.coin, self.room)
+        self.assertTrue(self.world.index.contains(self.room, 'coin'))
+        self.assertFalse(self.world.index.contains(self.box, 'coin'))
+        self.assertIsNone(self.npc.get('coin'))
+
+    def test_remove_equipment(self):
+        self.npc.equipped.remove('head')
+        self.assertIsNone(self.room.get('hat'))
+
+    def test_listeners(self):
+        listener = mock.MagicMock()
+        self.world.index.register(listener)
+        actions.move(self.coin, self.room)
+        listener.entity_moved.assert_called_with(
+            self.coin, self.box, self.room)
 
 
 class TestWorldFactory(unittest.TestCase):
@@ -63,6 +130,106 @@ class TestWorldFactory(unittest.TestCase):
         self.assertEqual(new_world.details.welcome, 'fun is waiting!')
 
 
+class TestLazyWorld(unittest.TestCase):
+    def setUp(self):
+        file = io.StringIO()
+        world_generator.WorldGenerator(rooms=6).write(file)
+        self.world_json = json.loads(file.getvalue())
+        self.world = world.WorldFactory(lazy=True).new(self.world_json)
+
+    def new_game(self, game_world):
+        game = game_factory.GameFactory().new_from_world(
+            game_world, world_state.WorldState())
+        game.start()
+        return game
+
+    def test_only_start_room_built(self):
+        self.assertEqual(self.world.regions, ['room0'])
+        self.assertIs(self.world.player.owner, self.world.entities['room0'])
+        self.assertEqual(self.world.details.name,
+                         self.world_json['name'])
+        self.assertIn('room3', self.world.entities)
+        self.assertNotIn('room3', dict(self.world.entities))
+
+    def test_lookup_builds_region(self):
+        room = self.world.entities['room3']
+        self.assertEqual(self.world.regions, ['room0', 'room3'])
+        self.assertTrue(all(item.owner is room for item in room))
+        self.assertIsNone(self.world.entities.get('nothing'))
+        with self.assertRaises(KeyError):
+            self.world.entities['nothing']  # pylint: disable=pointless-statement
+
+    def test_move_builds_destination(self):
+        game = self.new_game(self.world)
+        game.step('use door to room 1')
+        self.assertEqual(self.world.regions, ['room0', 'room1'])
+        with world_state.using(game.state):
+            self.assertIs(self.world.player.owner,
+                          self.world.entities['room1'])
+
+    def test_same_game_as_world(self):
+        commands = ['use door to room 1', 'look', 'get key', 'inventory',
+                    'use door to room 2', 'get broken gloves',
+                    'equip broken gloves', 'look']
+        with open(lethbridge_path) as file:
+            lethbridge = json.load(file)
+        for world_json in [self.world_json, lethbridge]:
+            outputs = []
+            for lazy in [False, True]:
+                game = self.new_game(
+                    world.WorldFactory(lazy=lazy).new(world_json))
+                outputs.append([game.step(command).output
+                                for command in commands])
+            self.assertEqual(outputs[0], outputs[1])
+
+    def test_evict_idle_rooms(self):
+        self.world.idle_moves = 0
+        game = self.new_game(self.world)
+        game.step('use door to room 1')
+        first = self.world.entities['room1']
+        game.step('use door to room 2')
+        self.assertEqual(self.world.regions, ['room0', 'room1', 'room2'])
+        game.step('use door to room 3')
+        game.step('1')
+        # The player has left the first room, so it has changed
+        self.assertEqual(self.world.regions, ['room0', 'room2', 'room3'])
+        self.assertNotIn('room1', dict(self.world.entities))
+        with world_state.using(game.state):
+            room = self.world.entities['room1']
+            self.assertIsNot(room, first)
+            self.assertIn('room1.3', room.inventory.items)
+
+    def test_changed_rooms_kept(self):
+        self.world.idle_moves = 0
+        game = self.new_game(self.world)
+        game.step('use door to room 1')
+        game.step('get key')
+        game.step('use door to room 2')
+        game.step('use door to room 3')
+        game.step('1')
+        self.assertEqual(self.world.regions,
+                         ['room0', 'room1', 'room2', 'room3'])
+
+    def test_max_regions(self):
+        self.world.max_regions = 2
+        game = self.new_game(self.world)
+        game.step('use door to room 1')
+        game.step('use door to room 2')
+        # The room the player just left is kept until the next move
+        self.assertEqual(self.world.regions, ['room0', 'room1', 'room2'])
+        game.step('use door to room 3')
+        game.step('1')
+        # The player's start room has changed, so it is kept
+        self.assertEqual(self.world.regions, ['room0', 'room2', 'room3'])
+
+    def test_missing_reference(self):
+        self.world_json['objects']['room2']['items'].append(
+            {'id': 'ghost', 'name': 'ghost'})
+        new_world = world.WorldFactory(lazy=True).new(self.world_json)
+        with self.assertRaises(exceptions.InvalidParameterError):
+            new_world.entities['room2']  # pylint: disable=pointless-statement
+
+
 # Main #################################################################
 
 if __name__ == '__main__':
@@ -0,0 +1,119 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import dgsl_engine.compiled_world as compiled_world
+import dgsl_engine.game_factory as game_factory
+import dgsl_engine.world_cache as world_cache
+import dgsl_engine.world_loader as world_loader
+
+lethbridge_path = 'worlds/disaster_on_the_good_ship_lethbridge.world'
+test_world_path = 'tests/worlds/testing_ground'
+
+
+class TestWorldCache(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.dir.name, 'cache')
+        self.cache = world_cache.WorldCache(self.cache_dir)
+        self.path = os.path.join(self.dir.name, 'lethbridge.world')
+        shutil.copy(lethbridge_path, self.path)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_miss_then_hit(self):
+        loaded = self.cache.load(self.path)
+        self.assertEqual(len(self.cache.entries()), 1)
+        with mock.patch.object(world_loader, 'load') as load:
+            cached = self.cache.load(self.path)
+        load.assert_not_called()
+        self.assertIsNot(cached, loaded)
+        self.assertEqual(compiled_world.compile_world(cached),
+                         compiled_world.compile_world(loaded))
+
+    def test_changed_file_is_a_miss(self):
+        self.cache.load(self.path)
+        with open(self.path, 'a') as file:
+            file.write('\n')
+        with mock.patch.object(world_loader, 'load',
+                               wraps=world_loader.load) as load:
+            self.cache.load(self.path)
+        load.assert_called_once()
+        self.assertEqual(len(self.cache.entries()), 2)
+
+    def test_bad_entry_is_replaced(self):
+        self.cache.load(self.path)
+        entry = self.cache.entries()[0][2]
+        corrupt = (compiled_world.MAGIC
+                   + bytes([compiled_world.FORMAT_VERSION]) + b'junk')
+        digest = world_cache.file_hash(self.path)
+        for data in [b'not an entry', b'\0' * 32 + corrupt, digest + corrupt]:
+            with open(entry, 'wb') as file:
+                file.write(data)
+            new_world = self.cache.load(self.path)
+            self.assertEqual(new_world.details.name,
+                             'Disaster on The Good Ship Lethbridge')
+            self.assertIsNotNone(
+                self.cache.get(world_cache.file_hash(self.path)))
+
+    def test_least_recently_used_evicted(self):
+        self.cache.load(self.path)
+        size = self.cache.entries()[0][1]
+        self.cache.max_bytes = size * 2
+        other = os.path.join(self.dir.name, 'other.world')
+        shutil.copy(self.path, other)
+        with open(other, 'a') as file:
+            file.write(' ')
+        newest = os.path.join(self.dir.name, 'newest.world')
+        shutil.copy(other, newest)
+        with open(newest, 'a') as file:
+            file.write(' ')
+
+        self.cache.load(other)
+        hashes = [world_cache.file_hash(path)
+                  for path in (self.path, other, newest)]
+        # The first entry is the oldest until it is used again
+        for _, _, entry in self.cache.entries():
+            used = 1 if hashes[0].hex() in entry else 2
+            os.utime(entry, (used, used))
+        self.cache.load(self.path)
+        self.cache.load(newest)
+
+        self.assertIsNotNone(self.cache.get(hashes[0]))
+        self.assertIsNone(self.cache.get(hashes[1]))
+        self.assertIsNotNone(self.cache.get(hashes[2]))
+
+    def test_too_big_not_kept(self):
+        self.cache.max_bytes = 100
+        self.cache.load(self.path)
+        self.assertEqual(self.cache.entries(), [])
+
+    def test_unwritable_cache(self):
+        blocked = os.path.join(self.dir.name, 'blocked')
+        open(blocked, 'w').close()
+        cache = world_cache.WorldCache(os.path.join(blocked, 'cache'))
+        new_world = cache.load(self.path)
+        self.assertEqual(new_world.details.name,
+                         'Disaster on The Good Ship Lethbridge')
+        self.assertEqual(cache.entries(), [])
+
+    def test_no_temporary_files_left(self):
+        self.cache.load(self.path)
+        self.cache.clear()
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+    def test_game_factory_uses_cache(self):
+        factory = game_factory.GameFactory(self.cache)
+        factory.new(test_world_path)
+        with mock.patch.object(world_loader, 'load') as load:
+            game = factory.new(test_world_path)
+        load.assert_not_called()
+        self.assertEqual(game.world.details.name, 'testing ground')
+
+
+# Main #################################################################
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import collections
+import io
+import json
+import unittest
+import dgsl_engine.exceptions as exceptions
+import dgsl_engine.game_factory as game_factory
+import dgsl_engine.world as world
+import dgsl_engine.world_generator as world_generator
+
+
+class TestWorldGenerator(unittest.TestCase):
+    def write(self, generator):
+        file = io.StringIO()
+        count = generator.write(file)
+        return count, file.getvalue()
+
+    def test_world_loads(self):
+        generator = world_generator.WorldGenerator(rooms=20, seed=1)
+        count, text = self.write(generator)
+        world_json = json.loads(text)
+        self.assertEqual(len(world_json['objects']), count)
+
+        new_world = world.WorldFactory().new(world_json)
+        rooms = [id_ for id_ in new_world.entities if id_.startswith('room')
+                 and '.' not in id_]
+        self.assertEqual(len(rooms), 20)
+        self.assertIs(new_world.player.owner, new_world.entities['room0'])
+
+    def test_all_types_made(self):
+        generator = world_generator.WorldGenerator(rooms=30, event_depth=3)
+        world_json = json.loads(self.write(generator)[1])
+        types = collections.Counter(
+            obj['type'] for obj in world_json['objects'].values())
+        for type_ in ['room', 'container', 'entity', 'npc', 'equipment',
+                      'player', 'group', 'ordered', 'conditional',
+                      'interaction', 'move', 'give', 'take',
+                      'toggle_active', 'toggle_obtainable', 'toggle_hidden',
+                      'option', 'conditional_option', 'hasItem',
+                      'is_active', 'protected']:
+            self.assertIn(type_, types)
+
+    def test_same_seed_same_world(self):
+        first = self.write(world_generator.WorldGenerator(rooms=5, seed=7))
+        second = self.write(world_generator.WorldGenerator(rooms=5, seed=7))
+        other = self.write(world_generator.WorldGenerator(rooms=5, seed=8))
+        self.assertEqual(first, second)
+        self.assertNotEqual(first[1], other[1])
+
+    def test_container_depth_and_fan_out(self):
+        generator = world_generator.WorldGenerator(
+            rooms=1, depth=3, fan_out=2, npcs=0, equipment=0, items=0,
+            doors=0)
+        world_json = json.loads(self.write(generator)[1])
+        types = collections.Counter(
+            obj['type'] for obj in world_json['objects'].values())
+        self.assertEqual(types['container'], 1 + 2 + 4)
+
+    def test_set_size(self):
+        generator = world_generator.WorldGenerator()
+        generator.set_size(5000)
+        count = self.write(generator)[0]
+        self.assertLess(abs(count - 5000), 500)
+
+    def test_playable(self):
+        generator = world_generator.WorldGenerator(rooms=3, doors=0)
+        game = game_factory.GameFactory().new_from_world(
+            world.WorldFactory().new(json.loads(self.write(generator)[1])))
+        self.assertTrue(game.start().startswith('You are in room 0.'))
+        self.assertIn('You are in room 1.', game.step('use door').output)
+
+    def test_bad_settings(self):
+        with self.assertRaises(exceptions.InvalidParameterError):
+            world_generator.WorldGenerator(rooms=0)
+        with self.assertRaises(exceptions.InvalidParameterError):
+            world_generator.WorldGenerator(fan_out=-1)
+
+
+# Main #################################################################
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import io
+import json
+import random
+import unittest
+import dgsl_engine.compiled_world as compiled_world
+import dgsl_engine.exceptions as exceptions
+import dgsl_engine.world as world
+import dgsl_engine.world_generator as world_generator
+import dgsl_engine.world_loader as world_loader
+
+lethbridge_path = 'worlds/disaster_on_the_good_ship_lethbridge.world'
+
+
+class TestWorldLoader(unittest.TestCase):
+    def assertSameWorld(self, text, chunk_size):
+        expected = world.WorldFactory().new(json.loads(text))
+        loaded = world_loader.load(io.StringIO(text), chunk_size)
+        self.assertEqual(compiled_world.compile_world(loaded),
+                         compiled_world.compile_world(expected))
+        return loaded
+
+    def test_same_as_world_factory(self):
+        with open(lethbridge_path) as file:
+            text = file.read()
+        for chunk_size in [1, 7, 100, world_loader.CHUNK_SIZE]:
+            loaded = self.assertSameWorld(text, chunk_size)
+        self.assertEqual(loaded.details.name,
+                         'Disaster on The Good Ship Lethbridge')
+
+    def test_generated_world(self):
+        generator = world_generator.WorldGenerator(rooms=20, event_depth=3)
+        file = io.StringIO()
+        generator.write(file)
+        self.assertSameWorld(file.getvalue(), 50)
+
+    def test_shuffled_objects(self):
+        file = io.StringIO()
+        world_generator.WorldGenerator(rooms=4, seed=3).write(file)
+        generated = json.loads(file.getvalue())
+        for seed in range(10):
+            objects = list(generated['objects'].items())
+            random.Random(seed).shuffle(objects)
+            text = json.dumps(dict(generated, objects=dict(objects)))
+            self.assertSameWorld(text, 64)
+
+    def test_references_before_objects(self):
+        objects = json.loads(world_json())['objects']
+        text = json.dumps(dict(world_json_details(),
+                               objects=dict(reversed(list(objects.items())))))
+        loaded = world_loader.load(io.StringIO(text), 10)
+        self.assertIs(loaded.player.owner, loaded.entities['room'])
+        self.assertIs(loaded.entities['door'].events.events['use'],
+                      loaded.events['move'])
+
+    def test_numbers_split_between_chunks(self):
+        text = world_json(version=123456789)
+        for chunk_size in range(1, 20):
+            loaded = world_loader.load(io.StringIO(text), chunk_size)
+            self.assertEqual(loaded.details.version, 123456789)
+
+    def test_missing_references_reported_together(self):
+        objects = json.loads(world_json())['objects']
+        objects['room']['items'].append({'id': 'ghost', 'name': 'ghost'})
+        objects['door']['events'].append(
+            {'id': 'nothing', 'name': 'nothing', 'verb': 'use'})
+        text = json.dumps(dict(world_json_details(), objects=objects))
+        with self.assertRaises(exceptions.InvalidParameterError) as context:
+            world_loader.load(io.StringIO(text))
+        self.assertIn('ghost, nothing', str(context.exception))
+
+    def test_verbs(self):
+        verbs = {'push': ['shove']}
+        text = json.dumps(dict(json.loads(world_json()), verbs=verbs))
+        loaded = self.assertSameWorld(text, 16)
+        self.assertEqual(loaded.details.verbs, verbs)
+        self.assertEqual(world_loader.load(io.StringIO(world_json()))
+                         .details.verbs, {})
+
+    def test_not_json(self):
+        for text in ['', 'not json', world_json()[:-20], '[1, 2]']:
+            with self.assertRaises(exceptions.InvalidParameterError):
+                world_loader.load(io.StringIO(text), 8)
+
+    def test_missing_details(self):
+        text = json.dumps({'objects': {}})
+        with self.assertRaises(exceptions.InvalidParameterError):
+            world_loader.load(io.StringIO(text))
+
+
+# Helpers ##############################################################
+
+def world_json_details(version='1.0'):
+    return {'name': 'test', 'welcome': 'hello', 'version': version,
+            'player': {'id': 'player', 'name': 'player'}}
+
+
+def world_json(version='1.0'):
+    objects = {
+        'room': {'id': 'room', 'type': 'room', 'name': 'a room',
+                 'description': 'a room', 'events': [],
+                 'items': [{'id': 'door', 'name': 'a door'}]},
+        'door': {'id': 'door', 'type': 'entity', 'name': 'a door',
+                 'description': 'a door', 'active': 1, 'obtainable': 0,
+                 'hidden': 0, 'items': [],
+                 'events': [{'id': 'move', 'name': 'move', 'verb': 'use'}]},
+        'move': {'id': 'move', 'type': 'move', 'name': 'move', 'once': 0,
+                 'message': 'You go', 'subjects': [], 'verb': 'use',
+                 'destination': {'id': 'room', 'name': 'a room'}},
+        'player': {'id': 'player', 'type': 'player', 'name': 'player',
+                   'description': 'you', 'events': [], 'items': [],
+                   'start': {'id': 'room', 'name': 'a room'}},
+    }
+    return json.dumps(dict(world_json_details(version), objects=objects))
+
+
+# Main #################################################################
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,168 @@
+import unittest
+import dgsl_engine.actions as actions
+import dgsl_engine.game_factory as game_factory
+import dgsl_engine.world as world
+import dgsl_engine.world_state as world_state
+from dgsl_engine.entity_base import Entity
+from dgsl_engine.entity_containers import Player, Room
+
+lethbridge_path = 'worlds/disaster_on_the_good_ship_lethbridge.world'
+commands = ['look', 'get medkit', 'inventory', 'use terminal', 'look bed',
+            'drop medkit', 'get medkit', 'go door', 'look', 'inventory']
+
+
+class FakeListener:
+    def __init__(self):
+        self.moves = []
+
+    def entity_moved(self, entity, old_owner, new_owner):
+        self.moves.append(entity.spec.id)
+
+
+class TestWorldState(unittest.TestCase):
+    def setUp(self):
+        self.world = world.World()
+        self.room = Room('room')
+        self.player = Player('player')
+        self.coin = Entity('coin')
+        for entity in [self.room, self.player, self.coin]:
+            self.world.add_entity(entity)
+        self.room.add(self.player)
+        self.room.add(self.coin)
+        self.state = world_state.WorldState()
+
+    def test_no_state(self):
+        self.assertIsNone(world_state.current())
+        self.coin.states.hidden = True
+        self.assertTrue(self.coin.states.hidden)
+        self.assertEqual(len(self.state), 0)
+
+    def test_changes_kept_in_state(self):
+        with world_state.using(self.state):
+            self.assertIs(world_state.current(), self.state)
+            self.coin.states.hidden = True
+            self.assertTrue(self.coin.states.hidden)
+        self.assertFalse(self.coin.states.hidden)
+        self.assertEqual(len(self.state), 1)
+
+    def test_copy_on_write(self):
+        with world_state.using(self.state):
+            actions.move(self.coin, self.player)
+            self.assertTrue(self.player.inventory.has_item('coin'))
+            self.assertFalse(self.room.inventory.has_item('coin'))
+            self.assertIs(self.coin.owner, self.player)
+        self.assertFalse(self.player.inventory.has_item('coin'))
+        self.assertTrue(self.room.inventory.has_item('coin'))
+        self.assertIs(self.coin.owner, self.room)
+
+    def test_reads_do_not_copy(self):
+        with world_state.using(self.state):
+            list(self.room.inventory)
+            self.assertIs(self.room.get('coin'), self.coin)
+            self.assertIsNone(self.room.get('nothing'))
+        self.assertEqual(len(self.state), 0)
+
+    def test_states_are_separate(self):
+        other = world_state.WorldState()
+        with world_state.using(self.state):
+            actions.move(self.coin, self.player)
+        with world_state.using(other):
+            self.assertIs(self.coin.owner, self.room)
+            self.coin.states.toggle_active()
+        with world_state.using(self.state):
+            self.assertTrue(self.coin.states.active)
+            self.assertIs(self.coin.owner, self.player)
+
+    def test_listeners(self):
+        listener = FakeListener()
+        with world_state.using(self.state):
+            self.world.index.register(listener)
+            actions.move(self.coin, self.player)
+        actions.move(self.coin, self.player)
+        self.assertEqual(listener.moves, ['coin'])
+
+
+class TestRemember(unittest.TestCase):
+    def setUp(self):
+        self.room = Room('room')
+        self.coin = Entity('coin')
+        self.room.add(self.coin)
+        self.state = world_state.WorldState()
+        self.calls = []
+
+    def has_coin(self, room):
+        self.calls.append(room)
+        return room.inventory.has_item('coin')
+
+    def test_kept_until_read_field_changes(self):
+        with world_state.using(self.state):
+            for _ in range(3):
+                self.assertTrue(world_state.remember(
+                    ('coin', self.room), self.has_coin, self.room))
+            self.coin.states.toggle_hidden()
+            self.assertTrue(world_state.remember(
+                ('coin', self.room), self.has_coin, self.room))
+            self.room.inventory.remove('coin')
+            self.assertFalse(world_state.remember(
+                ('coin', self.room), self.has_coin, self.room))
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual(len(self.state.memo), 1)
+
+    def test_kept_per_state(self):
+        other = world_state.WorldState()
+        with world_state.using(self.state):
+            self.room.inventory.remove('coin')
+            self.assertFalse(world_state.remember(
+                ('coin', self.room), self.has_coin, self.room))
+        with world_state.using(other):
+            self.assertTrue(world_state.remember(
+                ('coin', self.room), self.has_coin, self.room))
+        self.assertEqual(len(self.calls), 2)
+
+    def test_nested_results_share_reads(self):
+        def outer():
+            return world_state.remember(
+                ('coin', self.room), self.has_coin, self.room)
+
+        with world_state.using(self.state):
+            world_state.remember('inner', self.has_coin, self.room)
+            self.assertTrue(world_state.remember('outer', outer))
+            self.room.inventory.remove('coin')
+            self.assertFalse(world_state.remember('outer', outer))
+
+    def test_volatile(self):
+        def count():
+            world_state.volatile()
+            self.calls.append(None)
+            return len(self.calls)
+
+        with world_state.using(self.state):
+            self.assertEqual(world_state.remember('count', count), 1)
+            self.assertEqual(world_state.remember('count', count), 2)
+        self.assertEqual(len(self.state.memo), 0)
+
+
+class TestSharedTemplate(unittest.TestCase):
+    def test_games_match_private_worlds(self):
+        factory = game_factory.GameFactory()
+        template = game_factory.load_world(lethbridge_path)
+        shared = [factory.new_from_world(template, world_state.WorldState())
+                  for _ in range(2)]
+        private = factory.new(lethbridge_path)
+
+        expected = [private.start()] + [private.step(command).output
+                                        for command in commands]
+        first = [shared[0].start()] + [shared[0].step(command).output
+                                       for command in commands]
+        self.assertEqual(first, expected)
+
+        second = [shared[1].start()] + [shared[1].step(command).output
+                                        for command in commands]
+        self.assertEqual(second, expected)
+        self.assertIs(shared[0].world, shared[1].world)
+
+
+# Main #################################################################
+
+if __name__ == '__main__':
+    unittest.main()
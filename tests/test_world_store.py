@@ -0,0 +1,96 @@
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+import dgsl_engine.exceptions as exceptions
+import dgsl_engine.game_factory as game_factory
+import dgsl_engine.world as world
+import dgsl_engine.world_generator as world_generator
+import dgsl_engine.world_state as world_state
+import dgsl_engine.world_store as world_store
+
+lethbridge_path = 'worlds/disaster_on_the_good_ship_lethbridge.world'
+
+
+class TestWorldStore(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.world_path = os.path.join(self.dir.name, 'rooms.world')
+        self.store_path = os.path.join(self.dir.name, 'rooms.dgsldb')
+        with open(self.world_path, 'w') as file:
+            self.count = world_generator.WorldGenerator(rooms=6).write(file)
+        world_store.import_world(self.world_path, self.store_path)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_import_and_open(self):
+        new_world = world_store.open_world(self.store_path)
+        self.assertEqual(new_world.regions, ['room0'])
+        self.assertIs(new_world.player.owner, new_world.entities['room0'])
+        self.assertIn('room3', new_world.entities)
+        self.assertNotIn('room3', dict(new_world.entities))
+        self.assertNotIn('nothing', new_world.events)
+        with open(self.world_path) as file:
+            self.assertEqual(new_world.details.name, json.load(file)['name'])
+        self.assertEqual(
+            world_store.import_world(self.world_path, self.store_path),
+            self.count)
+
+    def test_same_game_as_json(self):
+        commands = ['use door to room 1', 'look', 'get key', 'inventory',
+                    'use door to room 2', 'get broken gloves',
+                    'equip broken gloves', 'look']
+        for world_path in [self.world_path, lethbridge_path]:
+            world_store.import_world(world_path, self.store_path)
+            outputs = []
+            for new_world in [world_store.open_world(self.store_path),
+                              game_factory.load_world(world_path)]:
+                game = game_factory.GameFactory().new_from_world(
+                    new_world, world_state.WorldState())
+                game.start()
+                outputs.append([game.step(command).output
+                                for command in commands])
+            self.assertEqual(outputs[0], outputs[1])
+
+    def test_load_world(self):
+        game = game_factory.GameFactory().new(self.store_path)
+        self.assertIsInstance(game.world, world.LazyWorld)
+        game.start()
+        game.step('use door to room 1')
+        self.assertEqual(game.world.regions, ['room0', 'room1'])
+
+    def test_failed_import_keeps_store(self):
+        with open(self.world_path, 'w') as file:
+            file.write('{"name": "broken", "objects": {')
+        with self.assertRaises(exceptions.InvalidParameterError):
+            world_store.import_world(self.world_path, self.store_path)
+        self.assertEqual(sorted(os.listdir(self.dir.name)),
+                         ['rooms.dgsldb', 'rooms.world'])
+        self.assertEqual(
+            world_store.open_world(self.store_path).regions, ['room0'])
+
+    def test_duplicate_ids(self):
+        with open(self.world_path, 'w') as file:
+            file.write('{"name": "twice", "welcome": "", "version": "1", '
+                       '"objects": {"a": {"type": "room", "id": "a"}, '
+                       '"a": {"type": "room", "id": "a"}}}')
+        with self.assertRaises(exceptions.InvalidParameterError):
+            world_store.import_world(self.world_path, self.store_path)
+
+    def test_not_a_store(self):
+        with self.assertRaises(exceptions.InvalidParameterError):
+            world_store.open_world(self.world_path)
+        other = os.path.join(self.dir.name, 'other.db')
+        connection = sqlite3.connect(other)
+        connection.execute('CREATE TABLE details (key, value)')
+        connection.close()
+        with self.assertRaises(exceptions.InvalidParameterError):
+            world_store.open_world(other)
+
+
+# Main #################################################################
+
+if __name__ == '__main__':
+    unittest.main()